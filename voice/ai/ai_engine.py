@@ -1,16 +1,74 @@
 import os
 import json
-import requests
-from jsonschema import validate
+import hashlib
 from ai.proposal_schema import AI_PROPOSAL_SCHEMA
+from ai.transport import post_json, stream_sse
+from ai.budget import get_budget
+from ai.stream_json import IncrementalJSONParser
+from utils.log import get_logger
 
-GROQ_ENDPOINT = "https://api.groq.com/openai/v1/chat/completions"
+log = get_logger("ai")
 
 
-def ai_propose_improvement(text: str, settings: dict) -> dict | None:
+def _validate_proposal(proposal: dict):
+    from jsonschema import validate   # deferred: startup preloads it off the main thread
+
+    validate(instance=proposal, schema=AI_PROPOSAL_SCHEMA)
+
+# GROQ_ENDPOINT env var points rewrite / codegen at another server (e.g. ai/mock_provider.py)
+GROQ_ENDPOINT = os.getenv("GROQ_ENDPOINT", "https://api.groq.com/openai/v1/chat/completions")
+
+
+def _complete(headers: dict, payload: dict, timeout: float) -> dict:
+    """Whole completion in one response, then json.loads on the content."""
+    data = post_json("groq", GROQ_ENDPOINT, headers, payload, timeout)
+    raw = data["choices"][0]["message"]["content"]
+    return json.loads(raw)
+
+
+def _stream_complete(headers: dict, payload: dict, timeout: float, on_value=None) -> dict:
+    """
+    SSE completion fed straight into the incremental parser.
+    on_value(path, value) fires as each field completes; the raw text is
+    never accumulated, and reading stops once the JSON object closes.
+    """
+    parser = IncrementalJSONParser(on_value)
+    stream = stream_sse("groq", GROQ_ENDPOINT, headers, {**payload, "stream": True}, timeout)
+
+    try:
+        for data in stream:
+            delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+            if delta and parser.feed(delta):
+                break
+    finally:
+        stream.close()
+
+    return parser.close()
+
+
+def _call_groq(headers: dict, payload: dict, timeout: float, stream=False, on_value=None) -> dict:
+    """
+    Every Groq call goes through the shared AI budget.
+    Identical payloads already in flight are coalesced into one call.
+    Raises BudgetExhausted when the budget is spent.
+    Returns the parsed proposal (not yet schema-validated).
+    """
+    key = hashlib.sha1(
+        json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+    if stream:
+        return get_budget().call(key, _stream_complete, headers, payload, timeout, on_value)
+
+    return get_budget().call(key, _complete, headers, payload, timeout)
+
+
+def ai_propose_improvement(text: str, settings: dict, on_value=None) -> dict | None:
     """
     AI rewrites text only.
     No execution, no OS access.
+    With settings["stream"], on_value(("result", "text"), text) fires
+    before the response has finished arriving.
     """
 
     if not settings.get("enabled"):
@@ -18,7 +76,7 @@ def ai_propose_improvement(text: str, settings: dict) -> dict | None:
 
     api_key = os.getenv(settings["api_key_env"])
     if not api_key:
-        print("[AI] API key missing")
+        log.warning("API key missing")
         return None
 
     headers = {
@@ -44,29 +102,28 @@ def ai_propose_improvement(text: str, settings: dict) -> dict | None:
     }
 
     try:
-        resp = requests.post(
-            GROQ_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=settings["timeout_sec"]
+        proposal = _call_groq(
+            headers,
+            payload,
+            timeout=settings["timeout_sec"],
+            stream=settings.get("stream", False),
+            on_value=on_value
         )
-        resp.raise_for_status()
 
-        raw = resp.json()["choices"][0]["message"]["content"]
-        proposal = json.loads(raw)
-
-        validate(instance=proposal, schema=AI_PROPOSAL_SCHEMA)
+        _validate_proposal(proposal)
         return proposal
 
     except Exception as e:
-        print("[AI ERROR]", e)
+        log.error("%s", e)
         return None
 
 
-def ai_generate_code(task: str, settings: dict) -> dict | None:
+def ai_generate_code(task: str, settings: dict, on_value=None) -> dict | None:
     """
     AI generates code as TEXT ONLY.
     Files are proposed, never written automatically.
+    With settings["stream"], on_value(("result", "files", name), code)
+    fires as each file completes.
     """
 
     if not settings.get("enabled"):
@@ -74,7 +131,7 @@ def ai_generate_code(task: str, settings: dict) -> dict | None:
 
     api_key = os.getenv(settings["api_key_env"])
     if not api_key:
-        print("[AI] API key missing")
+        log.warning("API key missing")
         return None
 
     headers = {
@@ -100,20 +157,17 @@ def ai_generate_code(task: str, settings: dict) -> dict | None:
     }
 
     try:
-        resp = requests.post(
-            GROQ_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=settings["timeout_sec"]
+        proposal = _call_groq(
+            headers,
+            payload,
+            timeout=settings["timeout_sec"],
+            stream=settings.get("stream", False),
+            on_value=on_value
         )
-        resp.raise_for_status()
-
-        raw = resp.json()["choices"][0]["message"]["content"]
-        proposal = json.loads(raw)
 
-        validate(instance=proposal, schema=AI_PROPOSAL_SCHEMA)
+        _validate_proposal(proposal)
         return proposal
 
     except Exception as e:
-        print("[AI CODE ERROR]", e)
+        log.error("Code proposal failed: %s", e)
         return None
\ No newline at end of file
@@ -0,0 +1,143 @@
+# ai/ai_tasks.py
+# Non-blocking AI calls for the main loop
+# - AI route / dictation rewrite / code generation run on a small dedicated executor
+# - Results come back as EVENTS on a queue; main_loop polls them between utterances
+# - New speech supersedes stale calls, "cancel" drops them all
+# - Hard bound on AI requests in flight (abandoned calls still count until they end);
+#   a task fanning out into parallel calls claims extra slots with fan_out()
+#
+# NOTE: a running HTTP call cannot be interrupted; cancelling it means its
+# result is dropped when it arrives. Calls that have not started are never run.
+
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from utils import tracing
+from utils.log import get_logger
+
+log = get_logger("ai.tasks", "AI TASK")
+
+# kind: "route" | "rewrite" | "codegen", context: whatever the caller needs to apply the result
+# trace: the submitting utterance's trace, held until the caller resumes it (utils/tracing.py)
+AIEvent = namedtuple("AIEvent", ["kind", "task_id", "context", "result", "error", "trace"], defaults=(None,))
+
+
+class AITaskRunner:
+    def __init__(self, max_in_flight=2, debug=True):
+        self.max_in_flight = max_in_flight
+        self.debug = debug
+
+        self.events = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight,
+            thread_name_prefix="ai-task"
+        )
+
+        self._pending = {}     # task_id -> (kind, future, context, trace, submitted); results still wanted
+        self._live = set()     # every future not finished yet (incl. abandoned)
+        self._extra = 0        # slots claimed by running tasks for their own fan-out
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    # ---------------- INTERNAL ----------------
+
+    def _done(self, task_id: int, future):
+        with self._lock:
+            self._live.discard(future)
+            entry = self._pending.pop(task_id, None)
+
+        if entry is None or future.cancelled():
+            if self.debug:
+                log.debug("#%d finished after cancel, result dropped", task_id)
+            return
+
+        kind, _, context, trace, submitted = entry
+        error = future.exception()
+        result = None if error else future.result()
+
+        if trace:
+            trace.add(f"ai_{kind}", submitted, time.perf_counter(), error=bool(error))
+
+        if self.debug:
+            log.debug("#%d %s done%s", task_id, kind, f" (error: {error})" if error else "")
+
+        self.events.put(AIEvent(kind, task_id, context, result, error, trace))
+
+    # ---------------- PUBLIC ----------------
+
+    def submit(self, kind: str, fn, *args, context=None) -> int | None:
+        """Returns a task id, or None when too many AI calls are in flight."""
+        with self._lock:
+            in_flight = len(self._live) + self._extra
+            if in_flight >= self.max_in_flight:
+                if self.debug:
+                    log.info("Busy (%d in flight), %s rejected", in_flight, kind)
+                return None
+
+            self._next_id += 1
+            task_id = self._next_id
+
+            future = self._executor.submit(fn, *args)
+            self._pending[task_id] = (kind, future, context, tracing.hold(), time.perf_counter())
+            self._live.add(future)
+
+        future.add_done_callback(lambda f: self._done(task_id, f))
+
+        if self.debug:
+            log.debug("#%d %s submitted", task_id, kind)
+        return task_id
+
+    @contextmanager
+    def fan_out(self, wanted: int):
+        """
+        Called from inside a running task. Yields how many calls it may run
+        IN ADDITION to its own slot (0..wanted, never blocks); they count as
+        in flight until the block exits.
+        """
+        with self._lock:
+            granted = max(0, min(wanted, self.max_in_flight - len(self._live) - self._extra))
+            self._extra += granted
+        try:
+            yield granted
+        finally:
+            with self._lock:
+                self._extra -= granted
+
+    def cancel(self, kind: str | None = None) -> int:
+        """Drops pending tasks (of one kind, or all). Returns how many."""
+        with self._lock:
+            ids = [
+                task_id for task_id, (k, *_) in self._pending.items()
+                if kind is None or k == kind
+            ]
+            dropped = [self._pending.pop(task_id) for task_id in ids]
+
+        for _, future, _, trace, _ in dropped:
+            future.cancel()  # only succeeds if it has not started
+            if trace:
+                trace.release()
+
+        if dropped and self.debug:
+            log.info("Cancelled %d task(s) kind=%s", len(dropped), kind or "ALL")
+        return len(dropped)
+
+    def pending(self, kind: str | None = None) -> int:
+        with self._lock:
+            return sum(1 for k, *_ in self._pending.values() if kind is None or k == kind)
+
+    def poll(self) -> list:
+        """All finished, still-wanted results. Never blocks."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
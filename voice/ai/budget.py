@@ -0,0 +1,209 @@
+# ai/budget.py
+# AI call budget shared by ALL AI entry points (router, rewrite, code generation)
+# - Token bucket for settings.ai.max_calls_per_minute
+# - Day counter for settings.ai.max_calls_per_day, persisted across restarts
+# - Identical in-flight requests are coalesced into ONE paid call
+# - Exhausted → BudgetExhausted; callers degrade to local-only routing
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from utils.log import get_logger
+
+log = get_logger("ai.budget", "AI BUDGET")
+
+DEFAULTS = {
+    "max_calls_per_minute": 2,
+    "max_calls_per_day": 50,
+}
+
+
+class BudgetExhausted(Exception):
+    """No AI budget left right now (minute bucket empty or day cap hit)."""
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class AIBudget:
+    def __init__(self, max_calls_per_minute=2, max_calls_per_day=50,
+                 state_path=None, clock=time.time, debug=True):
+        self.capacity = float(max_calls_per_minute)
+        self.refill_per_sec = max_calls_per_minute / 60.0
+        self.max_per_day = max_calls_per_day
+        self.state_path = Path(state_path) if state_path else None
+        self.clock = clock
+        self.debug = debug
+
+        self.tokens = self.capacity
+        self.last_refill = clock()
+        self.day, self.day_count = self._load_day()
+
+        self.coalesced = 0
+        self.rejected = 0
+
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    # ---------- day counter persistence ----------
+
+    def _today(self) -> str:
+        return time.strftime("%Y-%m-%d", time.localtime(self.clock()))
+
+    def _load_day(self):
+        today = self._today()
+        if not self.state_path or not self.state_path.exists():
+            return today, 0
+
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            if data.get("day") == today:
+                return today, int(data.get("count", 0))
+        except Exception as e:
+            log.error("Failed to load state: %s", e)
+
+        return today, 0
+
+    def _save_day(self):
+        if not self.state_path:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self.state_path.write_text(
+                json.dumps({"day": self.day, "count": self.day_count}),
+                encoding="utf-8"
+            )
+        except Exception as e:
+            log.error("Failed to save state: %s", e)
+
+    # ---------- token bucket ----------
+
+    def _refill(self):
+        """Caller holds the lock."""
+        now = self.clock()
+
+        today = self._today()
+        if today != self.day:
+            self.day, self.day_count = today, 0
+
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.last_refill) * self.refill_per_sec
+        )
+        self.last_refill = now
+
+    def _try_acquire(self) -> bool:
+        """Caller holds the lock."""
+        self._refill()
+
+        if self.day_count >= self.max_per_day or self.tokens < 1.0:
+            return False
+
+        self.tokens -= 1.0
+        self.day_count += 1
+        self._save_day()
+        return True
+
+    # ---------- public ----------
+
+    def call(self, key: str, fn, *args, **kwargs):
+        """
+        Runs fn(*args) if budget allows.
+        If an identical request (same key) is already running, waits for it
+        and shares its result instead of paying for a second call.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+
+            if leader:
+                if not self._try_acquire():
+                    self.rejected += 1
+                    if self.debug:
+                        log.warning("Exhausted (day=%d/%d, tokens=%.2f)", self.day_count, self.max_per_day, self.tokens)
+                    raise BudgetExhausted("AI call budget exhausted")
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if self.debug:
+                log.debug("Coalesced with identical in-flight request")
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def available(self, reserve=0) -> int:
+        """Calls that could start right now, minus `reserve` kept back for others."""
+        with self._lock:
+            self._refill()
+            calls = min(int(self.tokens), self.max_per_day - self.day_count)
+        return max(0, calls - reserve)
+
+    def remaining(self) -> dict:
+        with self._lock:
+            return {
+                "minute_tokens": round(self.tokens, 2),
+                "day_remaining": max(0, self.max_per_day - self.day_count),
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+            }
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_budget = None
+
+
+def configure(ai_settings: dict | None = None, state_path="data/ai_budget.json", debug=True) -> AIBudget:
+    global _budget
+    config = {**DEFAULTS, **(ai_settings or {})}
+
+    _budget = AIBudget(
+        max_calls_per_minute=config["max_calls_per_minute"],
+        max_calls_per_day=config["max_calls_per_day"],
+        state_path=state_path,
+        debug=debug
+    )
+    return _budget
+
+
+def get_budget() -> AIBudget:
+    """Unconfigured (tests, scripts) → in-memory budget with default limits."""
+    global _budget
+    if _budget is None:
+        _budget = AIBudget(**DEFAULTS)
+    return _budget
+
+
+def collect_metrics() -> list:
+    """utils/metrics.py collector: budget rejections / coalesced calls."""
+    if _budget is None:
+        return []
+    left = _budget.remaining()
+    return [
+        ("voice_ai_budget_total", "counter", "AI calls refused or shared by the budget",
+         {"result": "rejected"}, left["rejected"]),
+        ("voice_ai_budget_total", "counter", "AI calls refused or shared by the budget",
+         {"result": "coalesced"}, left["coalesced"]),
+        ("voice_ai_budget_day_remaining", "gauge", "AI calls left today", {}, left["day_remaining"]),
+    ]
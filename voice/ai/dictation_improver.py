@@ -0,0 +1,183 @@
+# ai/dictation_improver.py
+# Chunked, parallel, incremental "make this better"
+# - Dictation is split into sentence chunks (paragraphs never merged)
+# - Chunks are improved concurrently, under a concurrency cap; run as an AI task,
+#   the extra parallel calls are claimed from the runner (max_in_flight holds)
+# - Fan-out is capped by the shared AI budget, keeping calls back for routing;
+#   chunks over the cap stay as dictated (the next pass picks them up)
+# - Results cached by content hash: only NEW or CHANGED chunks are re-sent
+# - Improved chunks are cached as already-good, so a second pass is free
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+from ai.ai_engine import ai_propose_improvement
+from ai.budget import get_budget
+from utils.log import get_logger
+
+log = get_logger("ai.dictation", "DICTATION AI")
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+MIN_CHUNK_CONFIDENCE = 0.8
+
+
+def split_chunks(text: str, max_chars=400) -> list:
+    """
+    Paragraphs stay separate; sentences inside a paragraph are grouped
+    greedily up to max_chars. Greedy-from-the-start keeps earlier chunks
+    stable while dictation is appended at the end.
+    """
+    chunks = []
+
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        current = ""
+        for sentence in SENTENCE_END.split(paragraph):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+
+    return chunks
+
+
+class DictationImprover:
+    def __init__(self, settings: dict, max_workers=3, chunk_chars=400, reserve_calls=1,
+                 cache_size=256, improve_fn=ai_propose_improvement, budget=None, runner=None, debug=True):
+        self.settings = settings
+        self.max_workers = max_workers
+        self.runner = runner                  # AITaskRunner improve() runs on (None → max_workers)
+        self.reserve_calls = reserve_calls    # budget calls left for ai_route
+        self.budget = budget                  # None → shared ai/budget.py instance
+        self.chunk_chars = chunk_chars
+        self.cache_size = cache_size
+        self.improve_fn = improve_fn
+        self.debug = debug
+
+        # sha256(chunk) -> (improved chunk text, confidence)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------------- CACHE ----------------
+
+    @staticmethod
+    def _key(chunk: str) -> str:
+        return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+    def _cached(self, chunk: str) -> tuple | None:
+        with self._lock:
+            key = self._key(chunk)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _remember(self, original: str, improved: str, confidence: float):
+        with self._lock:
+            for chunk in (original, improved):
+                self._cache[self._key(chunk)] = (improved, confidence)
+                self._cache.move_to_end(self._key(chunk))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ---------------- IMPROVE ----------------
+
+    def _improve_chunk(self, chunk: str):
+        """Returns (improved_text, confidence) or None."""
+        proposal = self.improve_fn(chunk, self.settings)
+        if not proposal or proposal.get("confidence", 0) < MIN_CHUNK_CONFIDENCE:
+            return None
+
+        text = proposal.get("result", {}).get("text")
+        if not isinstance(text, str) or not text.strip():
+            return None
+        return text.strip(), proposal["confidence"]
+
+    def _send(self, chunks: list, todo: list, results: list, on_chunk=None):
+        # this call already holds one runner slot; parallel calls beyond it need their own
+        wanted = min(self.max_workers, len(todo)) - 1
+        slots = self.runner.fan_out(wanted) if self.runner else nullcontext(wanted)
+
+        with slots as extra:
+            if extra < wanted and self.debug:
+                log.debug("%d AI slot(s) free, chunks go %d at a time", extra, 1 + extra)
+
+            with ThreadPoolExecutor(max_workers=1 + extra) as pool:
+                futures = {pool.submit(self._improve_chunk, chunks[i]): i for i in todo}
+
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        improved = future.result()
+                    except Exception as e:
+                        log.error("%s", e)
+                        improved = None
+
+                    if improved:
+                        self._remember(chunks[i], *improved)
+                        results[i] = improved
+                        if on_chunk:
+                            on_chunk(i, improved[0])
+
+    def improve(self, text: str, on_chunk=None) -> dict | None:
+        """
+        Returns an IMPROVE_TEXT proposal for the whole text, or None if no
+        chunk could be improved. Failed chunks keep their original text.
+        on_chunk(index, improved_text) fires as each chunk finishes.
+        """
+        chunks = split_chunks(text, self.chunk_chars)
+        if not chunks:
+            return None
+
+        results = [self._cached(c) for c in chunks]
+        todo = [i for i, r in enumerate(results) if r is None]
+
+        if self.debug:
+            log.debug("%d chunk(s), %d cached, %d to send", len(chunks), len(chunks) - len(todo), len(todo))
+
+        # one "make this better" must not spend the whole budget
+        budget = self.budget or get_budget()
+        allowed = budget.available(reserve=self.reserve_calls)
+        if len(todo) > allowed:
+            log.info("AI budget allows %d of %d chunk(s) now, the rest stay as dictated", allowed, len(todo))
+            todo = todo[:allowed]
+
+        if todo:
+            self._send(chunks, todo, results, on_chunk)
+
+        done = [r for r in results if r is not None]
+        if not done:
+            return None
+
+        failed = len(results) - len(done)
+        if failed and self.debug:
+            log.info("%d chunk(s) kept as dictated", failed)
+
+        # join chunks back, keeping paragraph breaks
+        merged = self._merge(text, [r[0] if r else c for r, c in zip(results, chunks)])
+
+        return {
+            "type": "IMPROVE_TEXT",
+            "confidence": min(confidence for _, confidence in done),
+            "result": {"text": merged}
+        }
+
+    def _merge(self, text: str, new_chunks: list) -> str:
+        out, k = [], 0
+        for paragraph in re.split(r"\n\s*\n", text):
+            if not paragraph.strip():
+                continue
+            count = len(split_chunks(paragraph, self.chunk_chars))
+            out.append(" ".join(new_chunks[k:k + count]))
+            k += count
+        return "\n\n".join(out)
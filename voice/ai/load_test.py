@@ -0,0 +1,230 @@
+# ai/load_test.py
+# Concurrent load test of the REAL AI paths against the local mock provider
+# - Drives ai_route / ai_propose_improvement / ai_generate_code from N threads
+# - Goes through the shared transport (retries, breaker), budget (coalescing)
+#   and route cache exactly like the app does; only the endpoints differ
+# - Reports throughput and p50/p95/p99/max latency per path
+#
+# Usage (from voice/):
+#   python -m ai.load_test --requests 200 --concurrency 8 --latency-ms 300 --latency-dist lognormal --error-rate 0.05
+#   python -m ai.load_test --stream --cache --distinct 20
+#   python -m ai.load_test --external      # use HF_API_URL / GROQ_ENDPOINT from the environment
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ai.ai_engine as ai_engine
+import ai.budget as ai_budget
+import ai.transport as ai_transport
+import intent.ai_cache as ai_cache
+import intent.ai_router as ai_router
+from ai.mock_provider import MockProvider, add_arguments, config_from_args
+from ai.transport import configure as configure_transport
+from ai.budget import configure as configure_budget
+from intent.ai_cache import configure as configure_cache
+from utils.metrics import percentile
+
+PATHS = ("route", "rewrite", "codegen")
+API_KEY_ENV = "MOCK_AI_API_KEY"
+
+
+# ---------------- ONE REQUEST PER PATH ----------------
+
+def _call(path: str, n: int, settings: dict) -> bool:
+    """Runs one AI call; True when it produced a usable answer."""
+    if path == "route":
+        intent = ai_router.ai_route(f"open app {n}")
+        return bool(intent) and intent["intent_id"] != "UNKNOWN"
+
+    if path == "rewrite":
+        return ai_engine.ai_propose_improvement(f"this is sentence number {n}", settings) is not None
+
+    return ai_engine.ai_generate_code(f"create a script number {n}", settings) is not None
+
+
+def _timed(path: str, n: int, settings: dict):
+    started = time.perf_counter()
+    try:
+        ok = _call(path, n, settings)
+    except Exception:
+        ok = False
+    return path, ok, time.perf_counter() - started
+
+
+# ---------------- RUN ----------------
+
+@contextlib.contextmanager
+def _restored_globals():
+    """run() reconfigures the process-wide transport / budget / route cache,
+    endpoints and API key env vars; everything is put back afterwards."""
+    saved = (
+        ai_transport._transport, ai_budget._budget, ai_cache._cache, ai_cache._enabled,
+        ai_router.HF_API_URL, ai_router.HF_STREAM, ai_engine.GROQ_ENDPOINT,
+    )
+    saved_env = {name: os.environ.get(name) for name in ("HUGGINGFACE_API_KEY", API_KEY_ENV)}
+    try:
+        yield
+    finally:
+        (
+            ai_transport._transport, ai_budget._budget, ai_cache._cache, ai_cache._enabled,
+            ai_router.HF_API_URL, ai_router.HF_STREAM, ai_engine.GROQ_ENDPOINT,
+        ) = saved
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run(requests=100, concurrency=4, paths=PATHS, distinct=None, stream=False, cache=False,
+        timeout=20.0, transport=None, mock=None, external=False, verbose=False) -> dict:
+    """
+    distinct: how many different inputs to cycle through (None = all unique).
+    Fewer distinct inputs exercise coalescing and, with cache=True, the route cache.
+    """
+    with _restored_globals():
+        server = None if external else MockProvider(mock, debug=False).start()
+        try:
+            return _run(requests, concurrency, paths, distinct, stream, cache, timeout,
+                        transport, server, verbose)
+        finally:
+            if server:
+                server.stop()
+
+
+def _run(requests, concurrency, paths, distinct, stream, cache, timeout,
+         transport, server, verbose) -> dict:
+    if server:
+        ai_router.HF_API_URL = server.hf_url
+        ai_engine.GROQ_ENDPOINT = server.groq_url
+
+    os.environ.setdefault("HUGGINGFACE_API_KEY", "mock")
+    os.environ.setdefault(API_KEY_ENV, "mock")
+    ai_router.HF_STREAM = stream
+
+    settings = {
+        "enabled": True,
+        "model": "mock",
+        "api_key_env": API_KEY_ENV,
+        "timeout_sec": timeout,
+        "stream": stream,
+    }
+
+    transport_client = configure_transport(transport, debug=False)
+    budget = configure_budget(
+        {"max_calls_per_minute": 10 ** 9, "max_calls_per_day": 10 ** 9},
+        state_path=None,
+        debug=False
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        route_cache = configure_cache(
+            {"enabled": cache, "path": os.path.join(tmp, "route_cache.json")},
+            debug=False
+        )
+
+        jobs = [(paths[i % len(paths)], i % distinct if distinct else i) for i in range(requests)]
+
+        # the AI modules print per call; keep the report readable
+        quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+        started = time.perf_counter()
+        with quiet, ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda job: _timed(job[0], job[1], settings), jobs))
+        elapsed = time.perf_counter() - started
+
+        cache_stats = {"hits": route_cache.hits, "misses": route_cache.misses} if route_cache else None
+
+    by_path = {}
+    for path, ok, sec in results:
+        by_path.setdefault(path, []).append((ok, sec))
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_sec": elapsed,
+        "requests_per_sec": requests / elapsed if elapsed else 0.0,
+        "paths": {
+            path: {
+                "count": len(rows),
+                "ok": sum(1 for ok, _ in rows if ok),
+                "p50_ms": percentile([s for _, s in rows], 50) * 1000,
+                "p95_ms": percentile([s for _, s in rows], 95) * 1000,
+                "p99_ms": percentile([s for _, s in rows], 99) * 1000,
+                "max_ms": max(s for _, s in rows) * 1000,
+            }
+            for path, rows in by_path.items()
+        },
+        "transport": transport_client.stats(),
+        "budget": budget.remaining(),
+        "cache": cache_stats,
+        "mock": server.stats() if server else None,
+    }
+
+
+def print_report(report: dict):
+    print("[LOAD] AI load test")
+    print(
+        f"[LOAD] requests={report['requests']} concurrency={report['concurrency']} "
+        f"elapsed={report['elapsed_sec']:.3f}s "
+        f"throughput={report['requests_per_sec']:.1f} req/s"
+    )
+    for path, s in report["paths"].items():
+        print(
+            f"[LOAD] {path:<8} n={s['count']:<5} ok={s['ok']:<5} "
+            f"p50={s['p50_ms']:.1f}ms p95={s['p95_ms']:.1f}ms "
+            f"p99={s['p99_ms']:.1f}ms max={s['max_ms']:.1f}ms"
+        )
+    for provider, s in report["transport"].items():
+        print(
+            f"[LOAD] transport {provider}: calls={s['calls']} failures={s['failures']} "
+            f"retries={s['retries']} short_circuited={s['short_circuited']} "
+            f"p50={s['p50_ms']:.1f}ms p99={s['p99_ms']:.1f}ms"
+        )
+    print(f"[LOAD] budget: {report['budget']}")
+    if report["cache"]:
+        print(f"[LOAD] route cache: {report['cache']}")
+    if report["mock"]:
+        print(f"[LOAD] mock server: {report['mock']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test of the AI paths")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--distinct", type=int, default=None, help="cycle through this many inputs")
+    parser.add_argument("--stream", action="store_true", help="use the SSE paths")
+    parser.add_argument("--cache", action="store_true", help="enable the AI route cache")
+    parser.add_argument("--timeout", type=float, default=20.0, help="rewrite / codegen deadline (s); routing keeps its own")
+    parser.add_argument("--retries", type=int, default=None)
+    parser.add_argument("--external", action="store_true",
+                        help="no mock: use HF_API_URL / GROQ_ENDPOINT as configured")
+    parser.add_argument("--verbose", action="store_true", help="keep per-call AI output")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    transport = {} if args.retries is None else {"retries": args.retries}
+
+    print_report(run(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        paths=tuple(args.paths),
+        distinct=args.distinct,
+        stream=args.stream,
+        cache=args.cache,
+        timeout=args.timeout,
+        transport=transport,
+        mock=config_from_args(args),
+        external=args.external,
+        verbose=args.verbose
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# ai/mock_provider.py
+# Local stand-in for the AI providers (no network, no API keys)
+# - HuggingFace inference shape:  POST /models/<model>            → [{"generated_text": ...}]
+# - Groq chat shape:              POST .../chat/completions        → {"choices": [{"message": ...}]}
+# - Both stream as SSE when the payload has "stream": true
+# - Injected per request: latency (fixed/uniform/exponential/lognormal),
+#   HTTP errors, malformed JSON and hangs (for client timeouts)
+#
+# Run (from voice/):
+#   python -m ai.mock_provider --port 8765 --latency-ms 300 --latency-dist lognormal --error-rate 0.05
+# then point the app at it:
+#   HF_API_URL=http://127.0.0.1:8765/models/mock
+#   GROQ_ENDPOINT=http://127.0.0.1:8765/openai/v1/chat/completions
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULTS = {
+    "latency_ms": 0.0,          # mean (median for lognormal) time to first byte
+    "latency_dist": "fixed",    # fixed | uniform | exponential | lognormal
+    "latency_sigma": 0.5,       # lognormal spread
+    "error_rate": 0.0,
+    "error_statuses": [503],
+    "malformed_rate": 0.0,      # JSON cut off halfway
+    "hang_rate": 0.0,           # hold the request open for hang_sec
+    "hang_sec": 30.0,
+    "stream_chunk_chars": 8,
+    "token_delay_ms": 0.0,      # gap between streamed chunks
+    "seed": None,
+}
+
+USER_INPUT = re.compile(r'User input: "(.*)"')
+
+
+# ---------------- CANNED ANSWERS ----------------
+
+def route_answer(prompt: str) -> dict:
+    """Intent JSON the way the HF router prompt asks for it."""
+    match = USER_INPUT.search(prompt)
+    text = match.group(1).strip() if match else ""
+
+    if text.startswith("open "):
+        return {"intent_id": "OPEN_APP", "params": {"app_name": text[5:]}, "confidence": 0.9}
+    if text.startswith("search "):
+        return {"intent_id": "SEARCH_WEB", "params": {"query": text[7:]}, "confidence": 0.9}
+    return {"intent_id": "UNKNOWN", "params": {}, "confidence": 0.4}
+
+
+def chat_answer(messages: list) -> dict:
+    """Proposal JSON for the Groq rewrite / code generation prompts."""
+    system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    user = next((m["content"] for m in messages if m.get("role") == "user"), "")
+
+    if system.startswith("Rewrite"):
+        text = user.strip()
+        text = text[:1].upper() + text[1:]
+        if text and text[-1] not in ".!?":
+            text += "."
+        return {"type": "IMPROVE_TEXT", "confidence": 0.9, "result": {"text": text}}
+
+    if system.startswith("Generate source code"):
+        code = f"# {user.strip()}\nprint('hello')\n"
+        return {"type": "CODE_GENERATION", "confidence": 0.9, "result": {"files": {"main.py": code}}}
+
+    return {"type": "UNKNOWN", "confidence": 0.0}
+
+
+# ---------------- SERVER ----------------
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real providers
+
+    def do_POST(self):
+        mock = self.server.mock
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return self._send_json(400, {"error": "bad request json"})
+
+        if self.path.endswith("/chat/completions"):
+            content = json.dumps(chat_answer(payload.get("messages", [])))
+            shape = "groq"
+        elif self.path.startswith("/models/"):
+            content = json.dumps(route_answer(payload.get("inputs", "")))
+            shape = "huggingface"
+        else:
+            return self._send_json(404, {"error": f"unknown path {self.path}"})
+
+        fault = mock.draw_fault()
+        time.sleep(mock.sample_latency())
+
+        if fault == "hang":
+            time.sleep(mock.config["hang_sec"])
+            return self._send_json(504, {"error": "mock hang"})
+        if fault == "error":
+            status = mock.choice(mock.config["error_statuses"])
+            return self._send_json(status, {"error": f"mock {status}"})
+        if fault == "malformed":
+            content = content[: len(content) // 2]
+
+        if payload.get("stream"):
+            return self._send_stream(shape, content)
+
+        if shape == "groq":
+            data = {"choices": [{"message": {"role": "assistant", "content": content}}]}
+        else:
+            data = [{"generated_text": content}]
+        self._send_json(200, data)
+
+    def _send_json(self, status: int, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, shape: str, content: str):
+        mock = self.server.mock
+        step = max(1, mock.config["stream_chunk_chars"])
+        delay = mock.config["token_delay_ms"] / 1000
+
+        # no Content-Length: the stream ends when the connection closes
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        try:
+            for i in range(0, len(content), step):
+                piece = content[i:i + step]
+                if shape == "groq":
+                    event = {"choices": [{"delta": {"content": piece}}]}
+                else:
+                    event = {"token": {"text": piece}}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if delay:
+                    time.sleep(delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client stopped reading once its JSON closed
+
+    def log_message(self, *args):
+        pass
+
+
+class MockProvider:
+    def __init__(self, config: dict | None = None, host="127.0.0.1", port=0, debug=True):
+        self.config = {**DEFAULTS, **(config or {})}
+        self.debug = debug
+
+        self.requests = 0
+        self.faults = {"error": 0, "malformed": 0, "hang": 0}
+
+        self._rng = random.Random(self.config["seed"])
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+    # ---------------- INJECTION ----------------
+
+    def sample_latency(self) -> float:
+        mean = self.config["latency_ms"] / 1000
+        dist = self.config["latency_dist"]
+        if mean <= 0:
+            return 0.0
+
+        with self._lock:
+            if dist == "uniform":
+                return self._rng.uniform(0, 2 * mean)
+            if dist == "exponential":
+                return self._rng.expovariate(1 / mean)
+            if dist == "lognormal":
+                return self._rng.lognormvariate(math.log(mean), self.config["latency_sigma"])
+        return mean
+
+    def draw_fault(self) -> str | None:
+        """One roll per request: hang, error, malformed or nothing."""
+        with self._lock:
+            self.requests += 1
+            roll = self._rng.random()
+
+            for fault, rate in (
+                ("hang", self.config["hang_rate"]),
+                ("error", self.config["error_rate"]),
+                ("malformed", self.config["malformed_rate"]),
+            ):
+                if roll < rate:
+                    self.faults[fault] += 1
+                    return fault
+                roll -= rate
+        return None
+
+    def choice(self, options: list):
+        with self._lock:
+            return self._rng.choice(options)
+
+    # ---------------- LIFECYCLE ----------------
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def hf_url(self) -> str:
+        return f"{self.base_url}/models/mock"
+
+    @property
+    def groq_url(self) -> str:
+        return f"{self.base_url}/openai/v1/chat/completions"
+
+    def start(self) -> "MockProvider":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        if self.debug:
+            print(f"[MOCK AI] Listening on {self.base_url}")
+        return self
+
+    def serve_forever(self):
+        """Blocking variant of start() for the CLI."""
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, **self.faults}
+
+
+# ---------------- CLI ----------------
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=DEFAULTS["latency_ms"])
+    parser.add_argument("--latency-dist", default=DEFAULTS["latency_dist"],
+                        choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument("--latency-sigma", type=float, default=DEFAULTS["latency_sigma"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULTS["error_rate"])
+    parser.add_argument("--error-statuses", type=int, nargs="+", default=DEFAULTS["error_statuses"])
+    parser.add_argument("--malformed-rate", type=float, default=DEFAULTS["malformed_rate"])
+    parser.add_argument("--hang-rate", type=float, default=DEFAULTS["hang_rate"])
+    parser.add_argument("--hang-sec", type=float, default=DEFAULTS["hang_sec"])
+    parser.add_argument("--token-delay-ms", type=float, default=DEFAULTS["token_delay_ms"])
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args) -> dict:
+    return {key: getattr(args, key) for key in DEFAULTS if hasattr(args, key)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the HuggingFace / Groq APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    mock = MockProvider(config_from_args(args), host=args.host, port=args.port)
+    print(f"[MOCK AI] HF_API_URL={mock.hf_url}")
+    print(f"[MOCK AI] GROQ_ENDPOINT={mock.groq_url}")
+
+    try:
+        mock.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("[MOCK AI] Stats:", mock.stats())
+
+
+if __name__ == "__main__":
+    main()
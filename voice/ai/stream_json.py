@@ -0,0 +1,207 @@
+# ai/stream_json.py
+# Incremental JSON parser for streamed model output
+# - feed() text chunks as they arrive (SSE deltas)
+# - Emits (path, value) the moment each value completes, e.g.
+#     ("result", "text") -> "rewritten text"
+#     ("result", "files", "main.py") -> "print('hi')"
+# - The root must be an object: leading junk before the first { is skipped
+#   (chatty models), so a [ in "Sure [thinking]..." is not mistaken for it
+# - Separators are validated (":" after keys, "," between items); every
+#   malformed input raises StreamJSONError, never json.JSONDecodeError
+# - Builds the final object ONCE; raw text is never accumulated
+
+import json
+
+_WS = " \t\r\n"
+_LITERAL_END = ",}]" + _WS
+
+# what a container frame accepts next
+_KEY_OR_CLOSE = "key or }"      # just opened {
+_KEY = "key"                    # after , in an object
+_COLON = ":"                    # after a key
+_VALUE_OR_CLOSE = "value or ]"  # just opened [
+_VALUE = "value"                # after : or , in an array
+_COMMA_OR_CLOSE = ", or close"  # after a value
+
+
+class StreamJSONError(ValueError):
+    pass
+
+
+class IncrementalJSONParser:
+    def __init__(self, on_value=None):
+        # on_value(path: tuple, value) for EVERY completed value (deepest first)
+        self.on_value = on_value
+
+        self.result = None
+        self.done = False
+        self.started = False
+
+        self._stack = []          # frames: [container, path, key, expects]
+        self._string = None       # raw chars of the open string (escapes kept)
+        self._string_is_key = False
+        self._escape = False
+        self._literal = None      # raw chars of an open number / true / false / null
+
+    # ---------------- VALUE PLUMBING ----------------
+
+    def _emit(self, value):
+        if not self._stack:
+            self.result = value
+            self.done = True
+            if self.on_value:
+                self.on_value((), value)
+            return
+
+        frame = self._stack[-1]
+        container, path = frame[0], frame[1]
+        frame[3] = _COMMA_OR_CLOSE
+
+        if isinstance(container, dict):
+            key = frame[2]
+            container[key] = value
+            frame[2] = None
+            value_path = path + (key,)
+        else:
+            container.append(value)
+            value_path = path + (len(container) - 1,)
+
+        if self.on_value:
+            self.on_value(value_path, value)
+
+    def _current_path(self) -> tuple:
+        if not self._stack:
+            return ()
+        frame = self._stack[-1]
+        if isinstance(frame[0], dict):
+            return frame[1] + (frame[2],)
+        return frame[1] + (len(frame[0]),)
+
+    def _expect(self, *allowed, found):
+        expects = self._stack[-1][3]
+        if expects not in allowed:
+            raise StreamJSONError(f"Expected {expects}, got {found!r}")
+
+    def _start_value(self, found):
+        if self._stack:
+            self._expect(_VALUE, _VALUE_OR_CLOSE, found=found)
+
+    def _open(self, container):
+        self._start_value("{" if isinstance(container, dict) else "[")
+        expects = _KEY_OR_CLOSE if isinstance(container, dict) else _VALUE_OR_CLOSE
+        self._stack.append([container, self._current_path(), None, expects])
+
+    def _close(self, ch):
+        frame = self._stack[-1]
+        if isinstance(frame[0], dict) != (ch == "}"):
+            raise StreamJSONError(f"Mismatched closing bracket {ch!r}")
+        self._expect(_KEY_OR_CLOSE if ch == "}" else _VALUE_OR_CLOSE, _COMMA_OR_CLOSE, found=ch)
+        self._stack.pop()
+        self._emit(frame[0])
+
+    def _finish_literal(self):
+        raw = "".join(self._literal)
+        self._literal = None
+        try:
+            self._emit(json.loads(raw))
+        except json.JSONDecodeError:
+            raise StreamJSONError(f"Bad literal: {raw!r}")
+
+    def _finish_string(self):
+        raw = "".join(self._string)
+        self._string = None
+        try:
+            value = json.loads('"' + raw + '"')
+        except json.JSONDecodeError as e:
+            raise StreamJSONError(f"Bad string: {e.msg}")
+
+        if self._string_is_key:
+            frame = self._stack[-1]
+            frame[2] = value
+            frame[3] = _COLON
+        else:
+            self._emit(value)
+
+    # ---------------- PUBLIC ----------------
+
+    def feed(self, chunk: str):
+        i, n = 0, len(chunk)
+
+        while i < n and not self.done:
+
+            # ---------- inside a string: copy runs in bulk ----------
+            if self._string is not None:
+                if self._escape:
+                    self._string.append(chunk[i])
+                    self._escape = False
+                    i += 1
+                    continue
+
+                quote = chunk.find('"', i)
+                backslash = chunk.find("\\", i)
+                stop = min(p for p in (quote, backslash, n) if p != -1)
+
+                if stop > i:
+                    self._string.append(chunk[i:stop])
+                    i = stop
+                    continue
+
+                if chunk[i] == "\\":
+                    self._string.append("\\")
+                    self._escape = True
+                else:
+                    self._finish_string()
+                i += 1
+                continue
+
+            ch = chunk[i]
+
+            # ---------- inside a literal ----------
+            if self._literal is not None:
+                if ch in _LITERAL_END:
+                    self._finish_literal()
+                    continue  # re-process the terminator
+                self._literal.append(ch)
+                i += 1
+                continue
+
+            # ---------- junk before the root value ----------
+            if not self.started:
+                if ch == "{":
+                    self.started = True
+                else:
+                    i += 1
+                    continue
+
+            if ch in _WS:
+                pass
+            elif ch == "{":
+                self._open({})
+            elif ch == "[":
+                self._open([])
+            elif ch in "}]":
+                self._close(ch)
+            elif ch == ":":
+                self._expect(_COLON, found=ch)
+                self._stack[-1][3] = _VALUE
+            elif ch == ",":
+                self._expect(_COMMA_OR_CLOSE, found=ch)
+                self._stack[-1][3] = _KEY if isinstance(self._stack[-1][0], dict) else _VALUE
+            elif ch == '"':
+                self._string_is_key = self._stack[-1][3] in (_KEY, _KEY_OR_CLOSE)
+                if not self._string_is_key:
+                    self._start_value(ch)
+                self._string = []
+            else:
+                self._start_value(ch)
+                self._literal = [ch]
+
+            i += 1
+
+        return self.done
+
+    def close(self):
+        """End of stream. Raises if the root object never completed."""
+        if not self.done:
+            raise StreamJSONError("Stream ended before JSON completed")
+        return self.result
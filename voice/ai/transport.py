@@ -0,0 +1,335 @@
+# ai/transport.py
+# Shared HTTP transport for ALL AI providers (HuggingFace, Groq, ...)
+# - Keep-alive connection pool per provider endpoint (no DNS/TCP/TLS per call)
+# - Bounded retries with jittered exponential backoff, inside ONE deadline
+# - Per-provider circuit breaker: fail fast while a provider is down
+# - Per-request latency stats
+# - SSE streaming (stream_sse) for incremental responses
+# - `requests` is imported on the first call, not at startup
+
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from utils.log import get_logger
+from utils.metrics import percentile
+
+log = get_logger("ai.transport", "AI TRANSPORT")
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+DEFAULTS = {
+    "retries": 2,
+    "backoff_base_sec": 0.5,
+    "backoff_max_sec": 4.0,
+    "pool_size": 4,
+    "breaker_failures": 3,
+    "breaker_reset_sec": 30.0,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+# ---------------- CIRCUIT BREAKER ----------------
+
+class CircuitBreaker:
+    """
+    CLOSED → calls go through
+    OPEN → calls fail fast for reset_after_sec
+    HALF-OPEN → one trial call; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold=3, reset_after_sec=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after_sec = reset_after_sec
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "CLOSED"
+        if time.monotonic() - self.opened_at >= self.reset_after_sec:
+            return "HALF_OPEN"
+        return "OPEN"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "CLOSED":
+                return True
+            if state == "HALF_OPEN" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+# ---------------- LATENCY STATS ----------------
+
+class ProviderStats:
+    def __init__(self, window=500):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_sec: float, ok: bool, attempts: int):
+        with self._lock:
+            self.calls += 1
+            self.retries += max(0, attempts - 1)
+            if not ok:
+                self.failures += 1
+            self.latencies.append(latency_sec)
+
+    def record_short_circuit(self):
+        with self._lock:
+            self.short_circuited += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            latencies = list(self.latencies)
+
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "short_circuited": self.short_circuited,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+
+
+# ---------------- TRANSPORT ----------------
+
+class AITransport:
+    def __init__(self, config: dict | None = None, debug=True):
+        self.config = {**DEFAULTS, **(config or {})}
+        self.debug = debug
+
+        self._sessions = {}
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    # ---------- per-provider state ----------
+
+    def _session(self, provider: str, url: str) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        parts = urlsplit(url)
+        key = (provider, parts.scheme, parts.netloc)
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.config["pool_size"],
+                    max_retries=0
+                )
+                session.mount(f"{parts.scheme}://", adapter)
+                self._sessions[key] = session
+            return session
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(
+                    self.config["breaker_failures"],
+                    self.config["breaker_reset_sec"]
+                )
+            return self._breakers[provider]
+
+    def _provider_stats(self, provider: str) -> ProviderStats:
+        with self._lock:
+            if provider not in self._stats:
+                self._stats[provider] = ProviderStats()
+            return self._stats[provider]
+
+    def stats(self) -> dict:
+        with self._lock:
+            providers = list(self._stats.items())
+        return {name: s.summary() for name, s in providers}
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": uniform(0, min(max, base * 2^attempt))
+        cap = min(
+            self.config["backoff_max_sec"],
+            self.config["backoff_base_sec"] * (2 ** attempt)
+        )
+        return random.uniform(0, cap)
+
+    # ---------- public ----------
+
+    def post(self, provider: str, url: str, headers: dict, payload: dict,
+             timeout: float, stream=False) -> "requests.Response":
+        """
+        POST with pooling, retries and breaker.
+        `timeout` is the TOTAL deadline across all attempts.
+        Raises CircuitOpenError / requests exceptions on failure.
+        """
+        import requests
+
+        breaker = self.breaker(provider)
+        stats = self._provider_stats(provider)
+
+        if not breaker.allow():
+            stats.record_short_circuit()
+            raise CircuitOpenError(f"{provider} circuit open, failing fast")
+
+        session = self._session(provider, url)
+        started = time.monotonic()
+        deadline = started + timeout
+        attempts = 0
+        last_error = None
+
+        while True:
+            attempts += 1
+            remaining = deadline - time.monotonic()
+
+            try:
+                resp = session.post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=max(remaining, 0.1),
+                    stream=stream
+                )
+                if resp.status_code not in RETRY_STATUS:
+                    resp.raise_for_status()
+                    breaker.record_success()
+                    stats.record(time.monotonic() - started, True, attempts)
+                    return resp
+
+                last_error = requests.HTTPError(
+                    f"{resp.status_code} from {provider}", response=resp
+                )
+                resp.close()
+
+            except requests.HTTPError as e:
+                # non-retryable 4xx: the provider is up, the request is bad
+                breaker.record_success()
+                stats.record(time.monotonic() - started, False, attempts)
+                raise e
+
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                last_error = e
+
+            except requests.RequestException as e:
+                # InvalidURL, TooManyRedirects, ...: retrying won't help, but the
+                # breaker must still see it (a HALF_OPEN trial would stay stuck otherwise)
+                breaker.record_failure()
+                stats.record(time.monotonic() - started, False, attempts)
+                raise e
+
+            wait = self._backoff(attempts - 1)
+            out_of_time = time.monotonic() + wait >= deadline
+
+            if attempts > self.config["retries"] or out_of_time:
+                break
+
+            if self.debug:
+                log.info("%s attempt %d failed (%s), retrying in %.2fs", provider, attempts, last_error, wait)
+            time.sleep(wait)
+
+        breaker.record_failure()
+        stats.record(time.monotonic() - started, False, attempts)
+
+        if self.debug:
+            log.warning("%s failed after %d attempt(s), breaker=%s", provider, attempts, breaker.state)
+
+        raise last_error
+
+    def post_json(self, provider: str, url: str, headers: dict, payload: dict, timeout: float):
+        started = time.monotonic()
+        resp = self.post(provider, url, headers, payload, timeout)
+        if self.debug:
+            log.debug("%s %s in %.0fms", provider, resp.status_code, (time.monotonic() - started) * 1000)
+        return resp.json()
+
+    def stream_sse(self, provider: str, url: str, headers: dict, payload: dict, timeout: float):
+        """
+        POST with stream=True, yield each SSE `data:` payload as a string.
+        Retries/breaker cover the request itself; the body is read line by
+        line and never buffered whole. Stops at [DONE].
+        """
+        resp = self.post(provider, url, headers, payload, timeout, stream=True)
+        # SSE is UTF-8 by spec; without a charset requests would decode as ISO-8859-1
+        resp.encoding = "utf-8"
+        try:
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                yield data
+        finally:
+            resp.close()
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_transport = None
+
+
+def configure(config: dict | None = None, debug=True) -> AITransport:
+    global _transport
+    _transport = AITransport(config, debug=debug)
+    return _transport
+
+
+def get_transport() -> AITransport:
+    global _transport
+    if _transport is None:
+        _transport = AITransport()
+    return _transport
+
+
+def collect_metrics() -> list:
+    """utils/metrics.py collector: per-provider call counters."""
+    if _transport is None:
+        return []
+
+    samples = []
+    for provider, s in _transport.stats().items():
+        labels = {"provider": provider}
+        samples += [
+            ("voice_ai_calls_total", "counter", "AI provider calls", labels, s["calls"]),
+            ("voice_ai_failures_total", "counter", "AI provider calls that failed after retries", labels, s["failures"]),
+            ("voice_ai_retries_total", "counter", "AI provider retry attempts", labels, s["retries"]),
+            ("voice_ai_short_circuited_total", "counter", "AI calls refused by the open breaker", labels,
+             s["short_circuited"]),
+        ]
+    return samples
+
+
+def post_json(provider: str, url: str, headers: dict, payload: dict, timeout: float):
+    return get_transport().post_json(provider, url, headers, payload, timeout)
+
+
+def stream_sse(provider: str, url: str, headers: dict, payload: dict, timeout: float):
+    return get_transport().stream_sse(provider, url, headers, payload, timeout)
@@ -0,0 +1,164 @@
+# brain/action_executor.py
+# Runs long keyboard actions OFF the voice loop
+# - One worker thread + FIFO queue: actions keep their spoken order
+# - Handlers with background=True (typing, navigation, key combos) are queued;
+#   everything else (mode switch, open app, TTS) still runs inline
+# - cancel() stops the running action at its next character / step and drops the queue
+# - progress() → (intent_id, done, total) of the running action
+
+import queue
+import threading
+from collections import namedtuple
+
+from brain.action_registry import get_handler
+from utils import tracing
+from utils.log import get_logger
+
+log = get_logger("action")
+
+ActionEvent = namedtuple("ActionEvent", ["job_id", "intent_id", "result", "error", "cancelled"])
+
+
+class ActionJob:
+    def __init__(self, job_id: int, intent: dict, epoch: int):
+        self.job_id = job_id
+        self.intent = intent
+        self.epoch = epoch        # cancel() bumps the executor epoch → older jobs are stale
+        self.cancelled = threading.Event()
+        self.done = 0
+        self.total = 0
+        self.trace = tracing.hold()   # utterance trace stays open until the job ends
+
+
+class ActionExecutor:
+    def __init__(self, brain, debug=True):
+        self.brain = brain
+        self.debug = debug
+
+        self.events = queue.Queue()
+        self._jobs = queue.Queue()
+        self._current = None
+        self._outstanding = 0     # queued + running
+        self._epoch = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._worker, name="action-executor", daemon=True)
+        self._thread.start()
+
+    # ---------------- WORKER ----------------
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+
+            with self._lock:
+                # taken off the queue just as cancel() ran → still stale
+                stale = job.cancelled.is_set() or job.epoch != self._epoch
+                if stale:
+                    self._outstanding -= 1
+                else:
+                    self._current = job
+
+            if stale:
+                if job.trace:
+                    job.trace.release()
+                continue
+
+            intent_id = job.intent["intent_id"]
+            result, error = None, None
+            try:
+                with tracing.resume(job.trace), tracing.span("execute", intent=intent_id, background=True):
+                    result = self.brain.execute(job.intent, job=job)
+            except Exception as e:
+                log.error("%s: %s", intent_id, e)
+                error = e
+            finally:
+                with self._lock:
+                    self._current = None
+                    self._outstanding -= 1
+
+            cancelled = job.cancelled.is_set()
+            if self.debug:
+                log.debug("#%d %s %s", job.job_id, intent_id, "stopped" if cancelled else "done")
+            self.events.put(ActionEvent(job.job_id, intent_id, result, error, cancelled))
+
+    # ---------------- PUBLIC ----------------
+
+    def run(self, intent: dict):
+        """
+        Inline actions: executed now, result returned.
+        Background actions: queued, returns None (result arrives via poll()).
+        """
+        handler = get_handler(intent["intent_id"])
+        if handler is None or not handler.background:
+            return self.brain.execute(intent)
+
+        self.submit(intent)
+        return None
+
+    def submit(self, intent: dict) -> int:
+        with self._lock:
+            self._next_id += 1
+            self._outstanding += 1
+            job = ActionJob(self._next_id, intent, self._epoch)
+
+        self._jobs.put(job)
+        if self.debug:
+            log.debug("#%d %s queued", job.job_id, intent["intent_id"])
+        return job.job_id
+
+    def cancel(self) -> int:
+        """Stops the running action and drops queued ones. Returns how many."""
+        with self._lock:
+            self._epoch += 1
+
+        dropped = 0
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.cancelled.set()
+                dropped += 1
+                if job.trace:
+                    job.trace.release()
+                with self._lock:
+                    self._outstanding -= 1
+
+        with self._lock:
+            if self._current is not None:
+                self._current.cancelled.set()
+                dropped += 1
+
+        if dropped and self.debug:
+            log.info("Cancelled %d action(s)", dropped)
+        return dropped
+
+    def busy(self) -> bool:
+        with self._lock:
+            return self._outstanding > 0
+
+    def progress(self) -> tuple | None:
+        with self._lock:
+            job = self._current
+        if job is None:
+            return None
+        return job.intent["intent_id"], job.done, job.total
+
+    def poll(self) -> list:
+        """Finished actions. Never blocks."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self, timeout=1.0):
+        self.cancel()
+        self._jobs.put(None)
+        self._thread.join(timeout)
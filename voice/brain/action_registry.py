@@ -0,0 +1,79 @@
+# brain/action_registry.py
+# intent_id -> handler table for KeyboardBrain
+# - Handlers register themselves with @register (new actions never touch the core)
+# - Platform modules (ctypes / SAPI / subprocess) are imported on FIRST USE
+# - Per-handler counters: calls, errors, total / max time, import time
+
+import importlib
+import sys
+import threading
+import time
+
+
+class ActionHandler:
+    intent_id = None
+    background = False  # True → runs on the action executor thread (cancellable)
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+        self.import_sec = 0.0
+        self._lock = threading.Lock()
+
+    def need(self, module_path: str):
+        """Lazy import; the first call's cost is counted as import time."""
+        module = sys.modules.get(module_path)
+        if module is not None:
+            return module
+
+        started = time.perf_counter()
+        module = importlib.import_module(module_path)
+        self.import_sec += time.perf_counter() - started
+        return module
+
+    def run(self, brain, params: dict):
+        """Does the action. May return a user-facing string."""
+        raise NotImplementedError
+
+    def record(self, elapsed: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            self.total_sec += elapsed
+            self.max_sec = max(self.max_sec, elapsed)
+            if not ok:
+                self.errors += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "avg_ms": (self.total_sec / self.calls * 1000) if self.calls else 0.0,
+                "max_ms": self.max_sec * 1000,
+                "import_ms": self.import_sec * 1000,
+            }
+
+
+_handlers = {}
+
+
+def register(handler_cls):
+    """Class decorator: one shared instance per intent_id (last one wins)."""
+    if not handler_cls.intent_id:
+        raise ValueError(f"{handler_cls.__name__} has no intent_id")
+    _handlers[handler_cls.intent_id] = handler_cls()
+    return handler_cls
+
+
+def get_handler(intent_id: str) -> ActionHandler | None:
+    return _handlers.get(intent_id)
+
+
+def registered() -> list:
+    return sorted(_handlers)
+
+
+def stats() -> dict:
+    return {intent_id: h.summary() for intent_id, h in _handlers.items() if h.calls}
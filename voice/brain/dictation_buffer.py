@@ -1,20 +1,145 @@
+# brain/dictation_buffer.py
+# Dictation text as a list of segments (one per utterance), not one growing string
+# - append() is O(1): no re-copying of everything dictated so far
+# - get() joins once and caches until the next change
+# - replace_sentence() rewrites ONE segment; undo() drops the last N appends
+# - take_diff() tells the loop what changed, so it prints only that
+
+import re
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
 class DictationBuffer:
-    def __init__(self):
-        self.buffer = ""
+    def __init__(self, tail_chars=300):
+        self.tail_chars = tail_chars
+
+        self._segments = []
+        self._appended = 0        # trailing segments that came from append() (undoable)
+        self._length = 0          # len(get()) without joining
+        self._text = ""           # cached join
+        self._text_valid = True
+
+        self.version = 0          # bumps on every change (cheap "did it change?")
+        self._dirty_from = None   # first segment changed since the last take_diff()
+        self._rendered = 0        # segments the loop has already seen
+
+    # ---------------- INTERNAL ----------------
+
+    def _changed(self, first_segment: int):
+        self.version += 1
+        self._text_valid = False
+        if self._dirty_from is None or first_segment < self._dirty_from:
+            self._dirty_from = first_segment
+
+    def _recount(self):
+        self._length = sum(len(s) for s in self._segments) + max(0, len(self._segments) - 1)
+
+    # ---------------- EDITING ----------------
 
     def append(self, text: str):
-        if self.buffer:
-            self.buffer += " "
-        self.buffer += text
+        text = text.strip()
+        if not text:
+            return
+
+        self._length += len(text) + (1 if self._segments else 0)
+        self._segments.append(text)
+        self._appended += 1
+        self._changed(len(self._segments) - 1)
 
     def replace(self, text: str):
-        self.buffer = text
+        """Whole-buffer replace (AI rewrite). Not undoable."""
+        self._segments = [text] if text.strip() else []
+        self._appended = 0
+        self._recount()
+        self._changed(0)
+
+    def replace_sentence(self, index: int, text: str) -> bool:
+        """
+        Replaces sentence #index (negative counts from the end, -1 = last).
+        Only the segment holding that sentence is split and rebuilt.
+        """
+        order = range(len(self._segments))
+        if index < 0:
+            order = reversed(order)
+            wanted = -index - 1
+        else:
+            wanted = index
+
+        for seg in order:
+            sentences = SENTENCE_END.split(self._segments[seg])
+            if wanted >= len(sentences):
+                wanted -= len(sentences)
+                continue
+
+            pos = wanted if index >= 0 else len(sentences) - 1 - wanted
+            sentences[pos] = text.strip()
+            self._segments[seg] = " ".join(s for s in sentences if s)
+            self._recount()
+            self._changed(seg)
+            return True
+
+        return False
+
+    def undo(self, count=1) -> int:
+        """Drops up to `count` of the most recent appends. Returns how many."""
+        count = min(count, self._appended)
+        if count <= 0:
+            return 0
+
+        del self._segments[-count:]
+        self._appended -= count
+        self._recount()
+        self._changed(len(self._segments))
+        return count
 
     def clear(self):
-        self.buffer = ""
+        self.replace("")
+
+    # ---------------- VIEWS ----------------
 
     def get(self) -> str:
-        return self.buffer
+        if not self._text_valid:
+            self._text = " ".join(self._segments)
+            self._text_valid = True
+        return self._text
+
+    def __len__(self) -> int:
+        return self._length
 
     def is_empty(self) -> bool:
-        return not self.buffer.strip()
\ No newline at end of file
+        return not self._segments
+
+    def tail(self, max_chars: int | None = None) -> str:
+        """Last max_chars of the text, built from trailing segments only."""
+        max_chars = max_chars or self.tail_chars
+        parts, size = [], 0
+
+        for segment in reversed(self._segments):
+            parts.append(segment)
+            size += len(segment) + 1
+            if size > max_chars:
+                break
+
+        text = " ".join(reversed(parts))
+        return text if len(text) <= max_chars else "…" + text[-max_chars:]
+
+    def take_diff(self) -> tuple[str, str]:
+        """
+        What changed since the last call:
+          ("append", new text)      only new utterances at the end
+          ("rewrite", tail view)    something earlier changed or was undone
+          ("none", "")
+        """
+        first = self._dirty_from
+        rendered = self._rendered
+        self._dirty_from = None
+        self._rendered = len(self._segments)
+
+        if first is None:
+            return "none", ""
+
+        if first >= rendered and len(self._segments) > rendered:
+            return "append", " ".join(self._segments[rendered:])
+
+        return "rewrite", self.tail()
@@ -0,0 +1,162 @@
+# brain/handlers.py
+# Built-in actions for KeyboardBrain (one class per intent_id)
+# Importing this module must stay cheap: OS modules are pulled in via need()
+
+from brain.action_registry import ActionHandler, register
+from brain.context import is_browser_context
+from utils.log import get_logger
+
+log = get_logger("execute")
+
+OS = "os_actions.os_actions"
+KEYBOARD = "os_actions.keyboard_utils"
+SAY = "utils.say"
+
+SEARCH_URL = "https://www.google.com/search?q="
+
+
+def _output(handler: ActionHandler, brain, text: str):
+    """Typed when short, pasted when long (settings.execution)."""
+    execution = brain.settings.get("execution", {})
+    handler.need(KEYBOARD).output_text(
+        text,
+        paste_threshold=execution.get("paste_threshold_chars", 200),
+        restore_delay=execution.get("paste_restore_delay_sec", 0.3),
+        delay=execution.get("typing_delay_sec", 0.01),
+        debug=brain.debug,
+        should_stop=brain.should_stop,
+        on_progress=brain.report_progress
+    )
+
+
+@register
+class ModeSwitch(ActionHandler):
+    intent_id = "MODE_SWITCH"
+
+    def run(self, brain, params):
+        mode = params.get("mode")
+        if mode:
+            brain.state.set_mode(mode)
+        else:
+            log.error("MODE_SWITCH missing mode")
+
+
+@register
+class OpenWebsite(ActionHandler):
+    intent_id = "OPEN_WEBSITE"
+
+    def run(self, brain, params):
+        url = params.get("url")
+        if url:
+            self.need(OS).open_website(url)
+            brain.state.set_active_app("browser")
+        else:
+            log.error("OPEN_WEBSITE missing url")
+
+
+@register
+class OpenApp(ActionHandler):
+    intent_id = "OPEN_APP"
+
+    def run(self, brain, params):
+        app = params.get("app_name")
+        if not app:
+            log.error("OPEN_APP missing app_name")
+            return
+
+        if self.need(OS).open_app(app):
+            brain.state.set_active_app(app)
+            msg = f"Opening {app}"
+        else:
+            msg = f"I couldn't find {app}"
+
+        # back-to-back launches: only the latest "Opening X" is spoken
+        self.need(SAY).say(msg, debug=brain.debug, key="open_app")
+
+
+@register
+class SearchWeb(ActionHandler):
+    intent_id = "SEARCH_WEB"
+
+    def run(self, brain, params):
+        query = params.get("query")
+        if not query:
+            log.error("SEARCH_WEB missing query")
+            return
+
+        in_browser = is_browser_context(brain.state)
+
+        if brain.debug:
+            if in_browser:
+                log.debug("Browser active → searching in browser")
+                self.need(SAY).say(f"Searching for {query}", debug=brain.debug, key="search_web")
+            else:
+                log.debug("No browser active → opening browser")
+
+        self.need(OS).open_website(SEARCH_URL + query.replace(" ", "+"))
+
+        if not in_browser:
+            brain.state.set_active_app("browser")
+
+
+@register
+class TextInput(ActionHandler):
+    intent_id = "TEXT_INPUT"
+    background = True
+
+    def run(self, brain, params):
+        content = params.get("content", "")
+        if content:
+            _output(self, brain, content)
+        else:
+            log.warning("TEXT_INPUT empty content")
+
+
+@register
+class CodeGeneration(ActionHandler):
+    intent_id = "CODE_GENERATION"
+    background = True
+
+    def run(self, brain, params):
+        code = params.get("code", "")
+        if code:
+            _output(self, brain, code)
+        else:
+            log.warning("CODE_GENERATION empty code")
+
+
+@register
+class KeyCommand(ActionHandler):
+    intent_id = "KEY_COMMAND"
+    background = True  # keeps its place behind queued typing
+
+    def run(self, brain, params):
+        keys = params.get("keys")
+        if keys:
+            self.need(KEYBOARD).press_combo(keys)
+        else:
+            log.error("KEY_COMMAND missing keys")
+
+
+@register
+class Navigation(ActionHandler):
+    intent_id = "NAVIGATION"
+    background = True
+
+    def run(self, brain, params):
+        direction = params.get("direction", "").upper()
+        count = params.get("count", 1)
+
+        if direction not in brain.keys["virtual_keys"]:
+            log.error("Invalid navigation direction: %s", direction)
+            return
+
+        if brain.debug:
+            log.debug("Navigation %s x%d", direction, count)
+
+        sent = self.need(KEYBOARD).press_repeat(
+            direction, count, debug=brain.debug,
+            should_stop=brain.should_stop, on_progress=brain.report_progress
+        )
+        if sent < count:
+            log.info("Navigation stopped at %d/%d", sent, count)
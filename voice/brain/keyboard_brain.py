@@ -1,12 +1,18 @@
 # Auto-generated by scaffold.py
 # brain/keyboard_brain.py
 # Deterministic executor: intent -> actions
+# Dispatch is a table lookup (brain/action_registry.py); the actions
+# themselves live in brain/handlers.py and import OS modules lazily.
+
+import threading
+import time
 
 from brain.state import State
-from os_actions.keyboard_utils import press_combo, type_text
-from os_actions.os_actions import open_website, open_app
-from brain.context import  is_browser_context
-from utils.tts import speak
+from brain import action_registry
+import brain.handlers  # noqa: F401 (registers the built-in actions)
+from utils.log import get_logger
+
+log = get_logger("execute")
 
 class KeyboardBrain:
     def __init__(self, state: State, settings: dict, keys: dict):
@@ -16,119 +22,55 @@ class KeyboardBrain:
 
         self.debug = settings["debug"]["print_execution"]
 
+        # job being executed on THIS thread (set by brain/action_executor.py)
+        self._local = threading.local()
+
         if self.debug:
-            print("[KEYBOARD BRAIN INIT]")
-            print("[KEYBOARD BRAIN] Default mode:", self.state.mode)
+            log.debug("Keyboard brain default mode: %s", self.state.mode)
+            log.debug("Actions: %s", ", ".join(action_registry.registered()))
+
+    # ---------- cancellation / progress hooks for handlers ----------
+
+    def should_stop(self) -> bool:
+        job = getattr(self._local, "job", None)
+        return job is not None and job.cancelled.is_set()
+
+    def report_progress(self, done: int, total: int):
+        job = getattr(self._local, "job", None)
+        if job is not None:
+            job.done, job.total = done, total
 
-    def execute(self, intent: dict):
+    def execute(self, intent: dict, job=None):
         intent_id = intent["intent_id"]
         params = intent.get("params", {})
 
         if self.debug:
-            print(f"[EXECUTE] intent_id={intent_id}, params={params}")
+            log.info("intent_id=%s, params=%s", intent_id, params)
 
         # Track last intent
         self.state.set_last_intent(intent_id)
 
-        # ---------- MODE SWITCH ----------
-        if intent_id == "MODE_SWITCH":
-            mode = params.get("mode")
-            if mode:
-                self.state.set_mode(mode)
-            else:
-                print("[EXECUTE ERROR] MODE_SWITCH missing mode")
-            return
-
-        # ---------- OPEN WEBSITE ----------
-        if intent_id == "OPEN_WEBSITE":
-            url = params.get("url")
-            if url:
-                open_website(url)
-                self.state.set_active_app("browser")
-            else:
-                print("[EXECUTE ERROR] OPEN_WEBSITE missing url")
-            return
-
-        # ---------- OPEN APP ----------
-        if intent_id == "OPEN_APP":
-            app = params.get("app_name")
-            if app:
-                open_app(app)
-                self.state.set_active_app(app)
-
-                msg = f"Opening {app}"
-                print(msg)
-                speak(msg, debug=self.debug)
-            else:
-                print("[EXECUTE ERROR] OPEN_APP missing app_name")
-            return
-
-        # ---------- SEARCH WEB ----------
-        if intent_id == "SEARCH_WEB":
-            query = params.get("query")
-            if intent_id == "SEARCH_WEB":
-                query = params.get("query")
-                if not query:
-                    print("[EXECUTE ERROR] SEARCH_WEB missing query")
-                    return
-
-                search_url = "https://www.google.com/search?q=" + query.replace(" ", "+")
-
-                if is_browser_context(self.state):
-                    if self.debug:
-                        print("[CONTEXT] Browser active → searching in browser")
-                        msg = f"Searching for {query}"
-                        print(msg)
-                        speak(msg, debug=self.debug)
-                    open_website(search_url)
-                else:
-                    if self.debug:
-                        print("[CONTEXT] No browser active → opening browser")
-                    open_website(search_url)
-                    self.state.set_active_app("browser")
-
-            return
-
-        # ---------- TEXT INPUT ----------
-        if intent_id == "TEXT_INPUT":
-            content = params.get("content", "")
-            if content:
-                type_text(content)
-            else:
-                print("[EXECUTE WARNING] TEXT_INPUT empty content")
-            return
-
-        # ---------- CODE GENERATION ----------
-        if intent_id == "CODE_GENERATION":
-            code = params.get("code", "")
-            if code:
-                type_text(code)
-            else:
-                print("[EXECUTE WARNING] CODE_GENERATION empty code")
-            return
-
-        # ---------- KEY COMMAND ----------
-        if intent_id == "KEY_COMMAND":
-            keys = params.get("keys")
-            if keys:
-                press_combo(keys)
-            else:
-                print("[EXECUTE ERROR] KEY_COMMAND missing keys")
-            return
-
-        # ---------- NAVIGATION ----------
-        if intent_id == "NAVIGATION":
-            direction = params.get("direction", "").upper()
-            count = params.get("count", 1)
-
-            if direction in self.keys["virtual_keys"]:
-                for i in range(count):
-                    if self.debug:
-                        print(f"[NAVIGATION] {direction} ({i+1}/{count})")
-                    press_combo([direction])
-            else:
-                print("[EXECUTE ERROR] Invalid navigation direction:", direction)
-            return
+        handler = action_registry.get_handler(intent_id)
 
         # ---------- UNKNOWN ----------
-        print(f"[EXECUTE] Intent not handled: {intent_id}")
\ No newline at end of file
+        if handler is None:
+            log.warning("Intent not handled: %s", intent_id)
+            return None
+
+        started = time.perf_counter()
+        ok = False
+        self._local.job = job
+        try:
+            result = handler.run(self, params)
+            ok = True
+            return result
+        finally:
+            self._local.job = None
+            elapsed = time.perf_counter() - started
+            handler.record(elapsed, ok)
+            if self.debug:
+                log.debug("%s took %.1fms", intent_id, elapsed * 1000)
+
+    def stats(self) -> dict:
+        """Per-action timing counters (only actions that ran)."""
+        return action_registry.stats()
@@ -1,15 +1,41 @@
+import threading
+
+from utils.log import get_logger
+
+log = get_logger("plan")
+
+
 class PendingPlan:
     def __init__(self):
         self.files = {}
         self.active = False
+        self.plan_id = 0          # bumped by clear(); a codegen stream only feeds the plan it started
+        self._lock = threading.Lock()
 
     def set(self, files: dict):
-        self.files = files
-        self.active = True
+        with self._lock:
+            self.files = files
+            self.active = True
 
-    def clear(self):
-        self.files = {}
-        self.active = False
+    def add_file(self, name: str, code: str, plan_id: int | None = None) -> bool:
+        """
+        Streamed file landing early (AI worker thread). The plan stays inactive until set().
+        Dropped once the plan_id it was started for is no longer current (cancelled / replaced).
+        """
+        with self._lock:
+            if self.active or (plan_id is not None and plan_id != self.plan_id):
+                return False
+            self.files[name] = code
+        log.info("+ %s", name)
+        return True
+
+    def clear(self) -> int:
+        """Drops the plan; returns the id of the next one."""
+        with self._lock:
+            self.files = {}
+            self.active = False
+            self.plan_id += 1
+            return self.plan_id
 
     def is_active(self) -> bool:
         return self.active
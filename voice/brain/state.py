@@ -3,6 +3,10 @@
 # Holds global execution state
 # NO OS calls here
 
+from utils.log import get_logger
+
+log = get_logger("state")
+
 class State:
     def __init__(self, default_mode="COMMAND", debug=True):
         self.mode = default_mode
@@ -12,21 +16,21 @@ class State:
         self.debug = debug
 
         if self.debug:
-            print(f"[STATE INIT] mode={self.mode}")
+            log.debug("Init mode=%s", self.mode)
 
     def set_mode(self, mode: str):
         if self.debug:
-            print(f"[STATE] Mode change requested: {self.mode} -> {mode}")
+            log.info("Mode change requested: %s -> %s", self.mode, mode)
         self.mode = mode
 
     def set_active_app(self, app_name: str):
         if self.debug:
-            print(f"[STATE] Active app set to: {app_name}")
+            log.debug("Active app set to: %s", app_name)
         self.active_app = app_name
 
     def set_last_intent(self, intent_id: str):
         if self.debug:
-            print(f"[STATE] Last intent updated: {intent_id}")
+            log.debug("Last intent updated: %s", intent_id)
         self.last_intent = intent_id
 
     def snapshot(self) -> dict:
@@ -36,16 +40,16 @@ class State:
             "last_intent": self.last_intent
         }
         if self.debug:
-            print(f"[STATE SNAPSHOT] {snap}")
+            log.debug("Snapshot %s", snap)
         return snap
     
     
     def set_awaiting(self, param: str):
         if self.debug:
-            print(f"[STATE] Awaiting param: {param}")
+            log.debug("Awaiting param: %s", param)
         self.awaiting_param = param
 
     def clear_awaiting(self):
         if self.debug:
-            print("[STATE] Cleared awaiting param")
+            log.debug("Cleared awaiting param")
         self.awaiting_param = None
\ No newline at end of file
@@ -0,0 +1,157 @@
+# intent/ai_cache.py
+# Disk-persistent LRU + TTL cache for AI-routed intents
+# - Key: normalized text + prompt/model version
+# - UNKNOWN / parse failures get a SHORT negative TTL
+# - Network errors are never cached (transient)
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from utils.log import get_logger
+
+log = get_logger("intent.ai_cache", "AI CACHE")
+
+DEFAULTS = {
+    "enabled": True,
+    "path": "data/ai_route_cache.json",
+    "max_entries": 500,
+    "ttl_sec": 7 * 24 * 3600,
+    "negative_ttl_sec": 300,
+}
+
+
+def cache_key(text: str, version: str) -> str:
+    return hashlib.sha1(f"{version}\n{text}".encode("utf-8")).hexdigest()
+
+
+class AIRouteCache:
+    def __init__(self, path, max_entries=500, ttl_sec=7 * 24 * 3600,
+                 negative_ttl_sec=300, clock=time.time, debug=True):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.negative_ttl_sec = negative_ttl_sec
+        self.clock = clock
+        self.debug = debug
+
+        self.hits = 0
+        self.misses = 0
+
+        # key -> {"intent": ..., "expires": ts}; order = recency (last = newest)
+        self._entries = None
+        self._lock = threading.Lock()
+
+    # ---------- persistence ----------
+
+    def _load(self):
+        self._entries = OrderedDict()
+        if not self.path.exists():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            now = self.clock()
+            for key, entry in data.items():
+                if entry.get("expires", 0) > now:
+                    self._entries[key] = entry
+        except Exception as e:
+            log.error("Failed to load cache: %s", e)
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._entries), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            log.error("Failed to save cache: %s", e)
+
+    # ---------- public ----------
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            if self._entries is None:
+                self._load()
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry["expires"] <= self.clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry["intent"])
+
+    def put(self, key: str, intent: dict, negative=False):
+        ttl = self.negative_ttl_sec if negative else self.ttl_sec
+
+        with self._lock:
+            if self._entries is None:
+                self._load()
+
+            self._entries[key] = {
+                "intent": copy.deepcopy(intent),
+                "expires": self.clock() + ttl
+            }
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            self._save()
+
+        if self.debug:
+            log.debug("Stored %s entry (ttl=%ss)", "negative" if negative else "positive", ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._save()
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_cache = None
+_enabled = True
+
+
+def configure(config: dict | None = None, debug=True) -> AIRouteCache | None:
+    global _cache, _enabled
+    config = {**DEFAULTS, **(config or {})}
+
+    _enabled = config["enabled"]
+    _cache = AIRouteCache(
+        config["path"],
+        max_entries=config["max_entries"],
+        ttl_sec=config["ttl_sec"],
+        negative_ttl_sec=config["negative_ttl_sec"],
+        debug=debug
+    )
+    return _cache if _enabled else None
+
+
+def get_cache() -> AIRouteCache | None:
+    if _cache is None:
+        configure()
+    return _cache if _enabled else None
+
+
+def collect_metrics() -> list:
+    """utils/metrics.py collector: route cache hit/miss counters."""
+    if _cache is None or not _enabled:
+        return []
+    help_text = "AI route cache lookups"
+    return [
+        ("voice_route_cache_lookups_total", "counter", help_text, {"result": "hit"}, _cache.hits),
+        ("voice_route_cache_lookups_total", "counter", help_text, {"result": "miss"}, _cache.misses),
+    ]
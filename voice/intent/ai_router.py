@@ -2,38 +2,56 @@
 
 import os
 import json
-import requests
+import hashlib
+
+from ai.transport import post_json, stream_sse
+from ai.stream_json import IncrementalJSONParser, StreamJSONError
+from ai.budget import get_budget, BudgetExhausted
+from intent.ai_cache import get_cache, cache_key
+from utils.log import get_logger
+
+log = get_logger("intent.ai", "AI ROUTER")
+raw_log = get_logger("intent.ai.raw", "AI RAW OUTPUT")
 
 
 HF_MODEL = "HuggingFaceH4/zephyr-7b-beta"
-HF_API_URL = f"https://api-inference.huggingface.co/models/{HF_MODEL}"
+# HF_API_URL env var points the router at another server (e.g. ai/mock_provider.py)
+HF_API_URL = os.getenv("HF_API_URL", f"https://api-inference.huggingface.co/models/{HF_MODEL}")
+
+# SSE token stream; reading stops as soon as the first JSON object closes
+HF_STREAM = False
 
 
 def _canonical_intent(raw: dict) -> dict:
     """
     Force intent into canonical schema so validators never fail.
+    Malformed fields ("confidence": "high" / null, non-object params) → UNKNOWN.
     """
+    intent_id = raw.get("intent_id", "UNKNOWN")
+    params = raw.get("params", {})
+    try:
+        confidence = float(raw.get("confidence", 0.4))
+    except (TypeError, ValueError):
+        confidence = None
+
+    if (
+        not isinstance(intent_id, str)
+        or not isinstance(params, dict)
+        or confidence is None
+        or not 0.0 <= confidence <= 1.0     # also rejects NaN
+    ):
+        log.error("Malformed intent from model: %s", raw)
+        return _canonical_intent({"intent_id": "UNKNOWN"})
+
     return {
-        "intent_id": raw.get("intent_id", "UNKNOWN"),
-        "params": raw.get("params", {}),
-        "confidence": float(raw.get("confidence", 0.4)),
+        "intent_id": intent_id,
+        "params": params,
+        "confidence": confidence,
         "source": "AI"
     }
 
 
-def ai_route(text: str):
-    api_key = os.getenv("HUGGINGFACE_API_KEY")
-
-    if not api_key:
-        print("[AI ROUTER] HuggingFace API key missing")
-        return None
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-
-    prompt = f"""
+PROMPT_TEMPLATE = """
 Return ONLY valid JSON. No text. No explanations.
 
 User input: "{text}"
@@ -46,43 +64,118 @@ Schema:
 }}
 """
 
-    payload = {
-        "inputs": prompt,
-        "parameters": {
-            "temperature": 0.2,
-            "max_new_tokens": 200
-        }
-    }
+ROUTE_PARAMETERS = {
+    "temperature": 0.2,
+    "max_new_tokens": 200,
+    "return_full_text": False  # the prompt itself contains a JSON schema
+}
+
+# Bump when _extract_json / _canonical_intent start reading answers differently
+PARSER_VERSION = 2
+
+# Cache key version: model + prompt + request parameters + parser → a change to
+# any of them and old cache entries stop matching
+PROMPT_VERSION = hashlib.sha1(
+    "\n".join([
+        HF_MODEL,
+        PROMPT_TEMPLATE,
+        json.dumps(ROUTE_PARAMETERS, sort_keys=True),
+        str(PARSER_VERSION),
+    ]).encode("utf-8")
+).hexdigest()[:12]
+
+
+def _extract_json(parser: IncrementalJSONParser):
+    """First complete JSON object the model produced, or None."""
+    try:
+        parsed = parser.close()
+    except StreamJSONError as e:
+        log.error("No JSON found: %s", e)
+        return None
+
+    if not isinstance(parsed, dict):
+        log.error("JSON is not an object")
+        return None
+    return parsed
+
+
+def _complete_route(headers: dict, payload: dict):
+    data = post_json("huggingface", HF_API_URL, headers, payload, timeout=60)
+    raw_text = data[0].get("generated_text", "")
+    raw_log.debug("%s", raw_text[:500])
+
+    parser = IncrementalJSONParser()
+    parser.feed(raw_text)
+    return _extract_json(parser)
+
+
+def _stream_route(headers: dict, payload: dict):
+    parser = IncrementalJSONParser()
+    stream = stream_sse("huggingface", HF_API_URL, headers, {**payload, "stream": True}, timeout=60)
 
     try:
-        r = requests.post(
-            HF_API_URL,
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
-        r.raise_for_status()
+        for data in stream:
+            token = json.loads(data).get("token", {}).get("text", "")
+            if token and parser.feed(token):
+                break  # object complete → stop paying for tokens
+    finally:
+        stream.close()
 
-        raw_text = r.json()[0].get("generated_text", "")
-        print("[AI RAW OUTPUT]", raw_text[:500])
+    return _extract_json(parser)
 
-        # -------- HARD JSON EXTRACTION --------
-        start = raw_text.find("{")
-        end = raw_text.rfind("}") + 1
 
-        if start == -1 or end <= start:
-            print("[AI ROUTER ERROR] No JSON found")
-            return _canonical_intent({"intent_id": "UNKNOWN"})
+def ai_route(text: str):
+    # ---------- CACHE (normalized text + prompt/model version) ----------
+    cache = get_cache()
+    key = cache_key(text, PROMPT_VERSION)
 
-        json_text = raw_text[start:end]
+    if cache:
+        cached = cache.get(key)
+        if cached:
+            log.info("Cache hit: %s", cached["intent_id"])
+            return cached
 
-        parsed = json.loads(json_text)
+    api_key = os.getenv("HUGGINGFACE_API_KEY")
 
-        intent = _canonical_intent(parsed)
+    if not api_key:
+        log.warning("HuggingFace API key missing")
+        return None
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
 
-        print("[AI ROUTER] Parsed intent:", intent)
-        return intent
+    prompt = PROMPT_TEMPLATE.format(text=text)
+
+    payload = {
+        "inputs": prompt,
+        "parameters": dict(ROUTE_PARAMETERS)
+    }
+
+    try:
+        # budget + coalescing: identical in-flight texts share one paid call
+        parsed = get_budget().call(
+            key,
+            _stream_route if HF_STREAM else _complete_route,
+            headers,
+            payload
+        )
+
+    except BudgetExhausted:
+        # degrade: local tiers only until budget refills
+        return None
 
     except Exception as e:
-        print("[AI ROUTER ERROR]", e)
-        return _canonical_intent({"intent_id": "UNKNOWN"})
\ No newline at end of file
+        # transport failure → NOT cached, next call may succeed
+        log.error("%s", e)
+        return _canonical_intent({"intent_id": "UNKNOWN"})
+
+    # parse failures → UNKNOWN (negative-cached below)
+    intent = _canonical_intent(parsed or {"intent_id": "UNKNOWN"})
+    log.info("Parsed intent: %s", intent)
+
+    if cache:
+        cache.put(key, intent, negative=intent["intent_id"] == "UNKNOWN")
+
+    return intent
@@ -4,15 +4,18 @@
 import json
 from pathlib import Path
 from intent.moderation import is_safe_to_learn
+from utils.log import get_logger
+
+log = get_logger("intent.learner", "LEARNER")
 
 RULE_FILE = Path("data/learned_rules.json")
 
 
 def learn(intent: dict, normalized_text: str):
-    print("[LEARNER] Attempting to learn")
+    log.debug("Attempting to learn")
 
     if not is_safe_to_learn(intent, normalized_text):
-        print("[LEARNER] Learning rejected")
+        log.debug("Learning rejected")
         return
 
     # -------- load existing rules safely --------
@@ -29,7 +32,7 @@ def learn(intent: dict, normalized_text: str):
     # -------- duplicate check (STRICT) --------
     for r in rules:
         if r.get("pattern") == normalized_text:
-            print("[LEARNER] Rule already exists")
+            log.debug("Rule already exists")
             return
 
     # -------- enforce canonical schema --------
@@ -45,4 +48,4 @@ def learn(intent: dict, normalized_text: str):
     RULE_FILE.parent.mkdir(parents=True, exist_ok=True)
     RULE_FILE.write_text(json.dumps(rules, indent=2))
 
-    print("[LEARNER] Rule learned:", rule)
\ No newline at end of file
+    log.info("Rule learned: %s", rule)
\ No newline at end of file
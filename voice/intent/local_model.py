@@ -0,0 +1,267 @@
+# intent/local_model.py
+# Offline intent classifier — router tier between rules and the cloud AI
+# - Hashed char/word n-gram features (NumPy, no vocab file)
+# - Nearest-centroid over ACTIONS (intent_id + params)
+# - Confidence = softmax over cosine similarities (how clearly ONE action wins)
+# - Trained from rules.json, learned rules and INTENT_PARSED history
+# - Open-ended intents (SEARCH_WEB, ...) are never predicted: params come from the text
+#
+# Train (from voice/):
+#   python -m intent.local_model train
+#   python -m intent.local_model predict "start note pad"
+
+import json
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from intent.rule_router import OPEN_ENDED_INTENTS
+from utils.normalizer import normalize
+from utils.log import get_logger
+
+log = get_logger("intent.local", "LOCAL MODEL")
+
+MODEL_FILE = Path("data/local_intent_model.npz")
+RULES_FILE = Path("intent/rules.json")
+LEARNED_FILE = Path("data/learned_rules.json")
+LOG_FILE = Path("data/logs.jsonl")
+
+N_FEATURES = 2 ** 12
+MIN_HISTORY_CONFIDENCE = 0.9
+
+SOFTMAX_TEMPERATURE = 0.05
+MIN_SIMILARITY = 0.4  # below this the text looks like nothing we trained on
+
+# Words that flip an action's meaning — bag-of-ngrams can't see that, so abstain
+ABSTAIN_WORDS = {"close", "quit", "exit", "kill", "stop", "cancel", "not", "dont", "don't"}
+
+
+# ---------------- FEATURES ----------------
+
+def _hash(token: str) -> int:
+    # crc32: stable across runs (built-in hash() is salted per process)
+    return zlib.crc32(token.encode("utf-8")) % N_FEATURES
+
+
+def featurize(text: str) -> np.ndarray:
+    vec = np.zeros(N_FEATURES, dtype=np.float32)
+    words = text.split()
+
+    # word unigrams + bigrams (weighted up: whole words matter most)
+    for w in words:
+        vec[_hash("w:" + w)] += 2.0
+    for a, b in zip(words, words[1:]):
+        vec[_hash("b:" + a + " " + b)] += 2.0
+
+    # char 3-grams survive STT misspellings ("you tube" vs "youtube")
+    padded = f" {text.replace(' ', '')} "
+    for i in range(len(padded) - 2):
+        vec[_hash("c:" + padded[i:i + 3])] += 1.0
+
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+# ---------------- TRAINING DATA ----------------
+
+def _label(intent_id: str, params: dict) -> str:
+    return json.dumps({"intent_id": intent_id, "params": params or {}}, sort_keys=True)
+
+
+def _read_rules(path: Path) -> list:
+    if not path.exists():
+        return []
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return [r for r in data if isinstance(r, dict) and r.get("pattern") and r.get("intent_id")]
+    except Exception as e:
+        log.error("Failed to read %s: %s", path, e)
+        return []
+
+
+def _history_examples(path: Path) -> list:
+    """Pairs each INTENT_PARSED with the STT_RESULT text right before it."""
+    if not path.exists():
+        return []
+
+    examples = []
+    last_text = None
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            payload = entry.get("payload", {})
+            event_type = entry.get("event_type")
+
+            if event_type == "STT_RESULT":
+                last_text = payload.get("text")
+                continue
+
+            if event_type != "INTENT_PARSED" or not last_text:
+                continue
+
+            if (
+                payload.get("intent_id") not in (None, "UNKNOWN")
+                and payload.get("confidence", 0) >= MIN_HISTORY_CONFIDENCE
+            ):
+                examples.append((last_text, payload["intent_id"], payload.get("params", {})))
+            last_text = None
+
+    return examples
+
+
+def collect_examples() -> list:
+    """[(normalized_text, label)] from every training source."""
+    raw = []
+
+    for rule in _read_rules(RULES_FILE) + _read_rules(LEARNED_FILE):
+        raw.append((rule["pattern"], rule["intent_id"], rule.get("params", {})))
+
+    raw += _history_examples(LOG_FILE)
+
+    examples = []
+    for text, intent_id, params in raw:
+        if intent_id in OPEN_ENDED_INTENTS:
+            continue
+        text = normalize(text, debug=False)
+        if text:
+            examples.append((text, _label(intent_id, params)))
+
+    return examples
+
+
+# ---------------- MODEL ----------------
+
+class LocalIntentModel:
+    def __init__(self, labels: list, centroids: np.ndarray):
+        self.labels = labels
+        self.centroids = centroids.astype(np.float32)
+
+    @classmethod
+    def train(cls, examples: list) -> "LocalIntentModel":
+        by_label = {}
+        for text, label in examples:
+            by_label.setdefault(label, []).append(featurize(text))
+
+        labels = sorted(by_label)
+        centroids = np.zeros((len(labels), N_FEATURES), dtype=np.float32)
+
+        for i, label in enumerate(labels):
+            c = np.mean(by_label[label], axis=0)
+            norm = np.linalg.norm(c)
+            centroids[i] = c / norm if norm else c
+
+        return cls(labels, centroids)
+
+    def save(self, path=MODEL_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            centroids=self.centroids.astype(np.float16),
+            labels=np.array(json.dumps(self.labels))
+        )
+
+    @classmethod
+    def load(cls, path=MODEL_FILE) -> "LocalIntentModel":
+        with np.load(Path(path)) as data:
+            labels = json.loads(str(data["labels"]))
+            return cls(labels, data["centroids"])
+
+    def predict(self, text: str) -> tuple[dict | None, float, float]:
+        """Returns (action, confidence, cosine similarity of the best centroid)."""
+        if not self.labels:
+            return None, 0.0, 0.0
+
+        scores = self.centroids @ featurize(text)
+        best = int(np.argmax(scores))
+
+        probs = np.exp((scores - scores[best]) / SOFTMAX_TEMPERATURE)
+        confidence = float(probs[best] / probs.sum())
+
+        return json.loads(self.labels[best]), confidence, float(scores[best])
+
+
+# ---------------- ROUTER TIER ----------------
+
+_model = None
+
+
+def load_model(path=MODEL_FILE, debug=True) -> LocalIntentModel | None:
+    global _model
+
+    path = Path(path)
+    if not path.exists():
+        if debug:
+            log.info("No model at %s (run: python -m intent.local_model train)", path)
+        _model = None
+        return None
+
+    try:
+        _model = LocalIntentModel.load(path)
+        if debug:
+            log.info("Loaded %d actions from %s", len(_model.labels), path)
+    except Exception as e:
+        log.error("Failed to load model: %s", e)
+        _model = None
+
+    return _model
+
+
+def local_route(normalized: str, min_confidence=0.85):
+    """
+    Returns an intent with source LOCAL_MODEL, or None → AI decides.
+    Below min_confidence the model abstains instead of guessing.
+    """
+    if _model is None or not normalized:
+        return None
+
+    text = normalized.lower().strip()
+    if ABSTAIN_WORDS.intersection(text.split()):
+        log.debug("Abstained (negating word)")
+        return None
+
+    action, confidence, similarity = _model.predict(text)
+    if action is None or similarity < MIN_SIMILARITY or confidence < min_confidence:
+        log.debug("Abstained (confidence=%.2f, similarity=%.2f)", confidence, similarity)
+        return None
+
+    log.debug("Matched intent: %s (confidence=%.2f, similarity=%.2f)", action["intent_id"], confidence, similarity)
+    return {
+        "intent_id": action["intent_id"],
+        "params": action["params"],
+        "confidence": round(confidence, 3),
+        "source": "LOCAL_MODEL"
+    }
+
+
+# ---------------- CLI ----------------
+
+def main(argv: list):
+    if not argv or argv[0] not in ("train", "predict"):
+        print('Usage: python -m intent.local_model train | predict "text"')
+        return
+
+    if argv[0] == "train":
+        examples = collect_examples()
+        model = LocalIntentModel.train(examples)
+        model.save(MODEL_FILE)
+        size_kb = MODEL_FILE.stat().st_size / 1024
+        print(
+            f"[LOCAL MODEL] Trained on {len(examples)} examples, "
+            f"{len(model.labels)} actions → {MODEL_FILE} ({size_kb:.1f} KB)"
+        )
+        return
+
+    load_model()
+    print(local_route(normalize(" ".join(argv[1:]), debug=False), min_confidence=0.0))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
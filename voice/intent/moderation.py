@@ -3,6 +3,10 @@
 
 import re
 
+from utils.log import get_logger
+
+log = get_logger("intent.moderation", "MODERATION")
+
 LEARNABLE = {
     "OPEN_WEBSITE",
     "OPEN_APP",
@@ -22,24 +26,24 @@ PERSONAL_PATTERNS = [
 FILE_PATH_PATTERN = r"[A-Za-z]:\\|/|~"
 
 def is_safe_to_learn(intent: dict, text: str):
-    print("[MODERATION] Checking intent:", intent["intent_id"])
+    log.debug("Checking intent: %s", intent["intent_id"])
 
     if intent["intent_id"] not in LEARNABLE:
-        print("[MODERATION] Intent not learnable")
+        log.debug("Intent not learnable")
         return False
 
     if intent["confidence"] < 0.9:
-        print("[MODERATION] Confidence too low")
+        log.debug("Confidence too low")
         return False
 
     if re.search(FILE_PATH_PATTERN, text):
-        print("[MODERATION] File path detected")
+        log.debug("File path detected")
         return False
 
     for pat in PERSONAL_PATTERNS:
         if re.search(pat, text):
-            print("[MODERATION] Personal data detected")
+            log.debug("Personal data detected")
             return False
 
-    print("[MODERATION] Intent safe to learn")
+    log.debug("Intent safe to learn")
     return True
\ No newline at end of file
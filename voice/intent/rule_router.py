@@ -7,6 +7,10 @@ import json
 import re
 from pathlib import Path
 
+from utils.log import get_logger
+
+log = get_logger("intent.rules", "RULE ROUTER")
+
 RULES_FILE = Path("intent/rules.json")
 
 
@@ -15,7 +19,7 @@ RULES_FILE = Path("intent/rules.json")
 def _intent(intent_id, params=None, confidence=0.95, source="RULES"):
     if params is None:
         params = {}
-    print(f"[RULE ROUTER] Matched intent: {intent_id}")
+    log.debug("Matched intent: %s", intent_id)
     return {
         "intent_id": intent_id,
         "params": params,
@@ -24,25 +28,38 @@ def _intent(intent_id, params=None, confidence=0.95, source="RULES"):
     }
 
 
+# Parsed rules, reused until rules.json changes on disk
+_rules_cache = {"key": None, "rules": []}
+
+
 def load_rules():
     if not RULES_FILE.exists():
         return []
 
     try:
+        stat = RULES_FILE.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if _rules_cache["key"] == key:
+            return _rules_cache["rules"]
+
         data = json.loads(RULES_FILE.read_text(encoding="utf-8"))
         if not isinstance(data, list):
             return []
 
         # canonical single-pattern rules only
-        return [
+        rules = [
             r for r in data
             if isinstance(r, dict)
             and isinstance(r.get("pattern"), str)
             and isinstance(r.get("intent_id"), str)
         ]
 
+        _rules_cache["key"] = key
+        _rules_cache["rules"] = rules
+        return rules
+
     except Exception as e:
-        print("[RULE ROUTER ERROR] Failed to load rules:", e)
+        log.error("Failed to load rules: %s", e)
         return []
 
 
@@ -64,30 +81,28 @@ def fuzzy_match(normalized: str, rules: list):
             best_rule = rule
 
     if best_score >= FUZZY_THRESHOLD:
-        print(
-            f"[FUZZY MATCH] '{normalized}' → '{best_rule['pattern']}' "
-            f"(score={best_score:.2f})"
-        )
+        log.debug("Fuzzy match '%s' → '%s' (score=%.2f)", normalized, best_rule["pattern"], best_score)
         return best_rule
 
     return None
 
-# ---------------- ROUTER ----------------
+# ---------------- BUILT-IN PHRASES ----------------
 
-def route(normalized: str):
-    print("[RULE ROUTER] Input:", normalized)
+MODE_PHRASES = ("command mode", "dictation mode", "navigation mode")
 
-    if not normalized:
-        return None
+SEARCH_PARTIALS = ("search", "search google", "search on google")
 
-    normalized = normalized.lower().strip()
+SEARCH_PATTERN = re.compile(r"^(search|search for|google)\s+(.+)$")
 
-    # 🔁 Reload rules every time (safe, rules can change)
-    rules = load_rules()
+NAV_COMMANDS = {
+    "scroll up": ("UP", 3),
+    "scroll down": ("DOWN", 3),
+    "go left": ("LEFT", 1),
+    "go right": ("RIGHT", 1),
+}
 
-    # ==================================================
-    # 1️⃣ EXACT MATCH — absolute priority
-    # ==================================================
+
+def _match_exact(normalized: str, rules: list):
     for rule in rules:
         if normalized == rule["pattern"]:
             return _intent(
@@ -96,40 +111,27 @@ def route(normalized: str):
                 rule.get("confidence", 0.95),
                 source="RULES"
             )
-        
-    # ==================================================
-    # 1️⃣.5️⃣ FUZZY MATCH (STRICT, RULES ONLY)
-    # ==================================================
-    fuzzy_rule = fuzzy_match(normalized, rules)
-    if fuzzy_rule:
-        return _intent(
-            fuzzy_rule["intent_id"],
-            fuzzy_rule.get("params", {}),
-            fuzzy_rule.get("confidence", 0.9),
-            source="RULES"
-        )
+    return None
 
-    # ==================================================
-    # 2️⃣ MODE SWITCH (safe hardcoded)
-    # ==================================================
-    if normalized in ("command mode", "dictation mode", "navigation mode"):
+
+def _match_builtin(normalized: str):
+    # ---------- MODE SWITCH (safe hardcoded) ----------
+    if normalized in MODE_PHRASES:
         return _intent(
             "MODE_SWITCH",
             {"mode": normalized.replace(" mode", "").upper()},
             confidence=0.99
         )
 
-    # ==================================================
-    # 3️⃣ SEARCH — explicit partials only
-    # ==================================================
-    if normalized in ("search", "search google", "search on google"):
+    # ---------- SEARCH — explicit partials only ----------
+    if normalized in SEARCH_PARTIALS:
         return _intent(
             "SEARCH_WEB",
             {"query": ""},
             confidence=0.9
         )
 
-    m = re.match(r"^(search|search for|google)\s+(.+)$", normalized)
+    m = SEARCH_PATTERN.match(normalized)
     if m:
         return _intent(
             "SEARCH_WEB",
@@ -137,26 +139,105 @@ def route(normalized: str):
             confidence=0.99
         )
 
-    # ==================================================
-    # 4️⃣ NAVIGATION (safe deterministic)
-    # ==================================================
-    NAV = {
-        "scroll up": ("UP", 3),
-        "scroll down": ("DOWN", 3),
-        "go left": ("LEFT", 1),
-        "go right": ("RIGHT", 1),
-    }
-
-    if normalized in NAV:
-        direction, count = NAV[normalized]
+    # ---------- NAVIGATION (safe deterministic) ----------
+    if normalized in NAV_COMMANDS:
+        direction, count = NAV_COMMANDS[normalized]
         return _intent(
             "NAVIGATION",
             {"direction": direction, "count": count},
             confidence=0.99
         )
 
+    return None
+
+
+# ---------------- ROUTER ----------------
+
+def route(normalized: str):
+    log.debug("Input: %s", normalized)
+
+    if not normalized:
+        return None
+
+    normalized = normalized.lower().strip()
+
+    # 🔁 Rules reload whenever rules.json changes (safe, rules can change)
+    rules = load_rules()
+
+    # ==================================================
+    # 1️⃣ EXACT MATCH — absolute priority
+    # ==================================================
+    intent = _match_exact(normalized, rules)
+    if intent:
+        return intent
+
+    # ==================================================
+    # 1️⃣.5️⃣ FUZZY MATCH (STRICT, RULES ONLY)
+    # ==================================================
+    fuzzy_rule = fuzzy_match(normalized, rules)
+    if fuzzy_rule:
+        return _intent(
+            fuzzy_rule["intent_id"],
+            fuzzy_rule.get("params", {}),
+            fuzzy_rule.get("confidence", 0.9),
+            source="RULES"
+        )
+
+    # ==================================================
+    # 2️⃣ MODE SWITCH / 3️⃣ SEARCH / 4️⃣ NAVIGATION
+    # ==================================================
+    intent = _match_builtin(normalized)
+    if intent:
+        return intent
+
     # ==================================================
     # 5️⃣ NOTHING MATCHED → AI decides
     # ==================================================
-    print("[RULE ROUTER] No rule matched")
-    return None
\ No newline at end of file
+    log.debug("No rule matched")
+    return None
+
+
+# ---------------- SPECULATIVE (PARTIAL STT) ----------------
+
+# Intents whose params keep growing with the phrase ("search for cats ...")
+OPEN_ENDED_INTENTS = {"SEARCH_WEB", "TEXT_INPUT", "CODE_GENERATION"}
+
+
+def _can_still_grow(partial: str, rules: list) -> bool:
+    """True if some known command starts with this partial + more words."""
+    prefix = partial + " "
+
+    phrases = [r["pattern"] for r in rules]
+    phrases += list(MODE_PHRASES) + list(SEARCH_PARTIALS) + list(NAV_COMMANDS)
+    phrases += ["search for", "google"]
+
+    return any(p.startswith(prefix) for p in phrases)
+
+
+def speculative_route(partial: str, min_confidence=0.95):
+    """
+    Route a PARTIAL transcript while the user is still speaking.
+    Commits only on an exact, high-confidence, unambiguous match.
+    NO fuzzy matching here — "scroll dow" must wait for more audio.
+    """
+    if not partial:
+        return None
+
+    partial = partial.lower().strip()
+    rules = load_rules()
+
+    if _can_still_grow(partial, rules):
+        return None
+
+    intent = _match_exact(partial, rules) or _match_builtin(partial)
+    if not intent:
+        return None
+
+    if intent["intent_id"] in OPEN_ENDED_INTENTS:
+        return None
+
+    if intent["confidence"] < min_confidence:
+        return None
+
+    log.info("Speculative commit: '%s'", partial)
+    return intent
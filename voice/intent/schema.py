@@ -34,7 +34,7 @@ INTENT_SCHEMA = {
         },
         "source": {
             "type": "string",
-            "enum": ["RULES", "AI"]
+            "enum": ["RULES", "LOCAL_MODEL", "AI"]
         }
     }
 }
\ No newline at end of file
@@ -4,6 +4,10 @@ import json
 from collections import defaultdict
 from pathlib import Path
 
+from utils.log import get_logger
+
+log = get_logger("learning", "AUTO-LEARN")
+
 LOG_FILE = Path("data/logs.jsonl")
 RULES_FILE = Path("intent/rules.json")
 
@@ -81,7 +85,7 @@ def mine_rules():
 
         rules.append(new_rule)
         learned += 1
-        print("[AUTO-LEARN] Promoted rule:", new_rule)
+        log.info("Promoted rule: %s", new_rule)
 
     if learned:
         RULES_FILE.write_text(json.dumps(rules, indent=2))
\ No newline at end of file
@@ -4,27 +4,54 @@
 # Deterministic, safe, debuggable
 
 
-from speech.stt import SpeechToText
-from intent.rule_router import route as rule_route
-from brain.state import State
-from brain.keyboard_brain import KeyboardBrain
-from utils.normalizer import normalize
-from utils.validators import validate_intent, is_confidence_acceptable
-from utils.logger import log_event
-from utils.config_loader import load_json
-from intent.learner import learn
-from brain.dictation_buffer import DictationBuffer
-from brain.pending_plan import PendingPlan
-from utils.file_writer import write_files
-from ai.ai_engine import ai_propose_improvement, ai_generate_code
-from intent.ai_router import ai_route
-from learning.log_miner import mine_rules
-from utils.say import say   # 🔥 unified output (print + TTS)
+import argparse
+import time
+
+from utils.startup import Startup
+
+# time to first listen is measured from here (report before the main loop)
+startup = Startup()
+
+# speech_recognition / PyAudio load inside init_stt(), on the startup pool;
+# requests / jsonschema are imported on first use (preloaded in the background)
+with startup.phase("imports"):
+    from intent.rule_router import route as rule_route, speculative_route, load_rules
+    from brain.state import State
+    from brain.keyboard_brain import KeyboardBrain
+    from brain.action_executor import ActionExecutor
+    from utils.normalizer import normalize
+    from speech.capture import capture, expects_command
+    from utils.validators import validate_intent, is_confidence_acceptable
+    from utils.logger import log_event
+    from utils.config_loader import load_json
+    from intent.learner import learn
+    from brain.dictation_buffer import DictationBuffer
+    from brain.pending_plan import PendingPlan
+    from utils.file_writer import write_files
+    from ai.ai_engine import ai_generate_code
+    from ai.dictation_improver import DictationImprover
+    from ai.ai_tasks import AITaskRunner
+    from intent.local_model import load_model as load_local_model, local_route
+    from intent.ai_router import ai_route
+    from ai.transport import configure as configure_ai_transport, collect_metrics as ai_transport_metrics
+    from intent.ai_cache import configure as configure_ai_cache, collect_metrics as ai_cache_metrics
+    from ai.budget import configure as configure_ai_budget, collect_metrics as ai_budget_metrics
+    from os_actions.app_index import configure as configure_app_index
+    from learning.log_miner import mine_rules
+    from utils.say import say   # 🔥 unified output (print + TTS)
+    from utils.tts import configure as configure_tts, URGENT
+    from utils.phrase_cache import get_phrase_cache
+    from utils.log import configure as configure_logging, get_logger
+    from utils import tracing
+    from utils import metrics
+    from utils import profiler
+    from utils import memory
 
 # ---------- Load Config ----------
-settings = load_json("config/settings.json")
-keys = load_json("config/keys.json")
-ai_settings = load_json("config/ai.json")
+with startup.phase("config"):
+    settings = load_json("config/settings.json")
+    keys = load_json("config/keys.json")
+    ai_settings = load_json("config/ai.json")
 
 CONF_LADDER = settings.get("confidence_ladder", {})
 
@@ -33,7 +60,45 @@ MIN_CONFIDENCE_BY_SOURCE = CONF_LADDER.get("min_confidence", {})
 
 DEBUG = settings["debug"]["enabled"]
 
-print("[MAIN] System starting...")
+# console verbosity: settings.debug.log_level (+ per-subsystem log_levels)
+configure_logging(settings["debug"])
+log = get_logger("main")
+
+with startup.phase("configure"):
+    configure_ai_transport(settings.get("ai_transport", {}), debug=DEBUG)
+    configure_ai_cache(settings.get("ai_cache", {}), debug=DEBUG)
+    configure_ai_budget(settings.get("ai", {}), debug=DEBUG)
+    configure_app_index(settings.get("apps", {}), debug=DEBUG)  # cached; rescans in background
+    tracing.configure(settings.get("tracing", {}), debug=DEBUG)  # per-utterance spans → data/traces.jsonl
+
+    # latency histograms + counters → data/metrics.prom and/or http://127.0.0.1:<port>/metrics
+    metrics.configure(settings.get("metrics", {}), debug=DEBUG)
+    tracing.add_listener(metrics.get_metrics().observe_trace)  # stage latencies from the spans
+    for collect in (ai_transport_metrics, ai_cache_metrics, ai_budget_metrics):
+        metrics.get_metrics().collector(collect)
+
+    # sampling profiler (signal / --profile / voice) + stall watchdog on main_loop iterations
+    PROFILER = settings.get("profiler", {})
+    profiler.configure(PROFILER, debug=DEBUG)
+
+    # optional tracemalloc growth report + RSS budget warning → event log ("memory")
+    memory.configure(settings.get("memory", {}), debug=DEBUG)
+    metrics.get_metrics().collector(memory.collect_metrics)
+
+# speech output runs on its own thread; user speech interrupts it (see init_tts)
+TTS_SETTINGS = settings.get("tts", {})
+
+# fixed replies below → rendered once, played from disk afterwards
+PREWARM_PHRASES = [
+    "Stopped", "Cancelled", "Removed", "Nothing to undo", "Nothing to improve",
+    "Files created", "Plan cancelled", "What should I search?", "I'm still busy, try again",
+    "Updated dictation", "Rewrite failed", "Dictation changed, rewrite discarded",
+    "No valid code proposal", "I have a plan ready. Say approve or cancel.",
+]
+
+SPECULATIVE = settings["speech"].get("speculative_routing", {})
+
+log.info("System starting...")
 
 # ---------- Initialize State ----------
 state = State(
@@ -47,15 +112,342 @@ keyboard_brain = KeyboardBrain(
     keys=keys
 )
 
-stt = SpeechToText(
-    language=settings["speech"]["language"],
-    listen_timeout=settings["speech"]["listen_timeout_sec"],
-    phrase_time_limit=settings["speech"]["phrase_time_limit_sec"],
+# typing / navigation run on their own thread; "stop" interrupts them
+action_executor = ActionExecutor(keyboard_brain, debug=DEBUG)
+STOP_PHRASES = {"stop", "cancel"}
+
+# built concurrently by start(): mic calibration, SAPI, rule index, log miner
+stt = None
+tts = None
+
+DICTATION = settings.get("dictation", {})
+UNDO_PHRASES = set(DICTATION.get("undo_phrases", ["scratch that", "undo that"]))
+
+dictation_buffer = DictationBuffer(tail_chars=DICTATION.get("render_tail_chars", 300))
+pending_plan = PendingPlan()
+
+# AI calls never block the loop (see ai/ai_tasks.py)
+ai_tasks = AITaskRunner(
+    max_in_flight=settings.get("ai_tasks", {}).get("max_in_flight", 2),
     debug=DEBUG
 )
 
-dictation_buffer = DictationBuffer()
-pending_plan = PendingPlan()
+# "make this better": chunked + parallel, only changed chunks are re-sent
+dictation_improver = DictationImprover(
+    ai_settings,
+    max_workers=ai_settings.get("max_parallel_chunks", 3),
+    chunk_chars=ai_settings.get("dictation_chunk_chars", 400),
+    reserve_calls=ai_settings.get("dictation_reserve_calls", 1),  # keep budget for routing
+    runner=ai_tasks,    # parallel chunk calls count against ai_tasks.max_in_flight
+    debug=DEBUG
+)
+
+
+# =========================
+# CAPTURE (+ SPECULATIVE ROUTING)
+# =========================
+
+def capture_utterance():
+    """
+    Returns (text, early_intent).
+    Only a fresh COMMAND-mode phrase goes through the keyword gate, and only it
+    speculates: early_intent is set when a PARTIAL transcript already matched an
+    unambiguous high-confidence rule, so the command runs before the phrase
+    window closes.
+    """
+    command = expects_command(state, pending_plan)
+
+    route_partial = None
+    if command and SPECULATIVE.get("enabled"):
+        min_confidence = SPECULATIVE.get("min_confidence", 0.95)
+        route_partial = lambda text: speculative_route(normalize(text, debug=DEBUG), min_confidence)
+
+    return capture(stt, command, route_partial)
+
+
+# =========================
+# INTENT EXECUTION (CONFIDENCE GATE)
+# =========================
+
+def handle_intent(intent, normalized) -> bool:
+    """
+    Validate + confidence ladder + execute.
+    Returns False when the intent is missing/invalid (caller falls through).
+    """
+    with tracing.span("validate"):
+        if not (intent and validate_intent(intent, debug=DEBUG)):
+            source = intent.get("source", "UNKNOWN") if intent else "NONE"
+            metrics.counter("voice_intents_total", "Routed intents", source=source, outcome="invalid").inc()
+            return False
+
+        source = intent.get("source", "UNKNOWN")
+        confidence = intent.get("confidence", 0.0)
+
+        min_required = MIN_CONFIDENCE_BY_SOURCE.get(source, 1.1)
+
+    accepted = confidence >= min_required
+    metrics.counter(
+        "voice_intents_total", "Routed intents",
+        source=source, outcome="accepted" if accepted else "rejected"
+    ).inc()
+
+    if accepted:
+        log.debug("Confidence ACCEPTED source=%s confidence=%s", source, confidence)
+
+        with tracing.span("execute", intent=intent["intent_id"], source=source):
+            result = action_executor.run(intent)
+
+        if isinstance(result, str) and result.strip():
+            say(result, debug=DEBUG)
+
+        # ❗ Learn ONLY from RULES or STATE
+        if source in ("RULES", "STATE"):
+            with tracing.span("learn"):
+                learn(intent, normalized)
+
+        return True
+
+    result = None
+    if DEBUG:
+        log.info("Confidence REJECTED source=%s confidence=%s (min=%s)", source, confidence, min_required)
+        with tracing.span("execute", intent=intent["intent_id"], source=source):
+            result = action_executor.run(intent)
+
+    #  ALWAYS speak if there is user-facing output
+    if isinstance(result, str) and result.strip():
+        say(result, debug=DEBUG)
+
+    with tracing.span("learn"):
+        learn(intent, normalized)
+    return True
+
+
+def handle_unrouted(normalized):
+    """Nothing routed the utterance: code generation / navigation / give up."""
+
+    # =========================
+    # AI CODE GENERATION (SAFE)
+    # =========================
+    if normalized.startswith("create "):
+        plan_id = pending_plan.clear()
+        task_id = ai_tasks.submit(
+            "codegen",
+            ai_generate_code,
+            normalized,
+            ai_settings,
+            streamed_file_handler(plan_id),
+            context={"task": normalized, "plan_id": plan_id}
+        )
+        if task_id is None:
+            say("I'm still busy, try again", debug=DEBUG)
+        return
+
+    # =========================
+    # NAVIGATION MODE
+    # =========================
+    if state.mode == "NAVIGATION":
+        intent = rule_route(normalized)
+        if intent and intent["intent_id"] == "NAVIGATION":
+            result = action_executor.run(intent)
+            if isinstance(result, str) and result.strip():
+                say(result, debug=DEBUG)
+        return
+
+    # =========================
+    # NOTHING MATCHED
+    # =========================
+    metrics.counter("voice_intents_total", "Routed intents", source="NONE", outcome="unrouted").inc()
+    log.info("No rule matched")
+
+
+# =========================
+# AI RESULTS (EVENTS)
+# =========================
+
+# ---------- streamed fields (called from AI worker threads) ----------
+
+def streamed_file_handler(plan_id):
+    # ("result", "files", name) → file lands in the (inactive) plan right away,
+    # unless that plan was cancelled / replaced while the stream was still running
+    def on_streamed_file(path, value):
+        if len(path) == 3 and path[:2] == ("result", "files"):
+            pending_plan.add_file(path[2], value, plan_id)
+    return on_streamed_file
+
+
+def on_improved_chunk(index, text):
+    # each dictation chunk is shown as soon as its rewrite lands
+    print(f"[AI REWRITE PREVIEW] chunk {index + 1}")
+    print(text)
+
+
+# ---------- dictation view: print only what changed ----------
+
+def render_dictation():
+    kind, text = dictation_buffer.take_diff()
+
+    if kind == "append":
+        print("[DICTATION +]", text)
+    elif kind == "rewrite":
+        print(f"[DICTATION BUFFER] ({len(dictation_buffer)} chars)")
+        print(text)
+
+
+def handle_action_events():
+    for event in action_executor.poll():
+        if event.cancelled or event.error:
+            continue
+        if isinstance(event.result, str) and event.result.strip():
+            say(event.result, debug=DEBUG)
+
+
+def handle_ai_events():
+    for event in ai_tasks.poll():
+        # the result belongs to the utterance that asked for it
+        with tracing.resume(event.trace):
+            apply_ai_event(event)
+
+
+def apply_ai_event(event):
+    # ---------- AI ROUTE ----------
+    if event.kind == "route":
+        normalized = event.context["normalized"]
+        if not handle_intent(event.result, normalized):
+            handle_unrouted(normalized)
+
+    # ---------- DICTATION REWRITE ----------
+    elif event.kind == "rewrite":
+        proposal = event.result
+
+        if dictation_buffer.version != event.context["version"]:
+            say("Dictation changed, rewrite discarded", debug=DEBUG)
+        elif proposal and proposal["confidence"] >= 0.8:
+            dictation_buffer.replace(
+                proposal["result"]["text"]
+            )
+            say("Updated dictation", debug=DEBUG)
+            render_dictation()
+        else:
+            say("Rewrite failed", debug=DEBUG)
+
+    # ---------- CODE GENERATION ----------
+    elif event.kind == "codegen":
+        proposal = event.result
+
+        if event.context["plan_id"] != pending_plan.plan_id:
+            log.info("Code proposal for a cancelled plan dropped")
+            return
+
+        if (
+            proposal
+            and proposal["type"] == "CODE_GENERATION"
+            and proposal["confidence"] >= 0.8
+        ):
+            files = proposal["result"].get("files", {})
+            pending_plan.set(files)
+
+            say("I have a plan ready. Say approve or cancel.", debug=DEBUG)
+            print(pending_plan.summary())
+        else:
+            pending_plan.clear()
+            say("No valid code proposal", debug=DEBUG)
+
+
+# =========================
+# TRACING
+# =========================
+
+def trace_capture(started, ended):
+    """STT stage timings → spans; with partials the stages overlap, one span."""
+    timings = stt.last_timings
+    if not timings:
+        tracing.add("capture", started, ended, partials=True)
+        return
+
+    t = started
+    for stage, name in (("capture", "capture"), ("gate", "keyword_gate"), ("recognize", "recognition")):
+        if stage in timings:
+            tracing.add(name, t, t + timings[stage])
+            t += timings[stage]
+
+
+# =========================
+# STARTUP (parallel init)
+# =========================
+
+def init_stt():
+    # speech_recognition + PyAudio are imported here, off the main thread
+    from speech.stt import SpeechToText
+
+    # ---------- Optional local keyword gate ----------
+    kws = settings["speech"].get("keyword_gate", {})
+    keyword_gate = None
+
+    if kws.get("enabled"):
+        from speech.keyword_spotter import KeywordSpotter, KeywordGate
+
+        try:
+            keyword_gate = KeywordGate(
+                KeywordSpotter.from_directory(
+                    kws.get("templates_dir", "data/kws_templates"),
+                    threshold=kws.get("threshold", 25.0),
+                    debug=DEBUG
+                ),
+                debug=DEBUG
+            )
+        except ValueError as e:
+            log.warning("Keyword gate not installed (%s), every phrase goes to STT", e)
+
+    # one-time mic calibration (~1s) runs while everything else loads
+    speech = SpeechToText(
+        language=settings["speech"]["language"],
+        listen_timeout=settings["speech"]["listen_timeout_sec"],
+        phrase_time_limit=settings["speech"]["phrase_time_limit_sec"],
+        keyword_gate=keyword_gate,
+        debug=DEBUG
+    )
+
+    # speculative routing runs on partial transcripts (speech/partials.py)
+    if SPECULATIVE.get("enabled") and not speech.supports_partials:
+        log.warning("speculative_routing needs a streaming partial recognizer; %s has none, disabled",
+                    speech.backend.name)
+    return speech
+
+
+def init_tts():
+    worker = configure_tts(TTS_SETTINGS, debug=DEBUG)
+
+    phrase_cache = get_phrase_cache()
+    if phrase_cache is not None:
+        phrase_cache.prewarm(PREWARM_PHRASES)
+    return worker
+
+
+def init_rules():
+    # the miner may rewrite intent/rules.json → everything reading it starts after it
+    with startup.phase("log_miner"):
+        log.info("Mining logs for new rules...")
+        mine_rules()
+    # ---------- Offline intent model (optional, see intent/local_model.py) ----------
+    startup.submit("local_model", load_local_model, debug=DEBUG)
+    with startup.phase("rule_index"):
+        return load_rules()
+
+
+def start():
+    """Independent init runs concurrently; returns when ready to listen."""
+    global stt, tts
+
+    startup.submit("stt", init_stt)
+    startup.submit("tts", init_tts)
+    startup.submit("rules", init_rules)   # + local_model once the miner is done
+    startup.preload("jsonschema", "requests")
+
+    tts = startup.wait("tts")
+    stt = startup.wait("stt")
+    startup.wait("rules")
+    startup.wait("local_model")   # submitted by init_rules
+    startup.finish()
 
 
 # =========================
@@ -63,27 +455,79 @@ pending_plan = PendingPlan()
 # =========================
 
 def main_loop():
-    print("[MAIN] Entering main loop")
+    log.info("Entering main loop")
 
     while True:
-        if DEBUG:
-            print("[DEBUG] main loop tick")
-
-        text = stt.listen()
-        if DEBUG:
-            print("[DEBUG] raw STT text:", text)
+        # previous utterance: emitted once its actions / AI calls / speech finish
+        tracing.end()
+        profiler.arm()
+        log.trace("main loop tick")
+
+        handle_ai_events()
+        handle_action_events()
+
+        # waiting on the mic is not a stall
+        profiler.disarm()
+        capture_started = time.perf_counter()
+        text, early_intent = capture_utterance()
+        capture_ended = time.perf_counter()
+        profiler.arm()
+        log.debug("raw STT text: %s", text)
+
+        # results that landed while we were listening
+        handle_ai_events()
+        handle_action_events()
 
         if not text:
             continue
 
-        normalized = normalize(text, debug=DEBUG)
+        tracing.begin(text=text, mode=state.mode)
+        trace_capture(capture_started, capture_ended)
+
+        # =========================
+        # ECHO GUARD + BARGE-IN
+        # =========================
+        # TTS no longer blocks listening, so the mic can hear our own reply
+        if tts.is_echo(text):
+            log.debug("Ignored echo of own speech: %s", text)
+            continue
+
+        if TTS_SETTINGS.get("barge_in", True):
+            tts.interrupt()
+
+        with tracing.span("normalize"):
+            normalized = normalize(text, debug=DEBUG)
+
+        # =========================
+        # PROFILER (any mode)
+        # =========================
+        if normalized == PROFILER.get("start_phrase", "start profiling"):
+            started = profiler.get_profiler().start()
+            say("Profiling" if started else "Already profiling", debug=DEBUG)
+            continue
+
+        if normalized == PROFILER.get("stop_phrase", "stop profiling"):
+            path = profiler.get_profiler().stop()
+            say("Profile saved" if path else "Not profiling", debug=DEBUG)
+            continue
+
+        # =========================
+        # STOP RUNNING ACTION (typing / navigation)
+        # =========================
+        if normalized in STOP_PHRASES and action_executor.busy():
+            progress = action_executor.progress()
+            action_executor.cancel()
+            if progress and progress[2]:
+                say(f"Stopped at {progress[1]} of {progress[2]}", debug=DEBUG, priority=URGENT)
+            else:
+                say("Stopped", debug=DEBUG, priority=URGENT)
+            continue
 
         # =========================
         # STATE PARAM COMPLETION
         # =========================
         if state.awaiting_param:
-            if DEBUG:
-                print(f"[STATE] Completing awaiting param: {state.awaiting_param}")
+            log.debug("Completing awaiting param: %s", state.awaiting_param)
 
             # Handle SEARCH_WEB follow-up
             if state.last_intent == "SEARCH_WEB" and state.awaiting_param == "query":
@@ -96,15 +540,17 @@ def main_loop():
 
                 state.clear_awaiting()
 
-                result = keyboard_brain.execute(intent)
+                # not through handle_intent: learn() would turn the free-form query into a rule
+                metrics.counter("voice_intents_total", "Routed intents", source="STATE", outcome="accepted").inc()
+                with tracing.span("execute", intent=intent["intent_id"], source="STATE"):
+                    result = action_executor.run(intent)
                 if isinstance(result, str) and result.strip():
                     say(result, debug=DEBUG)
 
                 continue
 
 
-        if DEBUG:
-            print("[DEBUG] normalized:", normalized)
+        log.debug("normalized: %s", normalized)
 
         # =========================
         # APPROVAL GATE
@@ -121,6 +567,15 @@ def main_loop():
                 say("Plan cancelled", debug=DEBUG)
                 continue
 
+        # =========================
+        # CANCEL IN-FLIGHT AI
+        # =========================
+        if normalized == "cancel" and ai_tasks.pending():
+            ai_tasks.cancel()
+            pending_plan.clear()  # drop half-streamed files
+            say("Cancelled", debug=DEBUG, priority=URGENT)
+            continue
+
         # =========================
         # DICTATION MODE
         # =========================
@@ -131,132 +586,78 @@ def main_loop():
                     say("Nothing to improve", debug=DEBUG)
                     continue
 
-                proposal = ai_propose_improvement(
-                    dictation_buffer.get(),
-                    ai_settings
+                original = dictation_buffer.get()
+                task_id = ai_tasks.submit(
+                    "rewrite",
+                    dictation_improver.improve,
+                    original,
+                    on_improved_chunk,
+                    context={"version": dictation_buffer.version}
                 )
+                if task_id is None:
+                    say("I'm still busy, try again", debug=DEBUG)
 
-                if proposal and proposal["confidence"] >= 0.8:
-                    dictation_buffer.replace(
-                        proposal["result"]["text"]
-                    )
-                    say("Updated dictation", debug=DEBUG)
-                    print(dictation_buffer.get())
-                else:
-                    say("Rewrite failed", debug=DEBUG)
+                continue
 
+            if normalized in UNDO_PHRASES:
+                if dictation_buffer.undo():
+                    say("Removed", debug=DEBUG)
+                    render_dictation()
+                else:
+                    say("Nothing to undo", debug=DEBUG)
                 continue
 
             dictation_buffer.append(text)
-            print("[DICTATION BUFFER]")
-            print(dictation_buffer.get())
+            render_dictation()
             continue
 
         # =========================
         # COMMAND MODE
         # =========================
 
-        intent = rule_route(normalized)
+        # new command → any AI route still thinking about the OLD one is stale
+        ai_tasks.cancel("route")
+
+        with tracing.span("rule_route", speculative=early_intent is not None):
+            intent = early_intent or rule_route(normalized)
 
         # ---------- PARTIAL INTENT HANDLING ----------
         if intent and intent["intent_id"] == "SEARCH_WEB":
             query = intent["params"].get("query")
 
             if not query:
-                if DEBUG:
-                    print("[PARTIAL] SEARCH_WEB missing query")
+                log.debug("SEARCH_WEB missing query")
 
                 state.set_awaiting("query")
                 state.set_last_intent("SEARCH_WEB")
                 say("What should I search?", debug=DEBUG)
                 continue
 
-        # ---------- AI FALLBACK ----------
+        # ---------- LOCAL MODEL (offline, no network) ----------
         if not intent:
-            intent = ai_route(normalized)
-
-        # ---------- VALIDATE + EXECUTE ----------
-        # =========================
-        # CONFIDENCE GATE (LADDER)
-        # =========================
-        if intent and validate_intent(intent, debug=DEBUG):
-
-            source = intent.get("source", "UNKNOWN")
-            confidence = intent.get("confidence", 0.0)
-
-            min_required = MIN_CONFIDENCE_BY_SOURCE.get(source, 1.1)
-
-            if confidence >= min_required:
-                if DEBUG:
-                    print(
-                        f"[CONFIDENCE] ACCEPTED "
-                        f"source={source} confidence={confidence}"
-                    )
-
-                result = keyboard_brain.execute(intent)
-
-                if isinstance(result, str) and result.strip():
-                    say(result, debug=DEBUG)
-
-                # ❗ Learn ONLY from RULES or STATE
-                if source in ("RULES", "STATE"):
-                    learn(intent, normalized)
-
-                continue
-
-            else:
-                if DEBUG:
-                    print(
-                        f"[CONFIDENCE] REJECTED "
-                        f"source={source} confidence={confidence} "
-                        f"(min={min_required})"
-                    )
-                    result = keyboard_brain.execute(intent)
-
-            #  ALWAYS speak if there is user-facing output
-            if isinstance(result, str) and result.strip():
-                say(result, debug=DEBUG)
-
-            learn(intent, normalized)
-            continue
-
-        # =========================
-        # AI CODE GENERATION (SAFE)
-        # =========================
-        if normalized.startswith("create "):
-            proposal = ai_generate_code(normalized, ai_settings)
-
-            if (
-                proposal
-                and proposal["type"] == "CODE_GENERATION"
-                and proposal["confidence"] >= 0.8
-            ):
-                files = proposal["result"].get("files", {})
-                pending_plan.set(files)
-
-                say("I have a plan ready. Say approve or cancel.", debug=DEBUG)
-                print(pending_plan.summary())
-            else:
-                say("No valid code proposal", debug=DEBUG)
+            with tracing.span("local_route"):
+                intent = local_route(
+                    normalized,
+                    MIN_CONFIDENCE_BY_SOURCE.get("LOCAL_MODEL", 0.9)
+                )
 
+        # ---------- AI FALLBACK (non-blocking) ----------
+        if not intent:
+            task_id = ai_tasks.submit(
+                "route",
+                ai_route,
+                normalized,
+                context={"normalized": normalized}
+            )
+            if task_id is None:
+                handle_unrouted(normalized)
             continue
 
-        # =========================
-        # NAVIGATION MODE
-        # =========================
-        if state.mode == "NAVIGATION":
-            intent = rule_route(normalized)
-            if intent and intent["intent_id"] == "NAVIGATION":
-                result = keyboard_brain.execute(intent)
-                if isinstance(result, str) and result.strip():
-                    say(result, debug=DEBUG)
+        # ---------- VALIDATE + EXECUTE ----------
+        if handle_intent(intent, normalized):
             continue
 
-        # =========================
-        # NOTHING MATCHED
-        # =========================
-        if DEBUG:
-            print("[MAIN] No rule matched")
+        handle_unrouted(normalized)
 
 
 # =========================
@@ -264,9 +665,25 @@ def main_loop():
 # =========================
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voice assistant")
+    parser.add_argument("--profile", action="store_true",
+                        help="sample all threads from startup, collapsed stacks written on exit")
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.get_profiler().start()
+
     try:
-        print("[MAIN] Mining logs for new rules...")
-        mine_rules()
+        start()
         main_loop()
     except KeyboardInterrupt:
-        print("\n[MAIN] Shutdown requested")
\ No newline at end of file
+        print()
+        log.info("Shutdown requested")
+    finally:
+        ai_tasks.shutdown()
+        action_executor.shutdown()
+        if tts is not None:
+            tts.shutdown()
+        profiler.shutdown()  # writes a running profile
+        memory.shutdown()
+        metrics.shutdown()  # last textfile flush
\ No newline at end of file
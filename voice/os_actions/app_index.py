@@ -0,0 +1,344 @@
+# os_actions/app_index.py
+# Spoken app name → launchable target, built once and refreshed in the background
+# - Sources: executables on PATH, Linux .desktop entries, Windows Start-menu shortcuts
+# - Lookup: alias → exact → spaces removed → whole word → close spelling
+# - Launch: argv exec (no shell) or os.startfile for shortcuts
+# - Index cached on disk so startup never waits for a scan
+# - Per-app launch latency stats
+
+import difflib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from utils.log import get_logger
+
+log = get_logger("apps", "APP INDEX")
+
+DEFAULTS = {
+    "cache_path": "data/app_index.json",
+    "refresh_sec": 3600,
+    "aliases": {},
+}
+
+# .desktop Exec= field codes (%f, %U, ...) are placeholders for files/urls
+_FIELD_CODES = {"%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m"}
+
+
+def _key(name: str) -> str:
+    return " ".join(name.lower().replace("-", " ").replace("_", " ").split())
+
+
+# ---------------- SOURCES ----------------
+
+def scan_path(path_env: str | None = None) -> dict:
+    entries = {}
+    exts = [""]
+    if sys.platform == "win32":
+        exts = [e.lower() for e in os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").split(";") if e]
+
+    for folder in (path_env if path_env is not None else os.environ.get("PATH", "")).split(os.pathsep):
+        if not folder or not os.path.isdir(folder):
+            continue
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            continue
+
+        for name in names:
+            full = os.path.join(folder, name)
+            stem, ext = os.path.splitext(name)
+            if sys.platform == "win32":
+                if ext.lower() not in exts:
+                    continue
+                name = stem
+            elif not (os.access(full, os.X_OK) and os.path.isfile(full)):
+                continue
+
+            # first PATH hit wins, like the shell
+            entries.setdefault(_key(name), {"argv": [full], "source": "path"})
+
+    return entries
+
+
+def parse_desktop_file(path: Path) -> dict | None:
+    """[Desktop Entry] Name / Exec → {"name", "argv"}; None if hidden or broken."""
+    fields, in_entry = {}, False
+
+    try:
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return None
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("["):
+            in_entry = line == "[Desktop Entry]"
+            continue
+        if in_entry and "=" in line:
+            k, v = line.split("=", 1)
+            fields.setdefault(k.strip(), v.strip())
+
+    if fields.get("Type", "Application") != "Application" or fields.get("NoDisplay") == "true":
+        return None
+    if not fields.get("Exec") or not fields.get("Name"):
+        return None
+
+    try:
+        argv = [a for a in shlex.split(fields["Exec"]) if a not in _FIELD_CODES]
+    except ValueError:
+        return None
+
+    return {"name": fields["Name"], "argv": argv} if argv else None
+
+
+def desktop_dirs() -> list:
+    data_dirs = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+    home = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+    return [Path(d) / "applications" for d in [home] + data_dirs if d]
+
+
+def scan_desktop_entries(dirs: list | None = None) -> dict:
+    entries = {}
+    for folder in dirs if dirs is not None else desktop_dirs():
+        if not folder.is_dir():
+            continue
+        for path in folder.glob("*.desktop"):
+            parsed = parse_desktop_file(path)
+            if not parsed:
+                continue
+            entry = {"argv": parsed["argv"], "source": "desktop"}
+            entries.setdefault(_key(parsed["name"]), entry)
+            entries.setdefault(_key(path.stem), entry)
+    return entries
+
+
+def start_menu_dirs() -> list:
+    roots = [os.environ.get("ProgramData"), os.environ.get("APPDATA")]
+    return [
+        Path(r) / "Microsoft" / "Windows" / "Start Menu" / "Programs"
+        for r in roots if r
+    ]
+
+
+def scan_start_menu(dirs: list | None = None) -> dict:
+    entries = {}
+    for folder in dirs if dirs is not None else start_menu_dirs():
+        if not folder.is_dir():
+            continue
+        for path in folder.rglob("*.lnk"):
+            entries.setdefault(_key(path.stem), {"open": str(path), "source": "startmenu"})
+    return entries
+
+
+def build_entries() -> dict:
+    """Shortcuts/desktop entries win over bare PATH binaries with the same name."""
+    entries = scan_path()
+    if sys.platform == "win32":
+        entries.update(scan_start_menu())
+    else:
+        entries.update(scan_desktop_entries())
+    return entries
+
+
+# ---------------- INDEX ----------------
+
+class AppIndex:
+    def __init__(self, aliases: dict | None = None, cache_path=None, refresh_sec=3600,
+                 builder=build_entries, launcher=None, debug=True):
+        self.aliases = {_key(k): _key(v) for k, v in (aliases or {}).items()}
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_sec = refresh_sec
+        self.builder = builder
+        self.launcher = launcher or self._spawn
+        self.debug = debug
+
+        self.entries = {}
+        self.built_at = 0.0
+        self._latency = {}        # key -> deque of launch seconds
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+        self._load()
+
+    # ---------- persistence ----------
+
+    def _load(self):
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            self.entries = data.get("entries", {})
+            self.built_at = float(data.get("built_at", 0))
+            if self.debug:
+                log.info("Loaded %d apps from %s", len(self.entries), self.cache_path)
+        except Exception as e:
+            log.error("Failed to load cache: %s", e)
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"built_at": self.built_at, "entries": self.entries}), encoding="utf-8")
+            tmp.replace(self.cache_path)
+        except Exception as e:
+            log.error("Failed to save cache: %s", e)
+
+    # ---------- building ----------
+
+    def is_stale(self) -> bool:
+        return time.time() - self.built_at > self.refresh_sec
+
+    def refresh(self):
+        started = time.perf_counter()
+        entries = self.builder()
+
+        with self._lock:
+            self.entries = entries
+            self.built_at = time.time()
+        self._save()
+
+        if self.debug:
+            log.info("Indexed %d apps in %.0fms", len(entries), (time.perf_counter() - started) * 1000)
+
+    def refresh_in_background(self, force=False) -> threading.Thread | None:
+        if not force and not self.is_stale():
+            return None
+        if self._refreshing and self._refreshing.is_alive():
+            return self._refreshing
+
+        self._refreshing = threading.Thread(target=self.refresh, name="app-index", daemon=True)
+        self._refreshing.start()
+        return self._refreshing
+
+    # ---------- lookup ----------
+
+    @staticmethod
+    def _lookup(name: str, entries: dict) -> str | None:
+        if name in entries:
+            return name
+
+        joined = name.replace(" ", "")
+        if joined in entries:
+            return joined
+
+        # "chrome" → "google chrome"
+        words = [k for k in entries if name in k.split()]
+        if words:
+            return min(words, key=len)
+
+        close = difflib.get_close_matches(name, entries.keys(), n=1, cutoff=0.85)
+        return close[0] if close else None
+
+    def resolve(self, spoken: str) -> tuple[str, dict] | None:
+        """(index key, entry) for a spoken app name, or None."""
+        name = _key(spoken)
+
+        with self._lock:
+            entries = self.entries
+
+        # alias first, then what was actually said
+        for candidate in dict.fromkeys([self.aliases.get(name, name), name]):
+            key = self._lookup(candidate, entries)
+            if key:
+                return key, entries[key]
+
+        # installed since the last scan?
+        found = shutil.which(name) or shutil.which(name.replace(" ", ""))
+        if found:
+            return name, {"argv": [found], "source": "which"}
+        return None
+
+    # ---------- launching ----------
+
+    @staticmethod
+    def _spawn(entry: dict):
+        if "open" in entry:
+            os.startfile(entry["open"])  # Windows shortcut: ShellExecute, no cmd.exe
+            return
+
+        kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.DETACHED_PROCESS
+        else:
+            kwargs["start_new_session"] = True  # survives the assistant
+        subprocess.Popen(entry["argv"], **kwargs)
+
+    def launch(self, spoken: str) -> bool:
+        self.refresh_in_background()  # no-op unless stale
+
+        resolved = self.resolve(spoken)
+        if resolved is None:
+            log.info("No app matches '%s'", spoken)
+            # maybe installed since the last scan (at most one rescan a minute)
+            self.refresh_in_background(force=time.time() - self.built_at > 60)
+            return False
+
+        key, entry = resolved
+        started = time.perf_counter()
+        try:
+            self.launcher(entry)
+        except Exception as e:
+            log.error("Failed to launch %s: %s", key, e)
+            with self._lock:
+                self._failures[key] = self._failures.get(key, 0) + 1
+            return False
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._latency.setdefault(key, deque(maxlen=100)).append(elapsed)
+
+        if self.debug:
+            log.info("Launched %s (%s) in %.1fms", key, entry["source"], elapsed * 1000)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            keys = set(self._latency) | set(self._failures)
+            out = {}
+            for key in keys:
+                ordered = sorted(self._latency.get(key, []))
+                out[key] = {
+                    "launches": len(ordered),
+                    "failures": self._failures.get(key, 0),
+                    "p50_ms": ordered[len(ordered) // 2] * 1000 if ordered else 0.0,
+                    "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+                }
+            return out
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_index = None
+
+
+def configure(config: dict | None = None, debug=True) -> AppIndex:
+    """Loads the cached index and refreshes it in the background if stale."""
+    global _index
+    config = {**DEFAULTS, **(config or {})}
+
+    _index = AppIndex(
+        aliases=config["aliases"],
+        cache_path=config["cache_path"],
+        refresh_sec=config["refresh_sec"],
+        debug=debug
+    )
+    _index.refresh_in_background()
+    return _index
+
+
+def get_index() -> AppIndex:
+    global _index
+    if _index is None:
+        configure(debug=False)
+    return _index
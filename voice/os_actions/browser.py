@@ -5,22 +5,24 @@
 
 import webbrowser
 from os_actions.keyboard_utils import press_combo
+from utils.log import get_logger
+
+log = get_logger("browser")
 
 def search_web(query: str, debug=True):
     url = "https://www.google.com/search?q=" + query.replace(" ", "+")
 
     if debug:
-        print("[BROWSER] Searching:", query)
-        print("[BROWSER] URL:", url)
+        log.debug("Searching: %s (%s)", query, url)
 
     webbrowser.open(url)
 
 def new_tab(debug=True):
     if debug:
-        print("[BROWSER] New tab")
+        log.debug("New tab")
     press_combo(["CTRL", "T"], debug=debug)
 
 def close_tab(debug=True):
     if debug:
-        print("[BROWSER] Close tab")
+        log.debug("Close tab")
     press_combo(["CTRL", "W"], debug=debug)
\ No newline at end of file
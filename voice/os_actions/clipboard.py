@@ -0,0 +1,127 @@
+# os_actions/clipboard.py
+# Clipboard access for the paste fast path (keyboard_utils.paste_text)
+# - WindowsClipboard: CF_UNICODETEXT via ctypes (no pywin32 needed)
+# - MemoryClipboard: in-process stand-in (Linux, tests)
+# NOTE: only TEXT is saved/restored; an image on the clipboard is replaced.
+
+import sys
+import time
+
+CF_UNICODETEXT = 13
+GMEM_MOVEABLE = 0x0002
+
+
+class ClipboardBackend:
+    name = "base"
+
+    def get(self) -> str | None:
+        raise NotImplementedError
+
+    def set(self, text: str):
+        raise NotImplementedError
+
+
+class MemoryClipboard(ClipboardBackend):
+    name = "memory"
+
+    def __init__(self, text=None):
+        self.text = text
+        self.writes = 0
+
+    def get(self) -> str | None:
+        return self.text
+
+    def set(self, text: str):
+        self.text = text
+        self.writes += 1
+
+
+class WindowsClipboard(ClipboardBackend):
+    name = "windows"
+
+    def __init__(self, open_retries=5):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.open_retries = open_retries
+
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+
+        # 64-bit handles: declare pointer-sized return types
+        self.kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+        self.kernel32.GlobalAlloc.restype = ctypes.c_void_p
+        self.kernel32.GlobalLock.argtypes = [ctypes.c_void_p]
+        self.kernel32.GlobalLock.restype = ctypes.c_void_p
+        self.kernel32.GlobalUnlock.argtypes = [ctypes.c_void_p]
+        self.kernel32.GlobalFree.argtypes = [ctypes.c_void_p]
+        self.user32.OpenClipboard.argtypes = [wintypes.HWND]
+        self.user32.GetClipboardData.argtypes = [wintypes.UINT]
+        self.user32.GetClipboardData.restype = ctypes.c_void_p
+        self.user32.SetClipboardData.argtypes = [wintypes.UINT, ctypes.c_void_p]
+        self.user32.SetClipboardData.restype = ctypes.c_void_p
+
+    def _open(self):
+        # another app may hold the clipboard for a moment
+        for _ in range(self.open_retries):
+            if self.user32.OpenClipboard(None):
+                return
+            time.sleep(0.01)
+        raise OSError("Clipboard busy")
+
+    def get(self) -> str | None:
+        self._open()
+        try:
+            handle = self.user32.GetClipboardData(CF_UNICODETEXT)
+            if not handle:
+                return None
+            ptr = self.kernel32.GlobalLock(handle)
+            try:
+                return self.ctypes.wstring_at(ptr)
+            finally:
+                self.kernel32.GlobalUnlock(handle)
+        finally:
+            self.user32.CloseClipboard()
+
+    def set(self, text: str):
+        data = (text + "\0").encode("utf-16-le")
+
+        # open first: a busy clipboard must not leave an allocation behind
+        self._open()
+        try:
+            handle = self.kernel32.GlobalAlloc(GMEM_MOVEABLE, len(data))
+            if not handle:
+                raise MemoryError("GlobalAlloc failed")
+            try:
+                ptr = self.kernel32.GlobalLock(handle)
+                if not ptr:
+                    raise MemoryError("GlobalLock failed")
+                self.ctypes.memmove(ptr, data, len(data))
+                self.kernel32.GlobalUnlock(handle)
+
+                self.user32.EmptyClipboard()
+                if not self.user32.SetClipboardData(CF_UNICODETEXT, handle):
+                    raise OSError("SetClipboardData failed")
+            except BaseException:
+                self.kernel32.GlobalFree(handle)  # ownership NOT transferred
+                raise
+        finally:
+            self.user32.CloseClipboard()
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_clipboard = None
+
+
+def get_clipboard() -> ClipboardBackend:
+    global _clipboard
+    if _clipboard is None:
+        _clipboard = WindowsClipboard() if sys.platform == "win32" else MemoryClipboard()
+    return _clipboard
+
+
+def set_clipboard(backend: ClipboardBackend | None):
+    global _clipboard
+    _clipboard = backend
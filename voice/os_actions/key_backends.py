@@ -0,0 +1,226 @@
+# os_actions/key_backends.py
+# Where key events actually go
+# - Events are built ONCE as plain tuples, then handed to a backend in batches
+# - WindowsSendInputBackend: whole INPUT arrays per SendInput call
+#   (unicode scan codes for text → no VK table, no shift juggling)
+# - RecordingBackend: keeps the event stream (tests, benchmarks)
+# - NullBackend: runtime fallback off Windows, counts events and keeps nothing
+
+import sys
+from collections import namedtuple
+
+from utils.log import get_logger
+
+log = get_logger("keyboard")
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+VK_RETURN = 0x0D
+VK_TAB = 0x09
+
+# vk=0 + KEYEVENTF_UNICODE → scan is a UTF-16 code unit
+KeyEvent = namedtuple("KeyEvent", ["vk", "scan", "flags"])
+
+
+# ---------------- EVENT BUILDERS ----------------
+
+def combo_events(vks: list) -> list:
+    """All downs, then ups in reverse: one atomic chord."""
+    return (
+        [KeyEvent(vk, 0, 0) for vk in vks]
+        + [KeyEvent(vk, 0, KEYEVENTF_KEYUP) for vk in reversed(vks)]
+    )
+
+
+def text_events(text: str) -> list:
+    events = []
+    for ch in text:
+        if ch == "\n":
+            events += combo_events([VK_RETURN])
+            continue
+        if ch == "\r":
+            continue  # CRLF → one ENTER
+        if ch == "\t":
+            events += combo_events([VK_TAB])
+            continue
+
+        # characters outside the BMP go out as a surrogate pair
+        data = ch.encode("utf-16-le")
+        for i in range(0, len(data), 2):
+            unit = int.from_bytes(data[i:i + 2], "little")
+            events.append(KeyEvent(0, unit, KEYEVENTF_UNICODE))
+            events.append(KeyEvent(0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    return events
+
+
+def held_keys(events: list) -> list:
+    """Key-up events for everything still pressed after `events` (press order reversed)."""
+    down = {}
+    for e in events:
+        key = (e.vk, e.scan, e.flags & KEYEVENTF_UNICODE)
+        if e.flags & KEYEVENTF_KEYUP:
+            down.pop(key, None)
+        else:
+            down[key] = e
+    return [KeyEvent(e.vk, e.scan, e.flags | KEYEVENTF_KEYUP) for e in reversed(list(down.values()))]
+
+
+# ---------------- BACKENDS ----------------
+
+class KeystrokeBackend:
+    name = "base"
+
+    def send(self, events: list) -> int:
+        """Injects events in order. Returns how many were accepted."""
+        raise NotImplementedError
+
+
+class NullBackend(KeystrokeBackend):
+    """Accepts and drops everything; memory stays flat over long sessions."""
+    name = "null"
+
+    def __init__(self):
+        self.sent = 0
+        self.batches = 0
+
+    def send(self, events: list) -> int:
+        self.sent += len(events)
+        self.batches += 1
+        return len(events)
+
+
+class RecordingBackend(KeystrokeBackend):
+    name = "recording"
+
+    def __init__(self):
+        self.events = []
+        self.batches = 0
+
+    def send(self, events: list) -> int:
+        self.events.extend(events)
+        self.batches += 1
+        return len(events)
+
+    def text(self) -> str:
+        """Text the recorded events would have typed."""
+        units = bytearray()
+        out = []
+
+        for e in self.events:
+            if e.flags & KEYEVENTF_KEYUP:
+                continue
+            if e.flags & KEYEVENTF_UNICODE:
+                units += e.scan.to_bytes(2, "little")
+                continue
+            if units:
+                out.append(units.decode("utf-16-le"))
+                units = bytearray()
+            if e.vk == VK_RETURN:
+                out.append("\n")
+            elif e.vk == VK_TAB:
+                out.append("\t")
+
+        if units:
+            out.append(units.decode("utf-16-le"))
+        return "".join(out)
+
+    def clear(self):
+        self.events.clear()
+        self.batches = 0
+
+
+class WindowsSendInputBackend(KeystrokeBackend):
+    name = "sendinput"
+
+    def __init__(self, batch_size=64):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.batch_size = batch_size
+
+        ULONG_PTR = ctypes.c_size_t
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [
+                ("wVk", wintypes.WORD),
+                ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ULONG_PTR),
+            ]
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [
+                ("dx", wintypes.LONG),
+                ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ULONG_PTR),
+            ]
+
+        # the union must be full size or SendInput rejects cbSize
+        class _INPUTUNION(ctypes.Union):
+            _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+        self.KEYBDINPUT = KEYBDINPUT
+        self.INPUT = INPUT
+        self._send_input = ctypes.windll.user32.SendInput
+
+    def send(self, events: list) -> int:
+        sent = 0
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start:start + self.batch_size]
+            array = (self.INPUT * len(batch))()
+
+            for slot, e in zip(array, batch):
+                slot.type = INPUT_KEYBOARD
+                slot.u.ki = self.KEYBDINPUT(e.vk, e.scan, e.flags, 0, 0)
+
+            accepted = self._send_input(len(batch), array, self.ctypes.sizeof(self.INPUT))
+            sent += accepted
+            if accepted != len(batch):
+                # blocked by UIPI / another desktop: stop, and release whatever the
+                # accepted part left down (a stuck Ctrl/Shift breaks the whole desktop)
+                log.error("SendInput accepted %d/%d events", accepted, len(batch))
+                self._release(held_keys(events[:start + accepted]))
+                break
+        return sent
+
+    def _release(self, ups: list):
+        if not ups:
+            return
+        array = (self.INPUT * len(ups))()
+        for slot, e in zip(array, ups):
+            slot.type = INPUT_KEYBOARD
+            slot.u.ki = self.KEYBDINPUT(e.vk, e.scan, e.flags, 0, 0)
+        if self._send_input(len(ups), array, self.ctypes.sizeof(self.INPUT)) != len(ups):
+            log.error("Could not release %d held key(s)", len(ups))
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_backend = None
+
+
+def get_backend() -> KeystrokeBackend:
+    """SendInput on Windows, otherwise a no-op (nothing is typed)."""
+    global _backend
+    if _backend is None:
+        if sys.platform == "win32":
+            _backend = WindowsSendInputBackend()
+        else:
+            log.warning("No key injection on this platform, key events are dropped")
+            _backend = NullBackend()
+    return _backend
+
+
+def set_backend(backend: KeystrokeBackend):
+    global _backend
+    _backend = backend
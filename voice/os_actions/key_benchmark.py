@@ -0,0 +1,82 @@
+# os_actions/key_benchmark.py
+# Keystroke injection benchmark (no window focus needed with the recorder)
+# Types generated text + combos through keyboard_utils and checks the event
+# stream round-trips back to the same text.
+#
+# Usage (from voice/):
+#   python -m os_actions.key_benchmark [--chars 2000] [--repeat 5] [--delay 0]
+#   python -m os_actions.key_benchmark --sendinput   # Windows: REALLY types into the focused window
+
+import argparse
+import time
+
+from os_actions import keyboard_utils
+from os_actions.key_backends import RecordingBackend, WindowsSendInputBackend, set_backend
+
+SAMPLE = "def main():\n\tprint(\"héllo wörld → 🙂\")  # 100% {ok}\n"
+
+
+def make_text(chars: int) -> str:
+    return (SAMPLE * (chars // len(SAMPLE) + 1))[:chars]
+
+
+def run(chars=2000, repeat=5, delay=0.0, backend=None) -> dict:
+    backend = backend or RecordingBackend()
+    set_backend(backend)
+    text = make_text(chars)
+
+    recorder = backend if isinstance(backend, RecordingBackend) else None
+    correct = True
+    events = 0
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if recorder:
+            recorder.clear()
+        keyboard_utils.type_text(text, delay=delay, debug=False)
+        keyboard_utils.press_combo(["CTRL", "S"], debug=False)
+
+        if recorder:
+            events += len(recorder.events)
+            correct = correct and recorder.text() == text
+    elapsed = time.perf_counter() - started
+
+    return {
+        "backend": backend.name,
+        "chars": chars * repeat,
+        "events": events,
+        "batches": recorder.batches if recorder else None,
+        "correct": correct if recorder else None,
+        "elapsed_sec": elapsed,
+        "chars_per_sec": chars * repeat / elapsed if elapsed else 0.0,
+        "events_per_sec": events / elapsed if elapsed and events else 0.0,
+    }
+
+
+def print_report(report: dict):
+    print("[KEY BENCH] Keystroke injection benchmark")
+    print(
+        f"[KEY BENCH] backend={report['backend']} chars={report['chars']} "
+        f"events={report['events']} batches/pass={report['batches']} "
+        f"correct={report['correct']}"
+    )
+    print(
+        f"[KEY BENCH] elapsed={report['elapsed_sec']:.3f}s "
+        f"{report['chars_per_sec']:.0f} chars/s {report['events_per_sec']:.0f} events/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keystroke injection")
+    parser.add_argument("--chars", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.0, help="pause between text batches (s)")
+    parser.add_argument("--sendinput", action="store_true", help="use real SendInput (Windows)")
+    args = parser.parse_args()
+
+    backend = WindowsSendInputBackend() if args.sendinput else RecordingBackend()
+    print_report(run(args.chars, args.repeat, args.delay, backend))
+
+
+if __name__ == "__main__":
+    main()
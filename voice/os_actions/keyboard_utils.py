@@ -1,72 +1,142 @@
 # Auto-generated by scaffold.py
 # os_actions/keyboard_utils.py
 # Low-level keyboard injection
-# ONLY module allowed to send key events
+# ONLY module allowed to send key events (through os_actions/key_backends.py)
+# - Combos go out as ONE batch (all downs + ups in a single SendInput)
+# - Text goes out as unicode events in batches; stop / progress checked between batches
+# - Large text is PASTED (clipboard + CTRL+V) instead of typed, clipboard restored after
 
-import ctypes
 import time
 
-SendInput = ctypes.windll.user32.SendInput
+from os_actions.key_backends import get_backend, combo_events, text_events
+from os_actions.clipboard import get_clipboard
+from utils.log import get_logger
 
-INPUT_KEYBOARD = 1
-KEYEVENTF_KEYUP = 0x0002
+log = get_logger("keyboard")
 
 # Virtual key codes (Windows)
 VK = {
     "CTRL": 0x11,
     "SHIFT": 0x10,
     "ALT": 0x12,
+    "WIN": 0x5B,
     "ENTER": 0x0D,
     "TAB": 0x09,
     "ESC": 0x1B,
+    "SPACE": 0x20,
+    "BACKSPACE": 0x08,
+    "DELETE": 0x2E,
+    "HOME": 0x24,
+    "END": 0x23,
+    "PAGEUP": 0x21,
+    "PAGEDOWN": 0x22,
     "UP": 0x26,
     "DOWN": 0x28,
     "LEFT": 0x25,
     "RIGHT": 0x27
 }
+VK.update({chr(c): c for c in range(ord("A"), ord("Z") + 1)})
+VK.update({str(d): 0x30 + d for d in range(10)})
+VK.update({f"F{n}": 0x6F + n for n in range(1, 13)})
 
-class KEYBDINPUT(ctypes.Structure):
-    _fields_ = [
-        ("wVk", ctypes.c_ushort),
-        ("wScan", ctypes.c_ushort),
-        ("dwFlags", ctypes.c_ulong),
-        ("time", ctypes.c_ulong),
-        ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong)),
-    ]
-
-class INPUT(ctypes.Structure):
-    _fields_ = [
-        ("type", ctypes.c_ulong),
-        ("ki", KEYBDINPUT),
-    ]
-
-def _key_event(vk: int, down: bool, debug=True):
-    flags = 0 if down else KEYEVENTF_KEYUP
-    inp = INPUT(INPUT_KEYBOARD, KEYBDINPUT(vk, 0, flags, 0, None))
-    SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+TEXT_BATCH_CHARS = 32
+
+
+def _vk(key: str) -> int:
+    return VK[key.upper()]
 
-    if debug:
-        action = "DOWN" if down else "UP"
-        print(f"[KEYBOARD] {action} vk={vk}")
 
 def press_combo(keys: list, delay=0.05, debug=True):
+    # delay kept for callers; a single SendInput batch needs no hold time
     if debug:
-        print("[KEYBOARD] Press combo:", keys)
+        log.debug("Press combo: %s", keys)
+
+    get_backend().send(combo_events([_vk(k) for k in keys]))
+
 
-    for k in keys:
-        _key_event(VK[k], True, debug)
+def press_repeat(key: str, count: int, debug=True, should_stop=None, on_progress=None) -> int:
+    """count presses of one key, batched. Returns presses sent."""
+    if debug:
+        log.debug("Press %s x%d", key, count)
 
-    time.sleep(delay)
+    one = combo_events([_vk(key)])
+    done = 0
+    while done < count:
+        if should_stop and should_stop():
+            return done
+        n = min(TEXT_BATCH_CHARS, count - done)
+        get_backend().send(one * n)
+        done += n
+        if on_progress:
+            on_progress(done, count)
+    return done
 
-    for k in reversed(keys):
-        _key_event(VK[k], False, debug)
 
-def type_text(text: str, delay=0.01, debug=True):
+def type_text(text: str, delay=0.01, debug=True, should_stop=None, on_progress=None) -> int:
+    """
+    should_stop() is checked before every batch (→ "stop" interrupts).
+    on_progress(done, total) is called as batches go out.
+    delay is the pause between batches of TEXT_BATCH_CHARS characters.
+    Returns how many characters were typed.
+    """
     if debug:
-        print(f"[KEYBOARD] Typing text ({len(text)} chars)")
+        log.debug("Typing text (%d chars)", len(text))
+
+    backend = get_backend()
+
+    for start in range(0, len(text), TEXT_BATCH_CHARS):
+        if should_stop and should_stop():
+            if debug:
+                log.info("Typing stopped at %d/%d", start, len(text))
+            return start
+
+        chunk = text[start:start + TEXT_BATCH_CHARS]
+        backend.send(text_events(chunk))
+
+        if on_progress:
+            on_progress(start + len(chunk), len(text))
+        if delay:
+            time.sleep(delay)
+
+    return len(text)
+
+
+def paste_text(text: str, restore_delay=0.3, debug=True) -> bool:
+    """
+    Clipboard → CTRL+V → previous clipboard text back.
+    restore_delay: the target app reads the clipboard AFTER the keystroke,
+    restoring too early would paste the old content.
+    Returns False (nothing sent) if the clipboard is unusable.
+    """
+    clipboard = get_clipboard()
+
+    try:
+        previous = clipboard.get()
+        clipboard.set(text)
+    except Exception as e:
+        log.warning("Clipboard unavailable, typing instead: %s", e)
+        return False
+
+    if debug:
+        log.debug("Pasting text (%d chars)", len(text))
+    press_combo(["CTRL", "V"], debug=debug)
+
+    if previous is not None:
+        time.sleep(restore_delay)
+        try:
+            clipboard.set(previous)
+        except Exception as e:
+            log.warning("Failed to restore clipboard: %s", e)
+    return True
+
+
+def output_text(text: str, paste_threshold=200, restore_delay=0.3, delay=0.01,
+                debug=True, should_stop=None, on_progress=None) -> int:
+    """Short text is typed (cancellable), long text is pasted in one go."""
+    if paste_threshold and len(text) >= paste_threshold:
+        if paste_text(text, restore_delay, debug):
+            if on_progress:
+                on_progress(len(text), len(text))
+            return len(text)
 
-    for ch in text:
-        vk = ord(ch.upper())
-        ctypes.windll.user32.keybd_event(vk, 0, 0, 0)
-        ctypes.windll.user32.keybd_event(vk, 0, KEYEVENTF_KEYUP, 0)
-        time.sleep(delay)
\ No newline at end of file
+    return type_text(text, delay, debug, should_stop, on_progress)
@@ -2,19 +2,25 @@
 # os_actions/os_actions.py
 # OS-level helpers (NO keyboard logic here)
 
-import subprocess
 import webbrowser
 
+from os_actions.app_index import get_index
+from utils.log import get_logger
+
+log = get_logger("os")
+
 def open_website(url: str, debug=True):
     if debug:
-        print("[OS] Opening website:", url)
+        log.info("Opening website: %s", url)
     webbrowser.open(url)
 
-def open_app(app_name: str, debug=True):
+def open_app(app_name: str, debug=True) -> bool:
+    """Resolved through the cached launcher index, started without a shell."""
     if debug:
-        print("[OS] Opening app:", app_name)
+        log.info("Opening app: %s", app_name)
 
     try:
-        subprocess.Popen(app_name, shell=True)
+        return get_index().launch(app_name)
     except Exception as e:
-        print("[OS ERROR] Failed to open app:", e)
\ No newline at end of file
+        log.error("Failed to open app: %s", e)
+        return False
\ No newline at end of file
@@ -0,0 +1,134 @@
+# speech/backends.py
+# Pluggable STT backends
+# - CaptureSource: where phrase audio comes from (mic, WAV replay)
+# - RecognizerBackend: audio -> text (Google, deterministic local stand-in)
+# Segmentation / VAD stays in speech_recognition.Recognizer.listen() for ALL sources
+
+import time
+from pathlib import Path
+
+import speech_recognition as sr
+
+from utils.log import get_logger
+
+log = get_logger("stt")
+
+
+# ==================================================
+# CAPTURE SOURCES
+# ==================================================
+
+class CaptureSource:
+    """
+    open() -> context manager yielding an sr.AudioSource
+    calibrate() -> one-time ambient noise tuning (optional)
+    """
+
+    name = "base"
+
+    def open(self):
+        raise NotImplementedError
+
+    def calibrate(self, recognizer, duration=1, debug=True):
+        pass
+
+
+class MicrophoneSource(CaptureSource):
+    name = "microphone"
+
+    def open(self):
+        return sr.Microphone()
+
+    def calibrate(self, recognizer, duration=1, debug=True):
+        with sr.Microphone() as source:
+            if debug:
+                log.info("Calibrating microphone (%ss)...", duration)
+            recognizer.adjust_for_ambient_noise(source, duration=duration)
+
+
+class WavReplaySource(CaptureSource):
+    """
+    Replays a directory (or list) of WAV files, one file per open().
+    The expected transcript of each file comes from a sidecar .txt
+    (same stem) or, failing that, the file stem with '_' → ' '.
+    """
+
+    name = "wav_replay"
+
+    def __init__(self, files, loop=False):
+        if isinstance(files, (str, Path)):
+            files = sorted(Path(files).glob("*.wav"))
+        self.files = [Path(f) for f in files]
+        self.loop = loop
+        self.index = 0
+        self.current = None
+
+    def remaining(self) -> int:
+        return len(self.files) - self.index
+
+    def open(self):
+        if self.index >= len(self.files):
+            if not self.loop or not self.files:
+                raise EOFError("WAV replay corpus exhausted")
+            self.index = 0
+
+        self.current = self.files[self.index]
+        self.index += 1
+        return sr.AudioFile(str(self.current))
+
+    @property
+    def current_transcript(self) -> str | None:
+        if self.current is None:
+            return None
+
+        sidecar = self.current.with_suffix(".txt")
+        if sidecar.exists():
+            return sidecar.read_text(encoding="utf-8").strip()
+
+        return self.current.stem.replace("_", " ")
+
+
+# ==================================================
+# RECOGNIZERS
+# ==================================================
+
+class RecognizerBackend:
+    """recognize(audio, language) -> text. Raise on failure."""
+
+    name = "base"
+
+    def recognize(self, audio, language: str) -> str:
+        raise NotImplementedError
+
+
+class GoogleRecognizer(RecognizerBackend):
+    name = "google"
+
+    def __init__(self, recognizer: sr.Recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, language: str) -> str:
+        return self.recognizer.recognize_google(audio, language=language)
+
+
+class TranscriptRecognizer(RecognizerBackend):
+    """
+    Deterministic local stand-in for WAV replay.
+    Returns the current file's expected transcript, optionally after a
+    fixed delay to simulate network recognition latency.
+    """
+
+    name = "transcript"
+
+    def __init__(self, source: WavReplaySource, latency_sec=0.0):
+        self.source = source
+        self.latency_sec = latency_sec
+
+    def recognize(self, audio, language: str) -> str:
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+
+        text = self.source.current_transcript
+        if not text:
+            raise ValueError("No transcript for replayed audio")
+        return text
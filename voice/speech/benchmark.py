@@ -0,0 +1,102 @@
+# speech/benchmark.py
+# STT throughput benchmark (no mic, no network)
+# Replays a directory of recorded commands through the REAL
+# segmentation / VAD path (sr.Recognizer.listen) + recognizer backend.
+#
+# Usage (from voice/):
+#   python -m speech.benchmark recordings/ [--repeat 3] [--latency 0.0] [--kws data/kws_templates]
+
+import argparse
+import time
+
+from speech.backends import WavReplaySource, TranscriptRecognizer
+from speech.stt import SpeechToText
+from utils.metrics import percentile
+
+
+def run(corpus_dir: str, repeat=1, latency=0.0, kws_dir=None, kws_threshold=25.0) -> dict:
+    source = WavReplaySource(corpus_dir)
+    if not source.files:
+        raise SystemExit(f"[BENCH] No .wav files in {corpus_dir}")
+
+    keyword_gate = None
+    if kws_dir:
+        from speech.keyword_spotter import KeywordSpotter, KeywordGate
+        keyword_gate = KeywordGate(
+            KeywordSpotter.from_directory(kws_dir, threshold=kws_threshold, debug=False),
+            debug=False
+        )
+
+    stt = SpeechToText(
+        source=source,
+        backend=TranscriptRecognizer(source, latency_sec=latency),
+        keyword_gate=keyword_gate,
+        calibrate=False,
+        debug=False
+    )
+
+    stages = {}
+    total, recognized, correct = 0, 0, 0
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        source.index = 0
+        while source.remaining():
+            text = stt.listen()
+            total += 1
+
+            for stage, sec in stt.last_timings.items():
+                stages.setdefault(stage, []).append(sec)
+
+            if text:
+                recognized += 1
+                if text == source.current_transcript:
+                    correct += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "utterances": total,
+        "recognized": recognized,
+        "correct": correct,
+        "elapsed_sec": elapsed,
+        "utterances_per_sec": total / elapsed if elapsed else 0.0,
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+            for stage, values in stages.items()
+        }
+    }
+
+
+def print_report(report: dict):
+    print("[BENCH] STT replay benchmark")
+    print(
+        f"[BENCH] utterances={report['utterances']} "
+        f"recognized={report['recognized']} correct={report['correct']} "
+        f"elapsed={report['elapsed_sec']:.3f}s "
+        f"throughput={report['utterances_per_sec']:.1f} utt/s"
+    )
+    for stage, s in report["stages"].items():
+        print(
+            f"[BENCH] {stage:<10} n={s['count']:<5} "
+            f"p50={s['p50_ms']:.2f}ms p99={s['p99_ms']:.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay WAV commands through the STT pipeline")
+    parser.add_argument("corpus_dir", help="directory of .wav files (+ optional .txt transcripts)")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the corpus")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated recognizer latency (s)")
+    parser.add_argument("--kws", default=None, help="keyword template dir (enables the keyword gate)")
+    parser.add_argument("--kws-threshold", type=float, default=25.0)
+    args = parser.parse_args()
+
+    print_report(run(args.corpus_dir, args.repeat, args.latency, args.kws, args.kws_threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# speech/capture.py
+# One utterance for the main loop
+# - Keyword gate only for fresh COMMAND-mode phrases: dictation, a param
+#   follow-up ("What should I search?") and approve/cancel replies carry no keyword
+# - Speculative routing (same phrases only): each partial transcript is routed
+#   while it is spoken; the first hit stops capture and is committed early
+
+from utils.log import get_logger
+
+log = get_logger("stt")
+
+
+def expects_command(state, pending_plan) -> bool:
+    """Next phrase is a new command (not dictation, a follow-up or a plan reply)."""
+    return state.mode == "COMMAND" and not state.awaiting_param and not pending_plan.is_active()
+
+
+def capture(stt, command: bool, route_partial=None):
+    """
+    Returns (text, early_intent).
+    route_partial(text) -> intent or None, tried on every non-final partial;
+    only used for commands, and only when the STT streams partials.
+    """
+    if not (command and route_partial and stt.supports_partials):
+        return stt.listen(gated=command), None
+
+    text = None
+    partials = stt.listen_partials(gated=True)
+    for partial in partials:
+        text = partial.text
+        if partial.is_final:
+            break
+
+        intent = route_partial(text)
+        if intent:
+            partials.close()  # stop capturing, commit now
+            log.info("Speculative early commit on partial: '%s'", text)
+            return text, intent
+
+    return text, None
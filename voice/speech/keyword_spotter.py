@@ -0,0 +1,233 @@
+# speech/keyword_spotter.py
+# Local keyword / wake-phrase spotter (CPU only, NumPy)
+# - MFCC features + subsequence DTW against recorded WAV templates
+# - Runs BEFORE cloud STT: phrases without a keyword are never uploaded
+# - Templates: <templates_dir>/<keyword>/*.wav (mono, 16-bit)
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from utils.log import get_logger
+
+log = get_logger("stt.kws", "KWS")
+
+SAMPLE_RATE = 16000
+FRAME_SEC = 0.025
+HOP_SEC = 0.010
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 13
+PRE_EMPHASIS = 0.97
+
+
+# ---------------- AUDIO ----------------
+
+def read_wav(path) -> tuple[np.ndarray, int]:
+    """Returns (float samples in [-1, 1], sample_rate). Stereo is averaged."""
+    with wave.open(str(path), "rb") as wf:
+        rate = wf.getframerate()
+        width = wf.getsampwidth()
+        channels = wf.getnchannels()
+        raw = wf.readframes(wf.getnframes())
+
+    return pcm_to_float(raw, width, channels), rate
+
+
+def pcm_to_float(raw: bytes, width=2, channels=1) -> np.ndarray:
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def resample(samples: np.ndarray, rate: int, target=SAMPLE_RATE) -> np.ndarray:
+    """Linear resampling — plenty for keyword matching."""
+    if rate == target or len(samples) == 0:
+        return samples
+    n = int(round(len(samples) * target / rate))
+    x_old = np.linspace(0.0, 1.0, num=len(samples), endpoint=False)
+    x_new = np.linspace(0.0, 1.0, num=n, endpoint=False)
+    return np.interp(x_new, x_old, samples).astype(np.float32)
+
+
+# ---------------- MFCC ----------------
+
+def _mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _hz(mel):
+    return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+
+def _mel_filterbank(rate=SAMPLE_RATE, n_fft=N_FFT, n_mels=N_MELS) -> np.ndarray:
+    mels = np.linspace(_mel(0.0), _mel(rate / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * _hz(mels) / rate).astype(int)
+
+    fb = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        for k in range(left, center):
+            fb[m - 1, k] = (k - left) / max(center - left, 1)
+        for k in range(center, right):
+            fb[m - 1, k] = (right - k) / max(right - center, 1)
+    return fb
+
+
+def _dct_matrix(n_in=N_MELS, n_out=N_MFCC) -> np.ndarray:
+    n = np.arange(n_in)
+    k = np.arange(n_out)[:, None]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)).astype(np.float32)
+
+
+_FILTERBANK = _mel_filterbank()
+_DCT = _dct_matrix()
+
+
+def mfcc(samples: np.ndarray, rate=SAMPLE_RATE) -> np.ndarray:
+    """Returns (frames, N_MFCC) features with cepstral mean normalization."""
+    samples = resample(np.asarray(samples, dtype=np.float32), rate)
+
+    frame_len = int(FRAME_SEC * SAMPLE_RATE)
+    hop = int(HOP_SEC * SAMPLE_RATE)
+    if len(samples) < frame_len:
+        return np.zeros((0, N_MFCC), dtype=np.float32)
+
+    emphasized = np.append(samples[0], samples[1:] - PRE_EMPHASIS * samples[:-1])
+
+    n_frames = 1 + (len(emphasized) - frame_len) // hop
+    idx = np.arange(frame_len)[None, :] + hop * np.arange(n_frames)[:, None]
+    frames = emphasized[idx] * np.hamming(frame_len)
+
+    power = np.abs(np.fft.rfft(frames, N_FFT)) ** 2 / N_FFT
+    energies = np.log(power @ _FILTERBANK.T + 1e-10)
+    feats = energies @ _DCT.T
+
+    return feats - feats.mean(axis=0)
+
+
+# ---------------- MATCHING ----------------
+
+def subsequence_dtw(template: np.ndarray, utterance: np.ndarray) -> float:
+    """
+    Best match of the WHOLE template against ANY segment of the utterance.
+    Local slope limited to [1/2, 2] so every row vectorizes over the utterance.
+    Returns mean per-frame distance (lower = better).
+    """
+    t, n = len(template), len(utterance)
+    if t == 0 or n == 0:
+        return float("inf")
+
+    # pairwise euclidean distances (t, n)
+    cost = np.sqrt(
+        np.maximum(
+            (template ** 2).sum(1)[:, None]
+            + (utterance ** 2).sum(1)[None, :]
+            - 2 * template @ utterance.T,
+            0.0
+        )
+    )
+
+    inf = np.full(n, np.inf)
+    prev2 = inf
+    prev = cost[0].copy()  # free start anywhere in the utterance
+
+    for i in range(1, t):
+        diag = np.concatenate(([np.inf], prev[:-1]))              # (i-1, j-1)
+        skip_u = np.concatenate(([np.inf, np.inf], prev[:-2]))    # (i-1, j-2)
+        skip_t = np.concatenate(([np.inf], prev2[:-1]))           # (i-2, j-1)
+        row = cost[i] + np.minimum(np.minimum(diag, skip_u), skip_t)
+        prev2, prev = prev, row
+
+    return float(prev.min() / t)
+
+
+class KeywordSpotter:
+    """
+    Template-matching spotter.
+    detect() -> best matching keyword, or None if nothing is under threshold.
+    """
+
+    def __init__(self, templates: dict, threshold=25.0, debug=True):
+        # {keyword: [mfcc arrays]}
+        self.templates = templates
+        self.threshold = threshold
+        self.debug = debug
+
+    @classmethod
+    def from_directory(cls, templates_dir, threshold=25.0, debug=True):
+        templates = {}
+        root = Path(templates_dir)
+
+        if root.exists():
+            for keyword_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+                feats = []
+                for wav in sorted(keyword_dir.glob("*.wav")):
+                    samples, rate = read_wav(wav)
+                    feats.append(mfcc(samples, rate))
+                if feats:
+                    templates[keyword_dir.name.replace("_", " ")] = feats
+
+        if not templates:
+            log.warning("No keyword templates in %s (one sub-directory of .wav files per keyword)", root)
+        elif debug:
+            log.info("Loaded templates: %s", sorted(templates))
+
+        return cls(templates, threshold=threshold, debug=debug)
+
+    def score(self, samples: np.ndarray, rate=SAMPLE_RATE) -> dict:
+        """{keyword: best DTW distance} for one utterance."""
+        feats = mfcc(samples, rate)
+        return {
+            keyword: min(subsequence_dtw(t, feats) for t in templates)
+            for keyword, templates in self.templates.items()
+        }
+
+    def detect(self, samples: np.ndarray, rate=SAMPLE_RATE) -> str | None:
+        scores = self.score(samples, rate)
+        if not scores:
+            return None
+
+        keyword = min(scores, key=scores.get)
+        best = scores[keyword]
+
+        if self.debug:
+            log.debug("best='%s' distance=%.2f threshold=%s", keyword, best, self.threshold)
+
+        return keyword if best <= self.threshold else None
+
+
+class KeywordGate:
+    """
+    Sits between capture and cloud recognition in SpeechToText.
+    Accepts speech_recognition AudioData; only forwards phrases with a keyword.
+    """
+
+    def __init__(self, spotter: KeywordSpotter, debug=True):
+        # no templates → detect() is always None → every phrase dropped, the assistant goes deaf
+        if not spotter.templates:
+            raise ValueError("keyword gate has no templates")
+        self.spotter = spotter
+        self.debug = debug
+
+    def accepts(self, audio) -> bool:
+        raw = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+        keyword = self.spotter.detect(pcm_to_float(raw), SAMPLE_RATE)
+
+        if self.debug:
+            if keyword:
+                log.debug("Keyword detected: '%s' → forwarding to STT", keyword)
+            else:
+                log.debug("No keyword → skipping cloud STT")
+
+        return keyword is not None
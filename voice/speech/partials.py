@@ -0,0 +1,56 @@
+# speech/partials.py
+# Partial-hypothesis recognizers for streaming STT
+# - Fed audio chunk-by-chunk WHILE the phrase is still being spoken
+# - Return the current best transcript after every chunk
+# - Google STT cannot do this, so SpeechToText only streams when given one of these
+# - No production streaming recognizer ships yet: speech.speculative_routing needs one
+#   passed as partial_recognizer, otherwise main.py listens for whole phrases
+
+from collections import namedtuple
+
+# text: current hypothesis, is_final: True only for the end-of-phrase result
+Partial = namedtuple("Partial", ["text", "is_final"])
+
+
+class PartialRecognizer:
+    """
+    Interface for streaming recognizers.
+    start() -> one call per phrase
+    feed(chunk) -> current hypothesis (or None if nothing new)
+    finish() -> final transcript for the phrase
+    """
+
+    def start(self):
+        raise NotImplementedError
+
+    def feed(self, chunk) -> str | None:
+        raise NotImplementedError
+
+    def finish(self) -> str | None:
+        raise NotImplementedError
+
+
+class ScriptedPartialRecognizer(PartialRecognizer):
+    """
+    Local stand-in backend (tests / offline runs).
+    Each phrase replays the next scripted transcript, one more word per audio chunk.
+    """
+
+    def __init__(self, transcripts):
+        self.transcripts = list(transcripts)
+        self._words = []
+        self._heard = 0
+
+    def start(self):
+        text = self.transcripts.pop(0) if self.transcripts else ""
+        self._words = text.split()
+        self._heard = 0
+
+    def feed(self, chunk) -> str | None:
+        if self._heard >= len(self._words):
+            return None
+        self._heard += 1
+        return " ".join(self._words[:self._heard])
+
+    def finish(self) -> str | None:
+        return " ".join(self._words) or None
@@ -3,9 +3,21 @@
 # - HARD timeout (no infinite hangs)
 # - Better sentence completion handling
 # - Debug output everywhere
+# - Optional partial hypotheses (streaming backends only)
+# - Optional local keyword gate (no cloud upload for background chatter),
+#   applied per call: listen(gated=True) (see speech/capture.py)
+# - Pluggable capture source + recognizer (see speech/backends.py)
 
 import speech_recognition as sr
 import threading
+import time
+
+from speech.partials import Partial
+from speech.backends import MicrophoneSource, GoogleRecognizer
+from utils.log import get_logger
+from utils import metrics
+
+log = get_logger("stt")
 
 class SpeechToText:
     def __init__(
@@ -14,15 +26,28 @@ class SpeechToText:
         listen_timeout=3,
         phrase_time_limit=5,
         recognition_timeout=6,
+        partial_recognizer=None,
+        keyword_gate=None,
+        source=None,
+        backend=None,
+        calibrate=True,
         debug=True
     ):
+        # sr.Recognizer does segmentation / VAD for every source
         self.recognizer = sr.Recognizer()
+        self.source = source or MicrophoneSource()
+        self.backend = backend or GoogleRecognizer(self.recognizer)
         self.language = language
         self.listen_timeout = listen_timeout
         self.phrase_time_limit = phrase_time_limit
         self.recognition_timeout = recognition_timeout
+        self.partial_recognizer = partial_recognizer
+        self.keyword_gate = keyword_gate
         self.debug = debug
 
+        # Per-stage seconds of the last listen() (benchmarks read this)
+        self.last_timings = {}
+
         # ---------- Recognition tuning ----------
         self.recognizer.energy_threshold = 300
         self.recognizer.dynamic_energy_threshold = True
@@ -31,79 +56,165 @@ class SpeechToText:
         self.recognizer.pause_threshold = 0.9          # wait longer before deciding "sentence ended"
         self.recognizer.non_speaking_duration = 0.4    # tolerate short pauses
 
-        # ---------- One-time mic calibration ----------
-        with sr.Microphone() as source:
-            if self.debug:
-                print("[STT] Calibrating microphone (1s)...")
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        # ---------- One-time calibration ----------
+        if calibrate:
+            self.source.calibrate(self.recognizer, duration=1, debug=self.debug)
 
         if self.debug:
-            print("[STT] Initialized")
-            print(f"[STT] phrase_time_limit={self.phrase_time_limit}s")
-            print(f"[STT] pause_threshold={self.recognizer.pause_threshold}s")
+            log.info("Initialized (source=%s, backend=%s)", self.source.name, self.backend.name)
+            log.debug("phrase_time_limit=%ss pause_threshold=%ss",
+                      self.phrase_time_limit, self.recognizer.pause_threshold)
 
     # ---------------- INTERNAL ----------------
 
     def _recognize_worker(self, audio, result: dict):
-        """Runs Google STT in a thread so it can't block forever"""
+        """Runs the recognizer backend in a thread so it can't block forever"""
         try:
-            text = self.recognizer.recognize_google(
-                audio,
-                language=self.language
-            )
+            text = self.backend.recognize(audio, self.language)
             result["text"] = text
         except Exception as e:
             result["error"] = str(e)
 
     # ---------------- PUBLIC ----------------
 
-    def listen(self) -> str | None:
-        with sr.Microphone() as source:
-            if self.debug:
-                print("[STT] Listening...")
+    @property
+    def supports_partials(self) -> bool:
+        return self.partial_recognizer is not None
+
+    def listen(self, gated=False) -> str | None:
+        self.last_timings = {}
+        started = time.perf_counter()
+
+        try:
+            with self.source.open() as source:
+                if self.debug:
+                    log.debug("Listening...")
 
-            try:
                 audio = self.recognizer.listen(
                     source,
                     timeout=self.listen_timeout,
                     phrase_time_limit=self.phrase_time_limit
                 )
-            except sr.WaitTimeoutError:
-                if self.debug:
-                    print("[STT] Listen timeout (no speech)")
-                return None
-            except Exception as e:
-                print("[STT ERROR] Listen failed:", e)
+        except sr.WaitTimeoutError:
+            metrics.counter("voice_stt_timeouts_total", "STT timeouts", stage="listen").inc()
+            if self.debug:
+                log.debug("Listen timeout (no speech)")
+            return None
+        except EOFError:
+            # replay corpus ran out: the end of the input, not a failure
+            if self.debug:
+                log.debug("Capture source exhausted (%s)", self.source.name)
+            return None
+        except Exception as e:
+            metrics.counter("voice_stt_errors_total", "STT failures", stage="listen").inc()
+            log.error("Listen failed: %s", e)
+            return None
+
+        self.last_timings["capture"] = time.perf_counter() - started
+
+        # ---------- LOCAL KEYWORD GATE ----------
+        if gated and self.keyword_gate:
+            started = time.perf_counter()
+            accepted = self.keyword_gate.accepts(audio)
+            self.last_timings["gate"] = time.perf_counter() - started
+            if not accepted:
                 return None
 
         if self.debug:
-            print("[STT] Audio captured, recognizing...")
+            log.debug("Audio captured, recognizing...")
 
         # ---------- HARD TIMEOUT PROTECTION ----------
+        started = time.perf_counter()
         result = {}
         t = threading.Thread(
             target=self._recognize_worker,
             args=(audio, result),
+            name="stt-recognize",   # abandoned on timeout → visible in utils/memory.py thread counts
             daemon=True
         )
         t.start()
         t.join(timeout=self.recognition_timeout)
+        self.last_timings["recognize"] = time.perf_counter() - started
 
         if t.is_alive():
-            print("[STT ERROR] Recognition timeout (Google STT hung)")
+            metrics.counter("voice_stt_timeouts_total", "STT timeouts", stage="recognition").inc()
+            log.error("Recognition timeout (%s hung)", self.backend.name)
             return None
 
         if "error" in result:
-            print("[STT ERROR] Recognition failed:", result["error"])
+            metrics.counter("voice_stt_errors_total", "STT failures", stage="recognition").inc()
+            log.error("Recognition failed: %s", result["error"])
             return None
 
         text = result.get("text")
         if text:
             text = text.strip()
             if self.debug:
-                print("[STT RESULT]", text)
+                log.info("Result: %s", text)
             return text
 
         if self.debug:
-            print("[STT] Empty recognition result")
-        return None
\ No newline at end of file
+            log.debug("Empty recognition result")
+        return None
+
+    def listen_partials(self, gated=False):
+        """
+        Yields Partial(text, is_final) for ONE phrase while it is spoken.
+        The last item has is_final=True.
+        Closing the generator early stops capture immediately.
+        Without a partial recognizer this degrades to a single final listen(gated).
+        """
+        self.last_timings = {}    # stages overlap while streaming → not split
+        if not self.supports_partials:
+            text = self.listen(gated)
+            if text:
+                yield Partial(text, True)
+            return
+
+        try:
+            opened = self.source.open()
+        except EOFError:
+            if self.debug:
+                log.debug("Capture source exhausted (%s)", self.source.name)
+            return
+
+        self.partial_recognizer.start()
+        last = None
+
+        with opened as source:
+            if self.debug:
+                log.debug("Listening (partials)...")
+
+            try:
+                chunks = self.recognizer.listen(
+                    source,
+                    timeout=self.listen_timeout,
+                    phrase_time_limit=self.phrase_time_limit,
+                    stream=True
+                )
+                for chunk in chunks:
+                    hypothesis = self.partial_recognizer.feed(chunk)
+                    if not hypothesis:
+                        continue
+
+                    hypothesis = hypothesis.strip()
+                    if hypothesis and hypothesis != last:
+                        last = hypothesis
+                        if self.debug:
+                            log.debug("Partial: %s", hypothesis)
+                        yield Partial(hypothesis, False)
+
+            except sr.WaitTimeoutError:
+                metrics.counter("voice_stt_timeouts_total", "STT timeouts", stage="listen").inc()
+                if self.debug:
+                    log.debug("Listen timeout (no speech)")
+                return
+            except Exception as e:
+                log.error("Partial listen failed: %s", e)
+                return
+
+        final = self.partial_recognizer.finish()
+        if final and final.strip():
+            if self.debug:
+                log.info("Result: %s", final.strip())
+            yield Partial(final.strip(), True)
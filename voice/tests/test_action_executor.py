@@ -0,0 +1,89 @@
+# tests/test_action_executor.py
+# Background actions: ordering, progress, "stop" mid-action
+
+import threading
+import time
+
+from brain.action_executor import ActionExecutor
+from brain.action_registry import ActionHandler, register
+from brain.keyboard_brain import KeyboardBrain
+from brain.state import State
+
+typed = []
+started = threading.Event()
+
+
+@register
+class SlowType(ActionHandler):
+    intent_id = "TEST_SLOW_TYPE"
+    background = True
+
+    def run(self, brain, params):
+        text = params["text"]
+        for i, ch in enumerate(text):
+            if brain.should_stop():
+                return
+            started.set()
+            typed.append(ch)
+            brain.report_progress(i + 1, len(text))
+            time.sleep(0.01)
+        return "typed " + text
+
+
+def _executor():
+    typed.clear()
+    started.clear()
+    brain = KeyboardBrain(State(debug=False), {"debug": {"print_execution": False}}, {"virtual_keys": {}})
+    return brain, ActionExecutor(brain, debug=False)
+
+
+def _wait_idle(executor, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while executor.busy() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_background_action_does_not_block_and_keeps_order():
+    brain, executor = _executor()
+
+    t0 = time.monotonic()
+    assert executor.run({"intent_id": "TEST_SLOW_TYPE", "params": {"text": "abc"}}) is None
+    assert executor.run({"intent_id": "TEST_SLOW_TYPE", "params": {"text": "de"}}) is None
+    assert time.monotonic() - t0 < 0.02
+
+    _wait_idle(executor)
+    events = executor.poll()
+
+    assert "".join(typed) == "abcde"
+    assert [e.result for e in events] == ["typed abc", "typed de"]
+    executor.shutdown()
+
+
+def test_inline_action_runs_immediately():
+    brain, executor = _executor()
+
+    executor.run({"intent_id": "MODE_SWITCH", "params": {"mode": "DICTATION"}})
+
+    assert brain.state.mode == "DICTATION"
+    assert not executor.busy()
+    executor.shutdown()
+
+
+def test_cancel_stops_running_and_drops_queued():
+    brain, executor = _executor()
+
+    executor.run({"intent_id": "TEST_SLOW_TYPE", "params": {"text": "x" * 200}})
+    executor.run({"intent_id": "TEST_SLOW_TYPE", "params": {"text": "never"}})
+    started.wait(1.0)
+    time.sleep(0.03)
+
+    intent_id, done, total = executor.progress()
+    assert intent_id == "TEST_SLOW_TYPE" and 0 < done < total == 200
+
+    assert executor.cancel() == 2
+    _wait_idle(executor)
+
+    events = executor.poll()
+    assert len(events) == 1 and events[0].cancelled
+    assert len(typed) < 200 and "n" not in typed
+    executor.shutdown()
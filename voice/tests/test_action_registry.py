@@ -0,0 +1,73 @@
+# tests/test_action_registry.py
+# Table-driven dispatch: plug-in handlers, lazy OS imports, timing counters
+
+import subprocess
+import sys
+
+import pytest
+
+from brain.action_registry import ActionHandler, register, get_handler
+from brain.keyboard_brain import KeyboardBrain
+from brain.state import State
+
+
+def _brain():
+    settings = {"debug": {"print_execution": False}}
+    return KeyboardBrain(State(debug=False), settings, {"virtual_keys": {"UP": 38}})
+
+
+def test_platform_modules_not_imported_at_startup():
+    # fresh interpreter: other tests import these modules on purpose
+    code = (
+        "import sys; import brain.keyboard_brain; "
+        "print('os_actions.keyboard_utils' in sys.modules, 'utils.tts' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+
+def test_new_action_plugs_in_and_is_timed():
+    @register
+    class Echo(ActionHandler):
+        intent_id = "TEST_ECHO"
+
+        def run(self, brain, params):
+            self.need("json")
+            return "echo " + params["word"]
+
+    brain = _brain()
+
+    assert brain.execute({"intent_id": "TEST_ECHO", "params": {"word": "hi"}}) == "echo hi"
+    assert brain.state.last_intent == "TEST_ECHO"
+    assert brain.stats()["TEST_ECHO"]["calls"] == 1
+    assert get_handler("TEST_ECHO").errors == 0
+
+
+def test_handler_errors_are_counted():
+    @register
+    class Boom(ActionHandler):
+        intent_id = "TEST_BOOM"
+
+        def run(self, brain, params):
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        _brain().execute({"intent_id": "TEST_BOOM"})
+
+    assert get_handler("TEST_BOOM").summary()["errors"] == 1
+
+
+def test_unknown_intent_is_ignored():
+    assert _brain().execute({"intent_id": "NOPE"}) is None
+
+
+def test_search_web_opens_browser(monkeypatch):
+    import os_actions.os_actions as os_actions
+    opened = []
+    monkeypatch.setattr(os_actions, "open_website", opened.append)
+
+    brain = _brain()
+    brain.execute({"intent_id": "SEARCH_WEB", "params": {"query": "cats and dogs"}})
+
+    assert opened == ["https://www.google.com/search?q=cats+and+dogs"]
+    assert brain.state.active_app == "browser"
@@ -0,0 +1,74 @@
+# tests/test_ai_budget.py
+# AI call budget: rate limits, persisted day counter, request coalescing
+
+import threading
+import time
+
+import pytest
+
+from ai.budget import AIBudget, BudgetExhausted
+
+
+class _Clock:
+    def __init__(self):
+        self.now = time.mktime((2026, 1, 1, 12, 0, 0, 0, 0, -1))
+
+    def __call__(self):
+        return self.now
+
+
+def test_minute_bucket_refills():
+    clock = _Clock()
+    budget = AIBudget(max_calls_per_minute=2, max_calls_per_day=100, clock=clock, debug=False)
+
+    budget.call("a", lambda: 1)
+    budget.call("b", lambda: 2)
+    with pytest.raises(BudgetExhausted):
+        budget.call("c", lambda: 3)
+
+    clock.now += 30  # one token back (2 per minute)
+    assert budget.call("c", lambda: 3) == 3
+
+
+def test_day_cap_survives_restart(tmp_path):
+    clock = _Clock()
+    path = tmp_path / "budget.json"
+
+    budget = AIBudget(max_calls_per_minute=60, max_calls_per_day=2, state_path=path, clock=clock, debug=False)
+    budget.call("a", lambda: 1)
+    budget.call("b", lambda: 1)
+
+    restarted = AIBudget(max_calls_per_minute=60, max_calls_per_day=2, state_path=path, clock=clock, debug=False)
+    with pytest.raises(BudgetExhausted):
+        restarted.call("c", lambda: 1)
+
+    clock.now += 24 * 3600  # new day
+    assert restarted.call("c", lambda: 1) == 1
+
+
+def test_identical_requests_coalesce_into_one_call():
+    budget = AIBudget(max_calls_per_minute=1, max_calls_per_day=10, debug=False)
+    release = threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        release.wait()
+        return "intent"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(budget.call("same", slow_call)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    # one paid call, even though the minute bucket only had a single token
+    assert calls == [1]
+    assert results == ["intent"] * 5
+    assert budget.coalesced == 4
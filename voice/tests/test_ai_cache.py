@@ -0,0 +1,88 @@
+# tests/test_ai_cache.py
+# Persistent LRU/TTL cache for AI-routed intents
+
+from intent import ai_router
+from intent.ai_cache import AIRouteCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _intent(intent_id="OPEN_APP"):
+    return {"intent_id": intent_id, "params": {}, "confidence": 0.9, "source": "AI"}
+
+
+def test_ttl_negative_ttl_and_persistence(tmp_path):
+    clock = _Clock()
+    path = tmp_path / "cache.json"
+    cache = AIRouteCache(path, ttl_sec=100, negative_ttl_sec=10, clock=clock, debug=False)
+
+    cache.put("good", _intent())
+    cache.put("bad", _intent("UNKNOWN"), negative=True)
+
+    clock.now += 50
+    assert cache.get("bad") is None          # negative entry expired
+    assert cache.get("good")["intent_id"] == "OPEN_APP"
+
+    # survives a restart
+    reloaded = AIRouteCache(path, ttl_sec=100, clock=clock, debug=False)
+    assert reloaded.get("good")["intent_id"] == "OPEN_APP"
+
+    clock.now += 60
+    assert reloaded.get("good") is None      # positive entry expired
+
+
+def test_lru_eviction(tmp_path):
+    cache = AIRouteCache(tmp_path / "cache.json", max_entries=2, debug=False)
+
+    cache.put("a", _intent())
+    cache.put("b", _intent())
+    cache.get("a")                           # a is now most recent
+    cache.put("c", _intent())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_ai_route_served_from_cache(tmp_path, monkeypatch):
+    cache = AIRouteCache(tmp_path / "cache.json", debug=False)
+    calls = []
+
+    def fake_post_json(provider, url, headers, payload, timeout):
+        calls.append(payload)
+        return [{"generated_text": '{"intent_id": "OPEN_APP", "params": {"app_name": "notepad"}, "confidence": 0.9}'}]
+
+    monkeypatch.setenv("HUGGINGFACE_API_KEY", "test")
+    monkeypatch.setattr(ai_router, "get_cache", lambda: cache)
+    monkeypatch.setattr(ai_router, "post_json", fake_post_json)
+
+    first = ai_router.ai_route("start notepad")
+    second = ai_router.ai_route("start notepad")
+
+    assert first == second
+    assert second["params"]["app_name"] == "notepad"
+    assert len(calls) == 1
+    assert cache.hits == 1
+
+
+def test_malformed_confidence_degrades_to_cached_unknown(tmp_path, monkeypatch):
+    cache = AIRouteCache(tmp_path / "cache.json", debug=False)
+
+    def fake_post_json(provider, url, headers, payload, timeout):
+        return [{"generated_text": '{"intent_id": "OPEN_APP", "params": {}, "confidence": "high"}'}]
+
+    monkeypatch.setenv("HUGGINGFACE_API_KEY", "test")
+    monkeypatch.setattr(ai_router, "get_cache", lambda: cache)
+    monkeypatch.setattr(ai_router, "post_json", fake_post_json)
+
+    intent = ai_router.ai_route("start notepad")
+
+    assert intent["intent_id"] == "UNKNOWN"
+    assert ai_router.ai_route("start notepad") == intent
+    assert cache.hits == 1
@@ -0,0 +1,50 @@
+# tests/test_ai_tasks.py
+# Non-blocking AI calls: events, in-flight bound, cancellation
+
+import threading
+import time
+
+from ai.ai_tasks import AITaskRunner
+
+
+def _wait_for_events(runner, count, timeout=2.0):
+    events = []
+    deadline = time.monotonic() + timeout
+    while len(events) < count and time.monotonic() < deadline:
+        events += runner.poll()
+        time.sleep(0.01)
+    return events
+
+
+def test_result_delivered_as_event():
+    runner = AITaskRunner(max_in_flight=2, debug=False)
+
+    task_id = runner.submit("route", lambda text: {"intent_id": "OPEN_APP", "text": text}, "x",
+                            context={"normalized": "x"})
+    events = _wait_for_events(runner, 1)
+
+    assert len(events) == 1
+    assert events[0].task_id == task_id
+    assert events[0].kind == "route"
+    assert events[0].result["text"] == "x"
+    assert events[0].context == {"normalized": "x"}
+    runner.shutdown()
+
+
+def test_in_flight_bound_and_cancel_drops_stale_result():
+    runner = AITaskRunner(max_in_flight=1, debug=False)
+    release = threading.Event()
+
+    assert runner.submit("route", release.wait) is not None
+    # one call already in flight → second is refused, loop never queues up
+    assert runner.submit("route", release.wait) is None
+
+    assert runner.cancel("route") == 1
+    release.set()
+    time.sleep(0.1)
+
+    assert runner.poll() == []
+    # abandoned call finished → capacity is back
+    assert runner.submit("rewrite", lambda: "ok") is not None
+    assert _wait_for_events(runner, 1)[0].result == "ok"
+    runner.shutdown()
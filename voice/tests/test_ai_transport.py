@@ -0,0 +1,125 @@
+# tests/test_ai_transport.py
+# Shared AI transport against a local stub server (no real providers)
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai.transport import AITransport, CircuitOpenError
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        server.requests += 1
+        server.client_ports.add(self.client_address[1])
+
+        status = server.statuses.pop(0) if server.statuses else 200
+        if server.events is not None:
+            content_type = "text/event-stream"    # no charset, like the providers send it
+            body = "".join(f"data: {event}\n\n" for event in server.events + ["[DONE]"]).encode("utf-8")
+        else:
+            content_type = "application/json"
+            body = json.dumps([{"generated_text": '{"intent_id": "OPEN_APP"}'}]).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.requests = 0
+    server.client_ports = set()
+    server.statuses = []
+    server.events = None      # SSE data lines instead of a JSON body
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server, f"http://127.0.0.1:{server.server_port}/models/test"
+
+    server.shutdown()
+    server.server_close()
+
+
+def _transport(**config):
+    return AITransport({"backoff_base_sec": 0.001, "backoff_max_sec": 0.002, **config}, debug=False)
+
+
+def test_connections_are_reused(stub):
+    server, url = stub
+    transport = _transport()
+
+    for _ in range(5):
+        data = transport.post_json("huggingface", url, {}, {"inputs": "x"}, timeout=5)
+        assert data[0]["generated_text"]
+
+    assert server.requests == 5
+    assert len(server.client_ports) == 1
+    assert transport.stats()["huggingface"]["calls"] == 5
+
+
+def test_retries_transient_errors(stub):
+    server, url = stub
+    server.statuses = [503, 502]
+    transport = _transport(retries=2)
+
+    transport.post_json("huggingface", url, {}, {}, timeout=5)
+
+    assert server.requests == 3
+    assert transport.stats()["huggingface"]["retries"] == 2
+
+
+def test_breaker_opens_and_fails_fast(stub):
+    server, url = stub
+    server.statuses = [503] * 10
+    transport = _transport(retries=0, breaker_failures=2, breaker_reset_sec=60)
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            transport.post_json("groq", url, {}, {}, timeout=5)
+
+    with pytest.raises(CircuitOpenError):
+        transport.post_json("groq", url, {}, {}, timeout=5)
+
+    # the open breaker never reached the server
+    assert server.requests == 2
+    assert transport.stats()["groq"]["short_circuited"] == 1
+
+
+def test_other_request_errors_release_half_open_trial():
+    import requests
+
+    class _Session:
+        def post(self, *args, **kwargs):
+            raise requests.TooManyRedirects("redirect loop")
+
+    transport = _transport(retries=0, breaker_failures=1, breaker_reset_sec=0)
+    transport._session = lambda provider, url: _Session()
+
+    # closed → open, then two HALF_OPEN trials that both fail
+    for _ in range(3):
+        with pytest.raises(requests.TooManyRedirects):
+            transport.post_json("groq", "http://127.0.0.1:1/x", {}, {}, timeout=5)
+
+    assert transport.stats()["groq"]["failures"] == 3
+
+
+def test_stream_is_decoded_as_utf8(stub):
+    server, url = stub
+    server.events = ['{"token": {"text": "café"}}', '{"token": {"text": "→ ✓"}}']
+
+    data = list(_transport().stream_sse("huggingface", url, {}, {"inputs": "x"}, timeout=5))
+
+    assert [json.loads(d)["token"]["text"] for d in data] == ["café", "→ ✓"]
@@ -0,0 +1,101 @@
+# tests/test_app_index.py
+# Launcher index: PATH + .desktop scan, spoken-name lookup, no-shell launch
+
+import stat
+import sys
+
+import pytest
+
+from os_actions.app_index import AppIndex, scan_path, scan_desktop_entries
+
+
+def _executable(folder, name):
+    path = folder / name
+    path.write_text("#!/bin/sh\nexit 0\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def _desktop(folder, stem, name, exec_line, extra=""):
+    (folder / f"{stem}.desktop").write_text(
+        f"[Desktop Entry]\nType=Application\nName={name}\nExec={exec_line}\n{extra}"
+        "[Desktop Action new]\nName=Other\nExec=ignored\n"
+    )
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX exec bits")
+def test_scan_path_and_desktop_entries(tmp_path):
+    bin_dir = tmp_path / "bin"
+    apps = tmp_path / "applications"
+    bin_dir.mkdir()
+    apps.mkdir()
+
+    notepad = _executable(bin_dir, "notepad")
+    (bin_dir / "readme.txt").write_text("not executable")
+    _desktop(apps, "google-chrome", "Google Chrome", "/opt/google/chrome/chrome %U")
+    _desktop(apps, "hidden", "Hidden Thing", "hidden", extra="NoDisplay=true\n")
+
+    path_entries = scan_path(str(bin_dir))
+    desktop_entries = scan_desktop_entries([apps])
+
+    assert path_entries == {"notepad": {"argv": [notepad], "source": "path"}}
+    assert desktop_entries["google chrome"]["argv"] == ["/opt/google/chrome/chrome"]
+    assert "google chrome" in desktop_entries and "hidden thing" not in desktop_entries
+
+
+def _index(tmp_path, **kwargs):
+    launched = []
+    entries = {
+        "notepad": {"argv": ["/usr/bin/notepad"], "source": "path"},
+        "google chrome": {"argv": ["/opt/chrome"], "source": "desktop"},
+        "visual studio code": {"argv": ["/usr/bin/code"], "source": "desktop"},
+    }
+    index = AppIndex(
+        cache_path=tmp_path / "apps.json",
+        builder=lambda: dict(entries),
+        launcher=launched.append,
+        debug=False,
+        **kwargs
+    )
+    index.refresh()
+    return index, launched
+
+
+def test_spoken_names_resolve(tmp_path):
+    index, _ = _index(tmp_path, aliases={"code": "visual studio code"})
+
+    assert index.resolve("Notepad")[0] == "notepad"
+    assert index.resolve("note pad")[0] == "notepad"
+    assert index.resolve("chrome")[0] == "google chrome"
+    assert index.resolve("code")[0] == "visual studio code"
+    assert index.resolve("notpad")[0] == "notepad"
+    assert index.resolve("definitely not an app xyz") is None
+
+
+def test_launch_records_latency_and_failures(tmp_path):
+    index, launched = _index(tmp_path)
+
+    assert index.launch("chrome")
+    assert launched == [{"argv": ["/opt/chrome"], "source": "desktop"}]
+
+    index.launcher = lambda entry: (_ for _ in ()).throw(OSError("gone"))
+    assert not index.launch("notepad")
+
+    stats = index.stats()
+    assert stats["google chrome"]["launches"] == 1
+    assert stats["notepad"]["failures"] == 1
+
+
+def test_index_is_cached_on_disk(tmp_path):
+    _index(tmp_path)
+
+    reloaded = AppIndex(cache_path=tmp_path / "apps.json", builder=dict, debug=False)
+
+    assert "notepad" in reloaded.entries
+    assert not reloaded.is_stale()
+    assert reloaded.refresh_in_background() is None
+
+
+def test_real_spawn_without_shell(tmp_path):
+    # the default launcher execs argv directly
+    AppIndex._spawn({"argv": [sys.executable, "-c", "pass"], "source": "path"})
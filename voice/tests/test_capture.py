@@ -0,0 +1,74 @@
+# tests/test_capture.py
+# Which phrases go through the keyword gate / speculative routing (no mic, no network)
+
+import math
+import struct
+import wave
+
+from brain.pending_plan import PendingPlan
+from brain.state import State
+from speech.backends import WavReplaySource, TranscriptRecognizer
+from speech.capture import capture, expects_command
+from speech.stt import SpeechToText
+
+RATE = 16000
+
+
+class RejectingGate:
+    def __init__(self):
+        self.calls = 0
+
+    def accepts(self, audio) -> bool:
+        self.calls += 1
+        return False
+
+
+def _write_phrase(path):
+    samples = [0] * int(0.3 * RATE)
+    samples += [int(8000 * math.sin(2 * math.pi * 440 * i / RATE)) for i in range(int(0.6 * RATE))]
+    samples += [0] * int(0.3 * RATE)
+
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+def _stt(tmp_path, names, **kwargs):
+    for name in names:
+        _write_phrase(tmp_path / f"{name}.wav")
+    source = WavReplaySource(tmp_path)
+    return SpeechToText(
+        source=source,
+        backend=TranscriptRecognizer(source),
+        calibrate=False,
+        debug=False,
+        **kwargs
+    )
+
+
+def test_dictation_phrase_skips_the_keyword_gate(tmp_path):
+    gate = RejectingGate()
+    stt = _stt(tmp_path, ["01_dear_team", "02_scroll_down"], keyword_gate=gate)
+    state = State(default_mode="DICTATION", debug=False)
+
+    assert capture(stt, expects_command(state, PendingPlan())) == ("01 dear team", None)
+    assert gate.calls == 0
+
+    state.set_mode("COMMAND")
+    assert capture(stt, expects_command(state, PendingPlan())) == (None, None)
+    assert gate.calls == 1
+
+
+def test_follow_ups_and_plan_replies_are_not_commands():
+    state = State(default_mode="COMMAND", debug=False)
+    plan = PendingPlan()
+    assert expects_command(state, plan)
+
+    state.set_awaiting("query")
+    assert not expects_command(state, plan)
+
+    state.clear_awaiting()
+    plan.set({"main.py": "print('hi')"})
+    assert not expects_command(state, plan)
@@ -0,0 +1,118 @@
+# tests/test_clipboard_paste.py
+# Paste fast path for long text: clipboard in, CTRL+V, clipboard restored
+
+import pytest
+
+from os_actions import keyboard_utils
+from os_actions.clipboard import ClipboardBackend, MemoryClipboard, WindowsClipboard, set_clipboard
+from os_actions.key_backends import RecordingBackend, set_backend, KEYEVENTF_KEYUP
+
+
+class BrokenClipboard(ClipboardBackend):
+    def get(self):
+        raise OSError("Clipboard busy")
+
+    def set(self, text):
+        raise OSError("Clipboard busy")
+
+
+class SpyClipboard(MemoryClipboard):
+    """Remembers what was on the clipboard when each key batch went out."""
+
+    def __init__(self, text, keys):
+        super().__init__(text)
+        self.keys = keys
+        self.seen_at_paste = None
+
+    def set(self, text):
+        if self.keys.events and self.seen_at_paste is None:
+            self.seen_at_paste = self.text
+        super().set(text)
+
+
+@pytest.fixture
+def keys():
+    backend = RecordingBackend()
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+    set_clipboard(None)
+
+
+def _downs(backend):
+    return [e.vk for e in backend.events if not e.flags & KEYEVENTF_KEYUP]
+
+
+def test_long_text_is_pasted_and_clipboard_restored(keys):
+    clipboard = SpyClipboard("user's clipboard", keys)
+    set_clipboard(clipboard)
+    code = "print('x')\n" * 50
+
+    sent = keyboard_utils.output_text(code, paste_threshold=200, restore_delay=0, debug=False)
+
+    assert sent == len(code)
+    assert _downs(keys) == [0x11, ord("V")]      # one CTRL+V, no typing
+    assert clipboard.seen_at_paste == code
+    assert clipboard.get() == "user's clipboard"
+
+
+def test_short_text_is_typed(keys):
+    clipboard = MemoryClipboard("keep")
+    set_clipboard(clipboard)
+
+    keyboard_utils.output_text("hi there", paste_threshold=200, delay=0, debug=False)
+
+    assert keys.text() == "hi there"
+    assert clipboard.writes == 0
+
+
+def test_clipboard_failure_falls_back_to_typing(keys):
+    set_clipboard(BrokenClipboard())
+
+    keyboard_utils.output_text("y" * 300, paste_threshold=200, delay=0, debug=False)
+
+    assert keys.text() == "y" * 300
+
+
+class FakeWin32:
+    """user32 + kernel32 + ctypes stand-in recording the calls WindowsClipboard.set makes."""
+
+    def __init__(self, open_ok=True, set_ok=True):
+        self.open_ok = open_ok
+        self.set_ok = set_ok
+        self.calls = []
+
+    def __getattr__(self, name):
+        results = {"OpenClipboard": self.open_ok, "SetClipboardData": self.set_ok,
+                   "GlobalAlloc": 0x1000, "GlobalLock": 0x2000}
+        return lambda *args: self.calls.append(name) or results.get(name)
+
+
+def _windows_clipboard(win32):
+    clipboard = WindowsClipboard.__new__(WindowsClipboard)   # no ctypes.windll off Windows
+    clipboard.user32 = clipboard.kernel32 = clipboard.ctypes = win32
+    clipboard.open_retries = 2
+    return clipboard
+
+
+def test_busy_clipboard_allocates_nothing():
+    win32 = FakeWin32(open_ok=False)
+
+    with pytest.raises(OSError):
+        _windows_clipboard(win32).set("text")
+
+    assert "GlobalAlloc" not in win32.calls
+
+
+def test_rejected_clipboard_data_is_freed():
+    win32 = FakeWin32(set_ok=False)
+
+    with pytest.raises(OSError):
+        _windows_clipboard(win32).set("text")
+
+    assert win32.calls[-2:] == ["GlobalFree", "CloseClipboard"]
+
+    # accepted → the clipboard owns the memory now
+    win32 = FakeWin32()
+    _windows_clipboard(win32).set("text")
+    assert "GlobalFree" not in win32.calls
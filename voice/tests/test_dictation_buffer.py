@@ -0,0 +1,76 @@
+# tests/test_dictation_buffer.py
+# Segment-backed dictation buffer: append, undo, sentence replace, diff view
+
+from brain.dictation_buffer import DictationBuffer
+
+
+def test_append_get_and_length():
+    buf = DictationBuffer()
+    buf.append("hello world.")
+    buf.append("  second line  ")
+    buf.append("   ")
+
+    assert buf.get() == "hello world. second line"
+    assert len(buf) == len(buf.get())
+    assert not buf.is_empty()
+
+
+def test_undo_only_drops_appends():
+    buf = DictationBuffer()
+    buf.append("one")
+    buf.append("two")
+    buf.append("three")
+
+    assert buf.undo(2) == 2
+    assert buf.get() == "one"
+
+    buf.replace("rewritten")
+    buf.append("four")
+    assert buf.undo(5) == 1  # the AI rewrite itself is not an append
+    assert buf.get() == "rewritten"
+    assert len(buf) == len("rewritten")
+
+
+def test_replace_sentence():
+    buf = DictationBuffer()
+    buf.append("First one. Second one.")
+    buf.append("Third one.")
+
+    assert buf.replace_sentence(1, "Changed.")
+    assert buf.get() == "First one. Changed. Third one."
+
+    assert buf.replace_sentence(-1, "Last.")
+    assert buf.get() == "First one. Changed. Last."
+    assert len(buf) == len(buf.get())
+
+    assert not buf.replace_sentence(3, "nope")
+
+
+def test_diff_renders_only_new_text():
+    buf = DictationBuffer(tail_chars=12)
+    assert buf.take_diff() == ("none", "")
+
+    buf.append("hello")
+    assert buf.take_diff() == ("append", "hello")
+
+    buf.append("there")
+    buf.append("friend")
+    assert buf.take_diff() == ("append", "there friend")
+    assert buf.take_diff() == ("none", "")
+
+    buf.undo()
+    kind, text = buf.take_diff()
+    assert kind == "rewrite"
+    assert text == "hello there"
+
+    buf.replace("a much longer rewritten text")
+    assert buf.take_diff() == ("rewrite", "…written text")
+
+
+def test_version_tracks_changes():
+    buf = DictationBuffer()
+    v = buf.version
+    buf.get()
+    assert buf.version == v
+    buf.append("x")
+    assert buf.version != v
@@ -0,0 +1,118 @@
+# tests/test_dictation_improver.py
+# Chunked "make this better": splitting, parallel calls, only changed chunks re-sent
+
+import threading
+import time
+
+from ai.ai_tasks import AITaskRunner
+from ai.budget import AIBudget
+from ai.dictation_improver import DictationImprover, split_chunks
+
+
+class FakeAI:
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.sent = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, text, settings):
+        with self.lock:
+            self.sent.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+
+        if self.fail_on and self.fail_on in text:
+            return None
+        return {"type": "IMPROVE_TEXT", "confidence": 0.9, "result": {"text": text.upper()}}
+
+
+def _unlimited():
+    return AIBudget(max_calls_per_minute=1000, max_calls_per_day=1000, debug=False)
+
+
+def test_split_keeps_paragraphs_and_groups_sentences():
+    text = "One. Two. Three.\n\nFour."
+    assert split_chunks(text, max_chars=10) == ["One. Two.", "Three.", "Four."]
+    assert split_chunks(text, max_chars=400) == ["One. Two. Three.", "Four."]
+
+
+def test_chunks_run_in_parallel():
+    ai = FakeAI(delay=0.1)
+    improver = DictationImprover({}, max_workers=3, chunk_chars=5, improve_fn=ai, budget=_unlimited(), debug=False)
+
+    started = time.monotonic()
+    proposal = improver.improve("aaa. bbb. ccc.")
+    elapsed = time.monotonic() - started
+
+    assert proposal["result"]["text"] == "AAA. BBB. CCC."
+    assert proposal["confidence"] == 0.9
+    assert ai.max_active == 3
+    assert elapsed < 0.25
+
+
+def test_only_new_chunks_are_resent():
+    ai = FakeAI()
+    improver = DictationImprover({}, chunk_chars=5, improve_fn=ai, budget=_unlimited(), debug=False)
+
+    improver.improve("aaa. bbb.")
+    first = improver.improve("AAA. BBB. ccc.")  # user applied the rewrite, then kept dictating
+
+    assert sorted(ai.sent) == ["aaa.", "bbb.", "ccc."]
+    assert first["result"]["text"] == "AAA. BBB. CCC."
+
+
+def test_failed_chunk_keeps_original_text():
+    ai = FakeAI(fail_on="bad")
+    improver = DictationImprover({}, chunk_chars=5, improve_fn=ai, budget=_unlimited(), debug=False)
+    previews = []
+
+    proposal = improver.improve("good.\n\nbad.", on_chunk=lambda i, t: previews.append((i, t)))
+
+    assert proposal["result"]["text"] == "GOOD.\n\nbad."
+    assert previews == [(0, "GOOD.")]
+
+
+def test_nothing_improved_returns_none():
+    improver = DictationImprover({}, improve_fn=FakeAI(fail_on="x"), budget=_unlimited(), debug=False)
+    assert improver.improve("x") is None
+    assert improver.improve("") is None
+
+
+def test_fan_out_is_capped_by_budget_with_reserve():
+    ai = FakeAI()
+    budget = AIBudget(max_calls_per_minute=3, max_calls_per_day=50, debug=False)
+    improver = DictationImprover({}, chunk_chars=5, reserve_calls=1, improve_fn=ai, budget=budget, debug=False)
+
+    proposal = improver.improve("aaa. bbb. ccc. ddd.")
+
+    # 3 tokens, 1 kept for routing → 2 chunks sent, the rest stay as dictated
+    assert sorted(ai.sent) == ["aaa.", "bbb."]
+    assert proposal["result"]["text"] == "AAA. BBB. ccc. ddd."
+
+
+def test_fan_out_counts_against_the_task_runner():
+    ai = FakeAI(delay=0.1)
+    runner = AITaskRunner(max_in_flight=2, debug=False)
+    improver = DictationImprover({}, max_workers=3, chunk_chars=5, improve_fn=ai, budget=_unlimited(),
+                                 runner=runner, debug=False)
+
+    assert runner.submit("rewrite", improver.improve, "aaa. bbb. ccc. ddd.") is not None
+    time.sleep(0.05)
+    # its own slot + one extra chunk call → the runner is full
+    assert runner.submit("route", lambda: None) is None
+
+    deadline = time.monotonic() + 2.0
+    events = []
+    while not events and time.monotonic() < deadline:
+        events = runner.poll()
+        time.sleep(0.01)
+    runner.shutdown()
+
+    assert events[0].result["result"]["text"] == "AAA. BBB. CCC. DDD."
+    assert ai.max_active == 2
@@ -0,0 +1,81 @@
+# tests/test_key_backends.py
+# Batched keystroke injection through the recording backend (no Windows needed)
+
+import pytest
+
+from os_actions import keyboard_utils
+from os_actions.key_backends import (
+    RecordingBackend, NullBackend, set_backend, text_events, combo_events, held_keys,
+    KeyEvent, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE
+)
+
+
+@pytest.fixture
+def recorder():
+    backend = RecordingBackend()
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+
+
+def test_text_round_trips_including_non_ascii(recorder):
+    text = "Hello, wörld!\n\tif x: return {'a': 1} 🙂"
+    assert keyboard_utils.type_text(text, delay=0, debug=False) == len(text)
+    assert recorder.text() == text
+
+
+def test_emoji_is_a_surrogate_pair():
+    events = text_events("🙂")
+    assert len(events) == 4
+    assert all(e.flags & KEYEVENTF_UNICODE for e in events)
+
+
+def test_combo_is_one_batch(recorder):
+    keyboard_utils.press_combo(["ctrl", "shift", "S"], debug=False)
+
+    assert recorder.batches == 1
+    downs = [e.vk for e in recorder.events if not e.flags & KEYEVENTF_KEYUP]
+    ups = [e.vk for e in recorder.events if e.flags & KEYEVENTF_KEYUP]
+    assert downs == [0x11, 0x10, ord("S")]
+    assert ups == list(reversed(downs))
+
+
+def test_text_is_batched_and_stoppable(recorder):
+    progress = []
+    calls = iter([False, False, True])
+
+    typed = keyboard_utils.type_text(
+        "x" * 100, delay=0, debug=False,
+        should_stop=lambda: next(calls), on_progress=lambda d, t: progress.append(d)
+    )
+
+    assert typed == 2 * keyboard_utils.TEXT_BATCH_CHARS
+    assert recorder.batches == 2
+    assert progress == [32, 64]
+
+
+def test_press_repeat(recorder):
+    assert keyboard_utils.press_repeat("DOWN", 40, debug=False) == 40
+    assert len(recorder.events) == 80
+    assert recorder.batches == 2
+
+
+def test_keys_held_by_a_partial_batch_are_released():
+    ctrl, shift, a = 0x11, 0x10, 0x41
+    events = combo_events([ctrl, shift, a])
+
+    # SendInput stopped after the three downs and the 'a' up
+    assert held_keys(events[:4]) == [KeyEvent(shift, 0, KEYEVENTF_KEYUP), KeyEvent(ctrl, 0, KEYEVENTF_KEYUP)]
+    assert held_keys(events) == []
+
+    unicode_down = text_events("x")[:1]
+    assert held_keys(unicode_down) == [KeyEvent(0, ord("x"), KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)]
+
+
+def test_null_backend_keeps_nothing():
+    backend = NullBackend()
+    for _ in range(100):
+        backend.send(text_events("hello"))
+
+    assert backend.sent == 1000
+    assert not hasattr(backend, "events")
@@ -0,0 +1,77 @@
+# tests/test_keyword_spotter.py
+# Offline keyword gate tests against generated WAV fixtures
+
+import wave
+
+import numpy as np
+import pytest
+
+from speech.keyword_spotter import KeywordSpotter, KeywordGate, read_wav
+
+RATE = 16000
+
+
+def _chirp(f0, f1, dur, seed=0):
+    t = np.arange(int(dur * RATE)) / RATE
+    phase = 2 * np.pi * np.cumsum(np.linspace(f0, f1, len(t))) / RATE
+    noise = 0.01 * np.random.default_rng(seed).standard_normal(len(t))
+    return (0.5 * np.sin(phase) + 0.25 * np.sin(2 * phase) + noise) * np.hanning(len(t))
+
+
+def _silence(dur, seed=1):
+    return 0.005 * np.random.default_rng(seed).standard_normal(int(dur * RATE))
+
+
+def _write_wav(path, samples):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(pcm.tobytes())
+
+
+def _spotter(tmp_path):
+    _write_wav(tmp_path / "templates" / "hey_computer" / "take1.wav", _chirp(300, 1500, 0.5))
+    return KeywordSpotter.from_directory(tmp_path / "templates", threshold=25.0)
+
+
+def test_keyword_inside_phrase_is_detected(tmp_path):
+    spotter = _spotter(tmp_path)
+
+    # slightly different "speaker", followed by other speech
+    phrase = np.concatenate([
+        _silence(0.3),
+        _chirp(320, 1450, 0.55, seed=5),
+        _silence(0.2),
+        _chirp(1500, 300, 0.5, seed=3),
+        _silence(0.3),
+    ])
+    _write_wav(tmp_path / "phrase.wav", phrase)
+
+    samples, rate = read_wav(tmp_path / "phrase.wav")
+
+    assert spotter.detect(samples, rate) == "hey computer"
+
+
+def test_background_chatter_is_rejected(tmp_path):
+    spotter = _spotter(tmp_path)
+
+    chatter = np.concatenate([_silence(0.3), _chirp(1500, 300, 0.5, seed=3), _silence(0.3)])
+    _write_wav(tmp_path / "chatter.wav", chatter)
+
+    samples, rate = read_wav(tmp_path / "chatter.wav")
+
+    assert spotter.detect(samples, rate) is None
+
+
+def test_gate_without_templates_is_refused(tmp_path):
+    (tmp_path / "templates").mkdir()
+    spotter = KeywordSpotter.from_directory(tmp_path / "templates", debug=False)
+
+    assert spotter.templates == {}
+    with pytest.raises(ValueError):
+        KeywordGate(spotter)
+    with pytest.raises(ValueError):
+        KeywordGate(KeywordSpotter.from_directory(tmp_path / "missing", debug=False))
@@ -0,0 +1,41 @@
+# tests/test_local_model.py
+# Offline intent classifier tier
+
+from intent import local_model
+from intent.local_model import LocalIntentModel, _label
+
+EXAMPLES = [
+    ("open notepad", _label("OPEN_APP", {"app_name": "notepad"})),
+    ("open calculator", _label("OPEN_APP", {"app_name": "calc"})),
+    ("open youtube", _label("OPEN_WEBSITE", {"url": "https://www.youtube.com"})),
+    ("scroll down", _label("NAVIGATION", {"direction": "DOWN", "count": 3})),
+]
+
+
+def test_save_load_and_route(tmp_path, monkeypatch):
+    path = tmp_path / "model.npz"
+    LocalIntentModel.train(EXAMPLES).save(path)
+
+    monkeypatch.setattr(local_model, "_model", None)
+    local_model.load_model(path, debug=False)
+
+    intent = local_model.local_route("start notepad", min_confidence=0.9)
+
+    print("[TEST] start notepad ->", intent)
+
+    assert intent["intent_id"] == "OPEN_APP"
+    assert intent["params"] == {"app_name": "notepad"}
+    assert intent["source"] == "LOCAL_MODEL"
+
+
+def test_abstains_on_unrelated_and_negated_text(monkeypatch):
+    monkeypatch.setattr(local_model, "_model", LocalIntentModel.train(EXAMPLES))
+
+    assert local_model.local_route("what is the weather", min_confidence=0.9) is None
+    assert local_model.local_route("close notepad", min_confidence=0.9) is None
+
+
+def test_no_model_means_no_tier(monkeypatch):
+    monkeypatch.setattr(local_model, "_model", None)
+
+    assert local_model.local_route("open notepad") is None
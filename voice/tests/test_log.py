@@ -0,0 +1,68 @@
+# tests/test_log.py
+# Leveled console logging: levels, per-subsystem overrides, lazy formatting
+
+import pytest
+
+from utils import log as logging_facade
+from utils.log import get_logger, configure
+
+
+class CountingArg:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+
+@pytest.fixture(autouse=True)
+def reset_levels():
+    yield
+    configure({})
+
+
+def test_levels_and_tags(capsys):
+    configure({"enabled": True, "log_level": "INFO"})
+    log = get_logger("test.tags", "TEST")
+
+    log.debug("hidden")
+    log.info("Loaded %d rules", 3)
+    log.error("Failed: %s", "boom")
+
+    assert capsys.readouterr().out.splitlines() == ["[TEST] Loaded 3 rules", "[TEST ERROR] Failed: boom"]
+
+
+def test_disabled_level_never_formats(capsys):
+    configure({"enabled": True, "log_level": "INFO"})
+    arg = CountingArg()
+
+    get_logger("test.lazy").debug("typing %s", arg)
+
+    assert arg.formatted == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_subsystem_overrides_apply_to_existing_loggers(capsys):
+    keyboard = get_logger("test.keyboard")
+    typing = get_logger("test.keyboard.typing")
+    other = get_logger("test.other")
+
+    configure({"enabled": True, "log_level": "DEBUG", "log_levels": {"test.keyboard": "WARNING"}})
+
+    assert not keyboard.is_enabled(logging_facade.INFO)
+    assert not typing.is_enabled(logging_facade.INFO)
+    assert other.is_enabled(logging_facade.DEBUG)
+
+
+def test_debug_disabled_keeps_only_warnings():
+    configure({"enabled": False, "log_level": "DEBUG"})
+    log = get_logger("test.quiet")
+
+    assert not log.is_enabled(logging_facade.INFO)
+    assert log.is_enabled(logging_facade.WARNING)
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValueError):
+        configure({"log_level": "LOUD"})
@@ -0,0 +1,69 @@
+# tests/test_memory.py
+# tracemalloc growth report, thread counts, RSS budget warning
+
+import threading
+
+import pytest
+
+from utils import memory
+from utils.memory import MemoryMonitor, thread_counts
+
+_leak = []
+
+
+def leaky_site():
+    _leak.append(bytearray(512 * 1024))
+
+
+@pytest.fixture
+def events(monkeypatch):
+    logged = []
+    monkeypatch.setattr(memory, "log_event", lambda kind, payload, debug=True: logged.append((kind, payload)))
+    return logged
+
+
+@pytest.fixture
+def monitor():
+    mon = MemoryMonitor(interval_sec=3600, rss_budget_mb=None)
+    mon.start()
+    yield mon
+    mon.stop()
+    _leak.clear()
+
+
+def test_growth_sites_are_reported(events, monitor):
+    for _ in range(4):
+        leaky_site()
+
+    payload = monitor.check()
+
+    assert events[0] == ("memory", payload)
+    top = payload["top_growth"][0]
+    assert top["site"].endswith(f"test_memory.py:{leaky_site.__code__.co_firstlineno + 1}")
+    assert top["size_diff_kb"] >= 2048
+    assert payload["traced_delta_kb"] >= 2048
+
+
+def test_thread_counts_group_numbered_names():
+    stop = threading.Event()
+    threads = [threading.Thread(target=stop.wait, name=f"stt-recognize-{i}") for i in range(3)]
+    for t in threads:
+        t.start()
+    try:
+        counts = thread_counts()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    assert counts["stt-recognize"] == 3
+
+
+def test_rss_budget_warns_once_per_crossing(events, monitor):
+    monitor.rss_budget = 1    # any process is over 1 byte
+
+    monitor.check()
+    monitor.check()
+
+    assert [kind for kind, _ in events].count("memory_budget") == 1
+    assert monitor.over_budget
@@ -0,0 +1,75 @@
+# tests/test_metrics.py
+# Counters + HDR-style histograms, Prometheus text export (file / localhost HTTP)
+
+import urllib.request
+
+from utils.metrics import Metrics, Histogram, HTTPExporter, percentile
+
+
+def test_histogram_quantiles_within_a_few_percent():
+    hist = Histogram()
+    for ms in range(1, 10001):
+        hist.record(ms / 1000)
+
+    assert abs(hist.quantile(0.5) - 5.0) / 5.0 < 0.04
+    assert abs(hist.quantile(0.99) - 9.9) / 9.9 < 0.04
+    assert hist.quantile(1.0) == hist.max == 10.0
+    assert hist.count == 10000
+
+
+def test_histogram_memory_is_bounded():
+    hist = Histogram()
+    for i in range(100000):
+        hist.record(0.2 + (i % 1000) / 10000)
+
+    assert len(hist._counts) < 50
+
+
+def test_prometheus_text():
+    metrics = Metrics()
+    metrics.counter("voice_intents_total", "Routed intents", source="RULES", outcome="accepted").inc(3)
+    metrics.histogram("voice_stage_seconds", "Stage latency", stage="rule_route").record(0.002)
+    metrics.collector(lambda: [("voice_route_cache_lookups_total", "counter", "Lookups", {"result": "hit"}, 7)])
+
+    text = metrics.render()
+
+    assert "# TYPE voice_intents_total counter" in text
+    assert 'voice_intents_total{outcome="accepted",source="RULES"} 3' in text
+    assert "# TYPE voice_stage_seconds summary" in text
+    assert 'voice_stage_seconds{quantile="0.99",stage="rule_route"}' in text
+    assert 'voice_stage_seconds_count{stage="rule_route"} 1' in text
+    assert 'voice_route_cache_lookups_total{result="hit"} 7' in text
+
+
+def test_trace_spans_feed_stage_histograms():
+    metrics = Metrics()
+    metrics.observe_trace({
+        "total_ms": 120.0,
+        "spans": [{"name": "recognition", "dur_ms": 100.0}, {"name": "execute", "dur_ms": 15.0}],
+    })
+
+    assert metrics.histogram("voice_stage_seconds", stage="recognition").count == 1
+    assert metrics.histogram("voice_utterance_seconds").count == 1
+
+
+def test_textfile_and_http_exports(tmp_path):
+    metrics = Metrics()
+    metrics.counter("voice_stt_timeouts_total", stage="listen").inc()
+
+    path = tmp_path / "metrics.prom"
+    metrics.write_textfile(path)
+    assert 'voice_stt_timeouts_total{stage="listen"} 1' in path.read_text(encoding="utf-8")
+
+    exporter = HTTPExporter(metrics, port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as resp:
+            body = resp.read().decode("utf-8")
+    finally:
+        exporter.stop()
+    assert 'voice_stt_timeouts_total{stage="listen"} 1' in body
+
+
+def test_percentile_of_sample_list():
+    assert percentile([], 50) == 0.0
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(range(1, 101), 99) == 99
@@ -0,0 +1,86 @@
+# tests/test_mock_provider.py
+# Local mock of the HF / Groq APIs driving the real AI paths
+
+import pytest
+
+import ai.ai_engine as ai_engine
+import ai.budget as ai_budget
+import ai.transport as ai_transport
+import intent.ai_cache as ai_cache
+import intent.ai_router as ai_router
+from ai import load_test
+from ai.budget import configure as configure_budget
+from ai.mock_provider import MockProvider
+from ai.transport import configure as configure_transport
+from intent.ai_cache import configure as configure_cache
+
+SETTINGS = {"enabled": True, "model": "mock", "api_key_env": "MOCK_AI_API_KEY", "timeout_sec": 5}
+
+
+@pytest.fixture
+def mock(monkeypatch):
+    providers = []
+
+    def start(**config):
+        server = MockProvider(config, debug=False).start()
+        providers.append(server)
+        monkeypatch.setattr(ai_router, "HF_API_URL", server.hf_url)
+        monkeypatch.setattr(ai_engine, "GROQ_ENDPOINT", server.groq_url)
+        return server
+
+    monkeypatch.setenv("HUGGINGFACE_API_KEY", "mock")
+    monkeypatch.setenv("MOCK_AI_API_KEY", "mock")
+    # shared singletons are put back by monkeypatch after the test
+    monkeypatch.setattr(ai_transport, "_transport", ai_transport._transport)
+    monkeypatch.setattr(ai_budget, "_budget", ai_budget._budget)
+    monkeypatch.setattr(ai_cache, "_cache", ai_cache._cache)
+    monkeypatch.setattr(ai_cache, "_enabled", ai_cache._enabled)
+    configure_transport({"retries": 1, "backoff_base_sec": 0.001, "backoff_max_sec": 0.002}, debug=False)
+    configure_budget({"max_calls_per_minute": 1000, "max_calls_per_day": 1000}, state_path=None, debug=False)
+    configure_cache({"enabled": False}, debug=False)
+
+    yield start
+
+    for server in providers:
+        server.stop()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_route_and_rewrite_shapes(mock, monkeypatch, stream):
+    server = mock()
+    monkeypatch.setattr(ai_router, "HF_STREAM", stream)
+
+    intent = ai_router.ai_route("open notepad")
+    proposal = ai_engine.ai_propose_improvement("hello there", {**SETTINGS, "stream": stream})
+
+    assert intent["intent_id"] == "OPEN_APP"
+    assert intent["params"] == {"app_name": "notepad"}
+    assert proposal["result"]["text"] == "Hello there."
+    assert server.stats()["requests"] == 2
+
+
+def test_malformed_json_is_rejected(mock):
+    mock(malformed_rate=1.0)
+
+    assert ai_router.ai_route("open notepad")["intent_id"] == "UNKNOWN"
+    assert ai_engine.ai_generate_code("make a script", SETTINGS) is None
+
+
+def test_errors_are_retried(mock):
+    server = mock(error_rate=1.0, error_statuses=[503])
+
+    assert ai_engine.ai_propose_improvement("hello", SETTINGS) is None
+    assert server.stats() == {"requests": 2, "error": 2, "malformed": 0, "hang": 0}
+
+
+def test_load_test_report():
+    before = (ai_transport._transport, ai_budget._budget, ai_cache._cache)
+    report = load_test.run(requests=12, concurrency=3, distinct=2, cache=True,
+                           transport={"backoff_base_sec": 0.001})
+
+    assert (ai_transport._transport, ai_budget._budget, ai_cache._cache) == before
+
+    assert report["requests"] == 12
+    assert set(report["paths"]) == {"route", "rewrite", "codegen"}
+    assert all(p["ok"] == p["count"] for p in report["paths"].values())
+    assert report["cache"]["hits"] + report["cache"]["misses"] == 4
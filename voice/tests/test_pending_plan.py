@@ -0,0 +1,26 @@
+# tests/test_pending_plan.py
+# Streamed codegen files only land in the plan they were started for
+
+from brain.pending_plan import PendingPlan
+
+
+def test_files_streamed_after_cancel_are_dropped():
+    plan = PendingPlan()
+    first = plan.clear()          # "create ..." → codegen task #1
+    assert plan.add_file("a.py", "print('a')", first)
+
+    plan.clear()                  # "cancel" while #1 still streams
+    assert not plan.add_file("b.py", "print('b')", first)
+
+    second = plan.clear()         # next "create ..."
+    assert plan.add_file("c.py", "print('c')", second)
+    assert plan.files == {"c.py": "print('c')"}
+
+
+def test_set_plan_is_not_changed_by_late_files():
+    plan = PendingPlan()
+    plan_id = plan.clear()
+    plan.set({"main.py": "print('hi')"})
+
+    assert not plan.add_file("late.py", "x = 1", plan_id)
+    assert plan.summary() == "main.py"
@@ -0,0 +1,97 @@
+# tests/test_phrase_cache.py
+# Phrase audio cache: pre-warm, play from disk, learn repeats, LRU eviction
+
+import os
+import time
+import wave
+
+from utils.phrase_cache import PhraseCache, CachedBackend, wav_duration
+from utils.tts import RecordingBackend
+
+
+class FakeSynthesizer:
+    def __init__(self, voice_id="fake|default|0"):
+        self.voice_id = voice_id
+        self.calls = []
+
+    def synthesize(self, text, path):
+        self.calls.append(text)
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0\0" * 80)       # 10ms
+
+
+class FakePlayer:
+    def __init__(self):
+        self.played = []
+
+    def play(self, path, should_stop):
+        self.played.append(path)
+        return True
+
+
+def _cache(tmp_path, **kwargs):
+    return PhraseCache(tmp_path / "tts", FakeSynthesizer(), debug=False, **kwargs)
+
+
+def test_prewarmed_phrase_plays_from_disk(tmp_path):
+    cache = _cache(tmp_path)
+    cache.prewarm(["Files created", "Plan cancelled"])
+    cache.wait_idle()
+
+    live, player = RecordingBackend(), FakePlayer()
+    backend = CachedBackend(live, cache, player)
+
+    assert backend.speak("Files created", lambda: False)
+    assert len(player.played) == 1 and live.spoken == []
+    assert wav_duration(player.played[0]) == 0.01
+
+    # already on disk → nothing re-rendered
+    cache.prewarm(["Files created"])
+    cache.wait_idle()
+    assert cache.synthesizer.calls == ["Files created", "Plan cancelled"]
+
+
+def test_novel_text_is_live_then_learned(tmp_path):
+    cache = _cache(tmp_path, learn_after=2)
+    live, player = RecordingBackend(), FakePlayer()
+    backend = CachedBackend(live, cache, player)
+
+    backend.speak("Opening notepad", lambda: False)
+    backend.speak("Opening notepad", lambda: False)
+    cache.wait_idle()
+    backend.speak("Opening notepad", lambda: False)
+
+    assert [t for t, _ in live.spoken] == ["Opening notepad", "Opening notepad"]
+    assert len(player.played) == 1
+
+    # long one-off text never gets rendered
+    backend.speak("x" * 200, lambda: False)
+    backend.speak("x" * 200, lambda: False)
+    cache.wait_idle()
+    assert cache.get("x" * 200) is None
+
+
+def test_key_depends_on_voice_and_rate(tmp_path):
+    a = PhraseCache(tmp_path, FakeSynthesizer("sapi|default|0"), debug=False)
+    b = PhraseCache(tmp_path, FakeSynthesizer("sapi|default|3"), debug=False)
+
+    assert a.key("Stopped") == a.key("  stopped ")
+    assert a.key("Stopped") != b.key("Stopped")
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    for i, phrase in enumerate(["one", "two"]):
+        path = cache.render(phrase)
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    cache.get("one")               # touch → "two" is now the oldest
+    cache.render("three")
+
+    assert cache.get("one") is not None
+    assert cache.get("two") is None
+    assert cache.get("three") is not None
+    assert cache.stats()["evicted"] == 1
@@ -0,0 +1,80 @@
+# tests/test_profiler.py
+# Sampling profiler (collapsed stacks) + main loop stall watchdog
+
+import threading
+import time
+
+import pytest
+
+from utils import profiler
+from utils.profiler import SamplingProfiler, StallWatchdog
+
+
+def busy_marker(stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def events(monkeypatch):
+    logged = []
+    monkeypatch.setattr(profiler, "log_event", lambda kind, payload, debug=True: logged.append((kind, payload)))
+    return logged
+
+
+def test_sample_collapses_thread_stacks():
+    stop = threading.Event()
+    t = threading.Thread(target=busy_marker, args=(stop,), name="busy")
+    t.start()
+    try:
+        prof = SamplingProfiler()
+        prof.sample()
+    finally:
+        stop.set()
+        t.join()
+
+    stacks = [s for s in prof.stacks if s.startswith("busy;")]
+    assert len(stacks) == 1
+    assert "busy_marker (test_profiler.py:" in stacks[0].split(";")[-1]
+
+
+def test_start_stop_writes_folded_file(tmp_path):
+    prof = SamplingProfiler(interval_ms=1, output_dir=tmp_path)
+    assert prof.start()
+    assert not prof.start()
+    time.sleep(0.05)
+    path = prof.stop()
+
+    assert prof.stop() is None
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert not any(line.startswith("profiler;") for line in lines)   # never samples itself
+
+
+def test_watchdog_dumps_once_per_stalled_iteration(events):
+    watchdog = StallWatchdog(budget_sec=0.05)
+    try:
+        watchdog.arm()
+        time.sleep(0.3)
+        watchdog.disarm()
+    finally:
+        watchdog.stop()
+
+    assert len(events) == 1
+    kind, payload = events[0]
+    assert kind == "stall"
+    assert payload["thread"] == threading.current_thread().name
+    assert "test_watchdog_dumps_once_per_stalled_iteration" in payload["stacks"][payload["thread"]]
+
+
+def test_watchdog_ignores_disarmed_waits(events):
+    watchdog = StallWatchdog(budget_sec=0.05)
+    try:
+        watchdog.arm()
+        watchdog.disarm()   # blocking on the mic
+        time.sleep(0.2)
+    finally:
+        watchdog.stop()
+
+    assert events == []
@@ -0,0 +1,92 @@
+# tests/test_speculative.py
+# Partial-hypothesis STT + speculative routing tests (no mic, no network)
+
+import math
+import struct
+import wave
+
+from intent.rule_router import speculative_route
+from speech.backends import WavReplaySource, TranscriptRecognizer
+from speech.capture import capture
+from speech.partials import ScriptedPartialRecognizer
+from speech.stt import SpeechToText
+
+RATE = 16000
+
+
+def _stt(tmp_path, transcripts):
+    # one WAV per phrase: silence, 1s tone ("speech"), silence
+    for i in range(len(transcripts)):
+        samples = [0] * int(0.3 * RATE)
+        samples += [int(8000 * math.sin(2 * math.pi * 440 * n / RATE)) for n in range(RATE)]
+        samples += [0] * int(0.3 * RATE)
+        with wave.open(str(tmp_path / f"{i:02}.wav"), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(RATE)
+            wf.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+    source = WavReplaySource(tmp_path)
+    return SpeechToText(
+        source=source,
+        backend=TranscriptRecognizer(source),
+        partial_recognizer=ScriptedPartialRecognizer(transcripts),
+        calibrate=False,
+        debug=False
+    )
+
+
+def test_scripted_partials_grow_word_by_word():
+    rec = ScriptedPartialRecognizer(["scroll down"])
+    rec.start()
+
+    partials = [rec.feed(b"chunk") for _ in range(3)]
+
+    print("[TEST] partials ->", partials)
+
+    assert partials == ["scroll", "scroll down", None]
+    assert rec.finish() == "scroll down"
+
+
+def test_speculative_commits_unambiguous_command():
+    intent = speculative_route("scroll down")
+
+    assert intent is not None
+    assert intent["intent_id"] == "NAVIGATION"
+
+
+def test_speculative_waits_on_prefix_and_fuzzy():
+    # "open google" can still grow into "open google maps"
+    assert speculative_route("open google") is None
+    # no fuzzy commits on half-heard words
+    assert speculative_route("scroll dow") is None
+
+
+def test_speculative_never_commits_open_ended_search():
+    assert speculative_route("search for cats") is None
+
+
+def test_partials_stream_through_stt(tmp_path):
+    stt = _stt(tmp_path, ["search for cats"])
+
+    partials = list(stt.listen_partials())
+
+    assert [p.text for p in partials] == ["search", "search for", "search for cats", "search for cats"]
+    assert [p.is_final for p in partials] == [False, False, False, True]
+
+
+def test_capture_commits_early_on_partial(tmp_path):
+    stt = _stt(tmp_path, ["scroll down please", "next"])
+
+    text, intent = capture(stt, True, speculative_route)
+
+    assert text == "scroll down"
+    assert intent["intent_id"] == "NAVIGATION"
+    # capture stopped mid-phrase; the next phrase is a fresh one
+    assert stt.source.remaining() == 1
+
+
+def test_capture_falls_back_to_final_transcript(tmp_path):
+    stt = _stt(tmp_path, ["search for cats"])
+
+    assert capture(stt, True, speculative_route) == ("search for cats", None)
@@ -0,0 +1,76 @@
+# tests/test_startup.py
+# Staged startup: timed serial phases, parallel init tasks, one report
+
+import time
+
+import pytest
+
+from utils import startup as startup_module
+from utils.startup import Startup
+
+
+@pytest.fixture
+def events(monkeypatch):
+    logged = []
+    monkeypatch.setattr(startup_module, "log_event", lambda kind, payload, debug=True: logged.append((kind, payload)))
+    return logged
+
+
+def test_tasks_run_concurrently(events):
+    startup = Startup()
+    started = time.perf_counter()
+    startup.submit("stt", time.sleep, 0.2)
+    startup.submit("tts", time.sleep, 0.2)
+    startup.submit("rules", lambda: ["rule"])
+
+    assert startup.wait("rules") == ["rule"]
+    report = startup.finish()
+
+    assert time.perf_counter() - started < 0.35
+    assert {p["name"] for p in report["phases"]} == {"stt", "tts", "rules"}
+    assert events == [("startup", report)]
+
+
+def test_serial_phase_counts_imported_modules(events):
+    startup = Startup()
+    with startup.phase("imports"):
+        import json.tool  # noqa: F401
+    report = startup.finish()
+
+    phase = report["phases"][0]
+    assert phase["name"] == "imports" and phase["thread"] == "MainThread"
+    assert "modules" in phase
+
+
+def test_failed_task_raises_on_wait(events):
+    startup = Startup()
+
+    def broken():
+        raise RuntimeError("no microphone")
+
+    startup.submit("stt", broken)
+    startup.finish()
+    with pytest.raises(RuntimeError):
+        startup.wait("stt")
+
+
+def test_preload_tolerates_missing_modules(events):
+    startup = Startup()
+    startup.preload("json", "no_such_module_here")
+    report = startup.finish()
+
+    assert [p["name"] for p in report["phases"]].count("import no_such_module_here") == 1
+
+
+def test_finish_waits_for_follow_up_tasks(events):
+    startup = Startup()
+
+    def mine():
+        time.sleep(0.05)
+        startup.submit("local_model", lambda: "model")
+
+    startup.submit("rules", mine)
+    report = startup.finish()
+
+    assert startup.wait("local_model") == "model"
+    assert [p["name"] for p in report["phases"]] == ["rules", "local_model"]
@@ -0,0 +1,91 @@
+# tests/test_stream_json.py
+# Incremental JSON parsing of streamed AI responses
+
+import json
+
+import pytest
+
+from ai import ai_engine
+from ai import budget as ai_budget
+from ai.budget import AIBudget
+from ai.stream_json import IncrementalJSONParser, StreamJSONError
+
+
+def parse(text: str):
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.close()
+
+
+def test_fields_complete_before_stream_ends():
+    doc = json.dumps({
+        "type": "CODE_GENERATION",
+        "confidence": 0.9,
+        "result": {"files": {"a.py": "print(\"a\")\n", "b.py": "x = [1, 2]"}}
+    })
+    seen = []
+    parser = IncrementalJSONParser(lambda path, value: seen.append(path))
+
+    # 3-char chunks, like SSE deltas
+    for i in range(0, len(doc), 3):
+        parser.feed(doc[i:i + 3])
+        if ("result", "files", "a.py") in seen:
+            break
+
+    # a.py is usable while b.py is still streaming
+    assert not parser.done
+    assert ("result", "files", "b.py") not in seen
+
+    parser.feed(doc[i + 3:])
+    assert parser.close() == json.loads(doc)
+
+
+def test_model_chatter_around_json_is_ignored():
+    text = 'Sure [thinking]! {"intent_id": "OPEN_APP", "params": {"app_name": "code"}} Hope this helps }'
+
+    assert parse(text) == {"intent_id": "OPEN_APP", "params": {"app_name": "code"}}
+
+
+@pytest.mark.parametrize("text", [
+    '{"a" 1}',            # missing :
+    '{"a": 1 "b": 2}',    # missing ,
+    '{"a", 1}',           # , where : belongs
+    '{"a": 1,}',          # trailing ,
+    '{: 1}',              # : without a key
+    '{"a": [1, 2}',       # mismatched bracket
+    '{"a": tru}',         # bad literal
+    '{"a": "x\ny"}',     # raw newline inside a string
+])
+def test_malformed_json_raises_stream_error(text):
+    with pytest.raises(StreamJSONError):
+        parse(text)
+
+
+def test_streamed_code_generation(monkeypatch):
+    content = json.dumps({
+        "type": "CODE_GENERATION",
+        "confidence": 0.95,
+        "result": {"files": {"main.py": "print('hi')"}}
+    })
+
+    def fake_stream_sse(provider, url, headers, payload, timeout):
+        assert payload["stream"] is True
+        for i in range(0, len(content), 5):
+            yield json.dumps({"choices": [{"delta": {"content": content[i:i + 5]}}]})
+
+    monkeypatch.setenv("GROQ_TEST_KEY", "test")
+    monkeypatch.setattr(ai_engine, "stream_sse", fake_stream_sse)
+    # earlier tests may have spent the shared default budget (2 calls / minute)
+    monkeypatch.setattr(ai_budget, "_budget", AIBudget(max_calls_per_minute=1000, max_calls_per_day=1000, debug=False))
+
+    files = {}
+    settings = {"enabled": True, "api_key_env": "GROQ_TEST_KEY", "model": "m", "timeout_sec": 5, "stream": True}
+
+    proposal = ai_engine.ai_generate_code(
+        "create hello world",
+        settings,
+        on_value=lambda path, value: files.update({path[2]: value}) if len(path) == 3 else None
+    )
+
+    assert proposal["result"]["files"] == {"main.py": "print('hi')"}
+    assert files["main.py"] == "print('hi')"
@@ -0,0 +1,67 @@
+# tests/test_stt_backends.py
+# STT through WAV replay + local recognizer (no mic, no network)
+
+import math
+import struct
+import wave
+
+from speech.backends import WavReplaySource, TranscriptRecognizer
+from speech.stt import SpeechToText
+from speech import benchmark
+from utils import metrics
+
+RATE = 16000
+
+
+def _write_command(path, transcript=None):
+    # 0.3s silence, 0.6s tone ("speech"), 0.3s silence
+    samples = [0] * int(0.3 * RATE)
+    samples += [int(8000 * math.sin(2 * math.pi * 440 * i / RATE)) for i in range(int(0.6 * RATE))]
+    samples += [0] * int(0.3 * RATE)
+
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+    if transcript:
+        path.with_suffix(".txt").write_text(transcript, encoding="utf-8")
+
+
+def test_wav_replay_goes_through_vad_and_recognizer(tmp_path):
+    _write_command(tmp_path / "01_scroll_down.wav")
+    _write_command(tmp_path / "02.wav", transcript="open youtube")
+
+    source = WavReplaySource(tmp_path)
+    stt = SpeechToText(
+        source=source,
+        backend=TranscriptRecognizer(source),
+        calibrate=False,
+        debug=False
+    )
+
+    assert stt.listen() == "01 scroll down"
+    assert "capture" in stt.last_timings and "recognize" in stt.last_timings
+
+    assert stt.listen() == "open youtube"
+
+    # corpus exhausted → no crash, no text, not an STT error
+    errors = metrics.counter("voice_stt_errors_total", "STT failures", stage="listen")
+    before = errors.value
+    assert stt.listen() is None
+    assert errors.value == before
+
+
+def test_benchmark_reports_throughput_and_stages(tmp_path):
+    for i in range(3):
+        _write_command(tmp_path / f"cmd_{i}.wav")
+
+    report = benchmark.run(str(tmp_path), repeat=2)
+
+    print("[TEST] benchmark ->", report)
+
+    assert report["utterances"] == 6
+    assert report["correct"] == 6
+    assert report["utterances_per_sec"] > 0
+    assert set(report["stages"]) == {"capture", "recognize"}
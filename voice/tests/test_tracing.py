@@ -0,0 +1,110 @@
+# tests/test_tracing.py
+# Per-utterance traces: spans, hand-off to worker threads, traces.jsonl + Chrome trace
+
+import json
+import threading
+
+import pytest
+
+from utils import logger, tracing
+from utils.tts import TTSWorker, RecordingBackend
+
+
+@pytest.fixture
+def events(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.configure({"enabled": True, "file": str(path)})
+
+    def read():
+        if not path.exists():
+            return []
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        return [(e["event_type"], e["payload"]) for e in lines]
+
+    yield read
+    tracing.end()
+    tracing.configure({"enabled": False})
+
+
+def test_spans_are_emitted_when_the_utterance_ends(events):
+    trace = tracing.begin(text="open notepad")
+    with tracing.span("normalize"):
+        pass
+    with tracing.span("rule_route"):
+        pass
+    tracing.add("recognition", trace.started - 0.2, trace.started)
+
+    assert events() == []
+    tracing.end()
+
+    kind, payload = events()[0]
+    assert kind == "trace"
+    assert payload["text"] == "open notepad"
+    assert [s["name"] for s in payload["spans"]] == ["recognition", "normalize", "rule_route"]
+    assert payload["spans"][0]["start_ms"] < 0
+
+
+def test_held_trace_waits_for_worker_thread(events):
+    tracing.begin()
+    held = tracing.hold()
+
+    def worker():
+        with tracing.resume(held), tracing.span("execute"):
+            pass
+
+    tracing.end()
+    assert events() == []
+
+    t = threading.Thread(target=worker, name="action-executor")
+    t.start()
+    t.join()
+
+    spans = events()[0][1]["spans"]
+    assert spans[0]["name"] == "execute" and spans[0]["thread"] == "action-executor"
+
+
+def test_tts_speech_is_part_of_the_trace(events):
+    tts = TTSWorker(RecordingBackend())
+    tracing.begin()
+    tts.say("Opening notepad")
+    tracing.end()
+    tts.wait_idle(1.0)
+    tts.shutdown()
+
+    assert [s["name"] for s in events()[0][1]["spans"]] == ["tts"]
+
+
+def test_no_tracer_means_no_op():
+    tracing.configure({"enabled": False})
+    assert tracing.begin() is None
+    with tracing.span("anything"):
+        pass
+    assert tracing.hold() is None
+    tracing.end()
+
+
+def test_chrome_trace_file(events, tmp_path):
+    path = tmp_path / "trace.json"
+    tracing.configure({"file": None, "chrome_trace": str(path)})
+
+    tracing.begin()
+    with tracing.span("execute", intent="OPEN_APP"):
+        pass
+    tracing.end()
+
+    # appendable array: drop the trailing comma and close it to parse
+    data = json.loads(path.read_text(encoding="utf-8").rstrip().rstrip(",") + "]")
+    spans = [e for e in data if e["ph"] == "X"]
+    assert spans[0]["name"] == "execute"
+    assert spans[0]["args"]["intent"] == "OPEN_APP"
+    assert any(e["ph"] == "M" for e in data)
+
+
+def test_traces_stay_out_of_the_event_log(events, tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, "LOG_FILE", tmp_path / "logs.jsonl")
+
+    tracing.begin()
+    tracing.end()
+
+    assert [kind for kind, _ in events()] == ["trace"]
+    assert not (tmp_path / "logs.jsonl").exists()
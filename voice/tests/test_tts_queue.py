@@ -0,0 +1,111 @@
+# tests/test_tts_queue.py
+# TTS worker: non-blocking, priorities, coalescing, barge-in, echo guard
+
+import threading
+import time
+
+from utils import tts as tts_module
+from utils.tts import TTSWorker, RecordingBackend, NullBackend, TTSBackend, URGENT, NORMAL, LOW
+
+
+class GatedBackend(TTSBackend):
+    """Holds the first utterance until released (or interrupted)."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.spoken = []
+
+    def speak(self, text, should_stop):
+        self.started.set()
+        while not self.release.is_set():
+            if should_stop():
+                self.spoken.append((text, False))
+                return False
+            time.sleep(0.005)
+        self.spoken.append((text, True))
+        return True
+
+
+def test_say_does_not_block():
+    tts = TTSWorker(RecordingBackend(sec_per_char=0.05))
+
+    t0 = time.monotonic()
+    tts.say("this would take a long time to speak")
+    assert time.monotonic() - t0 < 0.05
+
+    tts.shutdown()
+
+
+def test_priority_order_and_coalescing():
+    backend = GatedBackend()
+    tts = TTSWorker(backend)
+
+    tts.say("first")
+    backend.started.wait(1.0)
+    tts.say("low news", priority=LOW)
+    tts.say("Opening notepad", key="open_app")
+    tts.say("Opening chrome", key="open_app")
+    tts.say("Opening chrome", key="open_app")
+    backend.release.set()
+
+    assert tts.wait_idle(2.0)
+    assert [t for t, _ in backend.spoken] == ["first", "Opening chrome", "low news"]
+    assert tts.coalesced == 2
+    tts.shutdown()
+
+
+def test_urgent_message_barges_in():
+    backend = GatedBackend()
+    tts = TTSWorker(backend)
+
+    tts.say("a long explanation", priority=NORMAL)
+    backend.started.wait(1.0)
+    tts.say("Stopped", priority=URGENT)
+    time.sleep(0.05)
+    backend.release.set()
+
+    assert tts.wait_idle(2.0)
+    assert backend.spoken == [("a long explanation", False), ("Stopped", True)]
+    assert tts.interrupted == 1
+    tts.shutdown()
+
+
+def test_user_speech_interrupts_and_clears():
+    backend = GatedBackend()
+    tts = TTSWorker(backend)
+
+    tts.say("talking")
+    tts.say("queued")
+    backend.started.wait(1.0)
+    tts.interrupt(clear=True)
+
+    assert tts.wait_idle(2.0)
+    assert backend.spoken == [("talking", False)]
+    tts.shutdown()
+
+
+def test_echo_guard():
+    tts = TTSWorker(RecordingBackend())
+    tts.say("Opening notepad")
+    tts.wait_idle(1.0)
+
+    assert tts.is_echo("opening notepad")
+    assert tts.is_echo("Opening notepad.")
+    assert not tts.is_echo("open notepad")
+    assert not tts.is_echo("stop")
+    tts.shutdown()
+
+
+def test_runtime_fallback_keeps_nothing(monkeypatch):
+    monkeypatch.setattr(tts_module.sys, "platform", "linux")
+    monkeypatch.setattr(tts_module, "_tts", None)
+
+    tts = tts_module.configure()
+    try:
+        assert isinstance(tts.backend, NullBackend)
+        tts.say("Opening notepad")
+        assert tts.wait_idle(1.0)
+        assert not hasattr(tts.backend, "spoken")
+    finally:
+        tts.shutdown()
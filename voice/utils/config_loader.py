@@ -4,11 +4,15 @@
 import json
 from pathlib import Path
 
+from utils.log import get_logger
+
+log = get_logger("config")
+
 def load_json(path: str, debug=True) -> dict:
     path_obj = Path(path)
 
     if debug:
-        print(f"[CONFIG] Loading config file: {path_obj}")
+        log.debug("Loading config file: %s", path_obj)
 
     if not path_obj.exists():
         raise FileNotFoundError(f"[CONFIG ERROR] File not found: {path}")
@@ -18,10 +22,10 @@ def load_json(path: str, debug=True) -> dict:
             data = json.load(f)
 
         if debug:
-            print(f"[CONFIG] Loaded keys from {path}: {list(data.keys())}")
+            log.debug("Loaded keys from %s: %s", path, list(data))
 
         return data
 
     except json.JSONDecodeError as e:
-        print(f"[CONFIG ERROR] Invalid JSON in {path}")
+        log.error("Invalid JSON in %s", path)
         raise e
\ No newline at end of file
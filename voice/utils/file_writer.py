@@ -1,5 +1,9 @@
 import os
 
+from utils.log import get_logger
+
+log = get_logger("files", "FILE CREATED")
+
 
 def write_files(base_dir: str, files: dict):
     os.makedirs(base_dir, exist_ok=True)
@@ -14,4 +18,4 @@ def write_files(base_dir: str, files: dict):
         with open(path, "w", encoding="utf-8") as f:
             f.write(content)
 
-        print("[FILE CREATED]", path)
\ No newline at end of file
+        log.info("%s", path)
\ No newline at end of file
@@ -0,0 +1,136 @@
+# utils/log.py
+# Leveled console logging for every subsystem
+# - log = get_logger("keyboard")  →  log.debug("Typing %d chars", n)
+# - Disabled levels cost one int compare; % formatting only happens when enabled
+# - Level from settings.debug.log_level, per-subsystem overrides in settings.debug.log_levels
+#   ("intent" also covers "intent.rules"); debug.enabled = false → warnings and errors only
+# - Output keeps the console look: "[TAG] message", "[TAG ERROR] message"
+# - Event log (utils/logger.py) is separate: that is data, this is console noise
+
+import threading
+
+TRACE = 5
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {
+    "TRACE": TRACE,
+    "DEBUG": DEBUG,
+    "INFO": INFO,
+    "WARNING": WARNING,
+    "ERROR": ERROR,
+    "OFF": OFF,
+}
+
+_SUFFIX = {WARNING: " WARNING", ERROR: " ERROR"}
+
+_default_level = INFO
+_overrides = {}           # subsystem name -> level
+_loggers = {}
+_lock = threading.Lock()
+
+
+def parse_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level}")
+
+
+def _level_for(name: str) -> int:
+    # most specific override wins: "intent.rules" → "intent" → default
+    parts = name.split(".")
+    for i in range(len(parts), 0, -1):
+        level = _overrides.get(".".join(parts[:i]))
+        if level is not None:
+            return level
+    return _default_level
+
+
+class Logger:
+    __slots__ = ("name", "tag", "level")
+
+    def __init__(self, name: str, tag: str):
+        self.name = name
+        self.tag = tag
+        self.level = _level_for(name)
+
+    def is_enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def _emit(self, level, msg, args):
+        if args:
+            try:
+                msg = msg % args
+            except (TypeError, ValueError):
+                msg = " ".join([str(msg)] + [str(a) for a in args])
+        print(f"[{self.tag}{_SUFFIX.get(level, '')}] {msg}")
+
+    def trace(self, msg, *args):
+        if self.level <= TRACE:
+            self._emit(TRACE, msg, args)
+
+    def debug(self, msg, *args):
+        if self.level <= DEBUG:
+            self._emit(DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        if self.level <= INFO:
+            self._emit(INFO, msg, args)
+
+    def warning(self, msg, *args):
+        if self.level <= WARNING:
+            self._emit(WARNING, msg, args)
+
+    def error(self, msg, *args):
+        if self.level <= ERROR:
+            self._emit(ERROR, msg, args)
+
+
+def get_logger(name: str, tag: str | None = None) -> Logger:
+    """One logger per subsystem; tag defaults to the upper-cased name."""
+    with _lock:
+        logger = _loggers.get(name)
+        if logger is None:
+            logger = Logger(name, tag or name.upper().replace(".", " "))
+            _loggers[name] = logger
+        return logger
+
+
+def _apply():
+    for logger in _loggers.values():
+        logger.level = _level_for(logger.name)
+
+
+def set_level(level, name: str | None = None):
+    global _default_level
+    with _lock:
+        if name is None:
+            _default_level = parse_level(level)
+        else:
+            _overrides[name] = parse_level(level)
+        _apply()
+
+
+def configure(debug_settings: dict | None = None):
+    """settings["debug"] → levels for every logger, existing and future."""
+    global _default_level
+    debug_settings = debug_settings or {}
+
+    level = parse_level(debug_settings.get("log_level", "INFO"))
+    if not debug_settings.get("enabled", True):
+        level = max(level, WARNING)
+
+    with _lock:
+        _default_level = level
+        _overrides.clear()
+        if not debug_settings.get("print_ai_raw_output", False):
+            _overrides["intent.ai.raw"] = OFF
+        for name, sub_level in debug_settings.get("log_levels", {}).items():
+            _overrides[name] = parse_level(sub_level)
+        _apply()
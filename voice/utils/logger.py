@@ -7,6 +7,10 @@ import json
 import time
 from pathlib import Path
 
+from utils.log import get_logger
+
+log = get_logger("logger")
+
 LOG_FILE = Path("data/logs.jsonl")
 
 def log_event(event_type: str, payload: dict, debug=True):
@@ -22,7 +26,7 @@ def log_event(event_type: str, payload: dict, debug=True):
             f.write(json.dumps(event) + "\n")
 
         if debug:
-            print(f"[LOGGER] Event logged: {event_type}")
+            log.debug("Event logged: %s", event_type)
 
     except Exception as e:
-        print("[LOGGER ERROR]", e)
\ No newline at end of file
+        log.error("%s", e)
\ No newline at end of file
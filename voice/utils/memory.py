@@ -0,0 +1,220 @@
+# utils/memory.py
+# Memory growth monitor for multi-day runs (optional, off by default)
+# - tracemalloc snapshots every interval_sec, diffed against the first one:
+#   the top growing allocation sites (file:line) go to the event log ("memory")
+# - Live threads grouped by name (abandoned "stt-recognize" threads pile up here)
+# - RSS from the OS; a warning when it crosses rss_budget_mb (once per crossing)
+# - tracemalloc costs CPU + memory on every allocation → only while enabled
+
+import ctypes
+import os
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+
+from utils.logger import log_event
+from utils.log import get_logger
+
+log = get_logger("memory")
+
+DEFAULTS = {
+    "enabled": False,
+    "interval_sec": 300,
+    "top_n": 10,
+    "frames": 1,                # traceback depth per allocation (more = slower)
+    "rss_budget_mb": 500,       # null disables the warning
+}
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# ---------------- PROCESS STATS ----------------
+
+class _ProcessMemoryCounters(ctypes.Structure):
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("PageFaultCount", ctypes.c_ulong),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def rss_bytes() -> int | None:
+    """Resident set size (working set on Windows); None if the OS won't say."""
+    try:
+        if sys.platform == "win32":
+            counters = _ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+def thread_counts() -> dict:
+    """Live threads by name, numbering stripped ("Thread-12 (worker)" → "Thread (worker)")."""
+    return dict(Counter(re.sub(r"-\d+", "", t.name) for t in threading.enumerate()))
+
+
+# ---------------- MONITOR ----------------
+
+class MemoryMonitor:
+    def __init__(self, interval_sec=300, top_n=10, frames=1, rss_budget_mb=500, debug=False):
+        self.interval_sec = interval_sec
+        self.top_n = top_n
+        self.frames = frames
+        self.rss_budget = rss_budget_mb * 1024 * 1024 if rss_budget_mb else None
+        self.debug = debug
+
+        self.checks = 0
+        self.over_budget = False
+        self._baseline = None
+        self._last_traced = 0
+        self._started_tracing = False
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._baseline = self._snapshot()
+        self._last_traced = tracemalloc.get_traced_memory()[0]
+
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_sec):
+            try:
+                self.check()
+            except Exception as e:
+                log.error("Check failed: %s", e)
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    # ---------- one check ----------
+
+    def check(self) -> dict:
+        snapshot = self._snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+
+        growth = [
+            stat for stat in snapshot.compare_to(self._baseline, "lineno")
+            if stat.size_diff > 0
+        ][:self.top_n]
+
+        rss = rss_bytes()
+        payload = {
+            "rss_mb": round(rss / 1048576, 1) if rss is not None else None,
+            "traced_mb": round(traced / 1048576, 2),
+            "traced_peak_mb": round(peak / 1048576, 2),
+            "traced_delta_kb": round((traced - self._last_traced) / 1024, 1),
+            "threads": thread_counts(),
+            "top_growth": [
+                {
+                    "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                }
+                for stat in growth
+            ],
+        }
+        self._last_traced = traced
+        self.checks += 1
+
+        log_event("memory", payload, debug=self.debug)
+        if self.debug and growth:
+            top = payload["top_growth"][0]
+            log.debug("traced %.1fMB, top growth %s +%.1fKB", payload["traced_mb"], top["site"], top["size_diff_kb"])
+
+        self._check_budget(rss)
+        return payload
+
+    def _check_budget(self, rss):
+        if self.rss_budget is None or rss is None:
+            return
+        over = rss > self.rss_budget
+        if over and not self.over_budget:
+            log.warning(
+                "RSS %.0fMB over the %.0fMB budget, see \"memory\" events for growth sites",
+                rss / 1048576, self.rss_budget / 1048576
+            )
+            log_event("memory_budget", {"rss_mb": round(rss / 1048576, 1), "budget_mb": self.rss_budget / 1048576})
+        self.over_budget = over
+
+    def stop(self):
+        self._stop.set()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def collect_metrics():
+    rss = rss_bytes()
+    samples = [("voice_threads", "gauge", "Live threads", {}, threading.active_count())]
+    if rss is not None:
+        samples.append(("voice_memory_rss_bytes", "gauge", "Resident set size", {}, rss))
+    if tracemalloc.is_tracing():
+        samples.append((
+            "voice_memory_traced_bytes", "gauge", "Python allocations traced by tracemalloc", {},
+            tracemalloc.get_traced_memory()[0]
+        ))
+    return samples
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_monitor = None
+
+
+def configure(config: dict | None = None, debug=False) -> MemoryMonitor | None:
+    global _monitor
+    config = {**DEFAULTS, **(config or {})}
+    shutdown()
+
+    if not config["enabled"]:
+        return None
+
+    _monitor = MemoryMonitor(
+        interval_sec=config["interval_sec"],
+        top_n=config["top_n"],
+        frames=config["frames"],
+        rss_budget_mb=config["rss_budget_mb"],
+        debug=debug
+    )
+    _monitor.start()
+    if debug:
+        log.info("tracemalloc snapshots every %ss", config["interval_sec"])
+    return _monitor
+
+
+def get_monitor() -> MemoryMonitor | None:
+    return _monitor
+
+
+def shutdown():
+    global _monitor
+    if _monitor is not None:
+        _monitor.stop()
+        _monitor = None
@@ -0,0 +1,328 @@
+# utils/metrics.py
+# In-process metrics for long runs (days), exported in Prometheus text format
+# - Counter: monotonically increasing, optional labels
+# - Histogram: HDR-style log-linear buckets → p50/p99 with ~3% error, O(1) record,
+#   fixed memory no matter how many samples (no sample lists)
+# - Collectors: callbacks read counters other modules already keep (cache hits, AI calls)
+# - Pipeline stage latencies come from utils/tracing.py spans (observe_trace)
+# - Export: textfile (node_exporter textfile collector / tail) and/or localhost HTTP /metrics
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from utils.log import get_logger
+
+log = get_logger("metrics")
+
+DEFAULTS = {
+    "enabled": True,
+    "textfile": "data/metrics.prom",
+    "interval_sec": 15,
+    "http_port": None,        # e.g. 9464 → http://127.0.0.1:9464/metrics
+}
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+SUB_BITS = 5                  # 16 sub-buckets per power of two → ≤6.25% bucket width
+SUB = 1 << SUB_BITS
+HALF = SUB >> 1
+
+
+def _labels(labels: dict, extra: dict | None = None) -> str:
+    items = {**labels, **(extra or {})}
+    if not items:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in sorted(items.items())
+    )
+    return "{" + body + "}"
+
+
+def percentile(values, pct: float) -> float:
+    """Exact nearest-rank percentile of a (small) sample list; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+# ---------------- PRIMITIVES ----------------
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+
+
+class Histogram:
+    """Values in seconds, stored as integer microseconds in log-linear buckets."""
+
+    def __init__(self, unit=1e-6):
+        self.unit = unit
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._counts = {}         # bucket index -> samples
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket(v: int) -> int:
+        if v < SUB:
+            return v              # exact below 32 units
+        shift = v.bit_length() - SUB_BITS     # keeps the top SUB_BITS bits
+        return SUB + (shift - 1) * HALF + (v >> shift) - HALF
+
+    @staticmethod
+    def bucket_mid(index: int) -> float:
+        if index < SUB:
+            return float(index)
+        shift, sub = divmod(index - SUB, HALF)
+        shift += 1
+        low = (sub + HALF) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, value: float):
+        v = int(value / self.unit) if value > 0 else 0
+        index = self.bucket(v)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, q * self.count)
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= rank:
+                    return min(self.bucket_mid(index) * self.unit, self.max)
+            return self.max
+
+
+# ---------------- REGISTRY ----------------
+
+class Metrics:
+    def __init__(self):
+        self.started = time.time()
+        self._counters = {}       # name -> {labels tuple: Counter}
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, table, name, help_text, labels, factory):
+        key = tuple(sorted(labels.items()))
+        series = table.get(name)
+        metric = series.get(key) if series else None
+        if metric is not None:
+            return metric
+
+        with self._lock:
+            series = table.setdefault(name, {})
+            if key not in series:
+                series[key] = factory()
+            if help_text:
+                self._help.setdefault(name, help_text)
+            return series[key]
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._get(self._counters, name, help_text, labels, Counter)
+
+    def histogram(self, name: str, help_text: str = "", **labels) -> Histogram:
+        return self._get(self._histograms, name, help_text, labels, Histogram)
+
+    def collector(self, fn):
+        """fn() → [(name, "counter" | "gauge", help, labels, value), ...], read at export time."""
+        with self._lock:
+            self._collectors.append(fn)
+        return fn
+
+    # ---------- pipeline stages (utils/tracing.py listener) ----------
+
+    def observe_trace(self, payload: dict):
+        self.histogram("voice_utterance_seconds", "Speech end to last span of the utterance").record(
+            payload["total_ms"] / 1000
+        )
+        for span in payload["spans"]:
+            self.histogram("voice_stage_seconds", "Pipeline stage latency", stage=span["name"]).record(
+                span["dur_ms"] / 1000
+            )
+
+    # ---------- export ----------
+
+    def render(self) -> str:
+        lines = []
+
+        def header(name, kind):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            histograms = {n: dict(s) for n, s in self._histograms.items()}
+            collectors = list(self._collectors)
+
+        for name in sorted(counters):
+            header(name, "counter")
+            for key, counter in sorted(counters[name].items()):
+                lines.append(f"{name}{_labels(dict(key))} {counter.value}")
+
+        for name in sorted(histograms):
+            series = sorted(histograms[name].items())
+            header(name, "summary")
+            for key, hist in series:
+                labels = dict(key)
+                for q in QUANTILES:
+                    lines.append(f"{name}{_labels(labels, {'quantile': q})} {hist.quantile(q):.6f}")
+                lines.append(f"{name}_sum{_labels(labels)} {hist.sum:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+            # max is its own family: summaries have no _max sample
+            lines.append(f"# TYPE {name}_max gauge")
+            for key, hist in series:
+                lines.append(f"{name}_max{_labels(dict(key))} {hist.max:.6f}")
+
+        collected = {}
+        for fn in collectors:
+            try:
+                for name, kind, help_text, labels, value in fn():
+                    collected.setdefault((name, kind, help_text), []).append((labels, value))
+            except Exception as e:
+                log.error("Collector failed: %s", e)
+
+        for (name, kind, help_text), samples in sorted(collected.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels)} {value}")
+
+        lines.append("# TYPE voice_uptime_seconds gauge")
+        lines.append(f"voice_uptime_seconds {time.time() - self.started:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        tmp.replace(path)     # scrapers never see a half-written file
+
+
+# ---------------- EXPORTERS ----------------
+
+class TextfileExporter:
+    def __init__(self, metrics: Metrics, path, interval_sec=15):
+        self.metrics = metrics
+        self.path = path
+        self.interval_sec = interval_sec
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_sec):
+            self.flush()
+
+    def flush(self):
+        try:
+            self.metrics.write_textfile(self.path)
+        except OSError as e:
+            log.error("Failed to write %s: %s", self.path, e)
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+
+class HTTPExporter:
+    """GET /metrics on 127.0.0.1 only."""
+
+    def __init__(self, metrics: Metrics, port: int, host="127.0.0.1"):
+        registry = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass          # scrapes are not console news
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_metrics = Metrics()
+_exporters = []
+
+
+def get_metrics() -> Metrics:
+    return _metrics
+
+
+def counter(name: str, help_text: str = "", **labels) -> Counter:
+    return _metrics.counter(name, help_text, **labels)
+
+
+def histogram(name: str, help_text: str = "", **labels) -> Histogram:
+    return _metrics.histogram(name, help_text, **labels)
+
+
+def configure(config: dict | None = None, debug=True) -> Metrics:
+    """Starts the configured exporters. Recording works either way."""
+    config = {**DEFAULTS, **(config or {})}
+    shutdown()
+
+    if not config["enabled"]:
+        return _metrics
+
+    if config["textfile"]:
+        _exporters.append(TextfileExporter(_metrics, config["textfile"], config["interval_sec"]))
+        if debug:
+            log.info("Writing %s every %ss", config["textfile"], config["interval_sec"])
+
+    if config["http_port"] is not None:
+        try:
+            exporter = HTTPExporter(_metrics, config["http_port"])
+            _exporters.append(exporter)
+            log.info("Serving http://127.0.0.1:%d/metrics", exporter.port)
+        except OSError as e:
+            log.error("Could not listen on port %s: %s", config["http_port"], e)
+
+    return _metrics
+
+
+def shutdown():
+    while _exporters:
+        _exporters.pop().stop()
@@ -5,6 +5,10 @@
 
 import re
 
+from utils.log import get_logger
+
+log = get_logger("normalizer")
+
 FILLER_WORDS = [
     "please",
     "can you",
@@ -19,7 +23,7 @@ FILLER_WORDS = [
 
 def normalize(text: str, debug=True) -> str:
     if debug:
-        print(f"[NORMALIZER] Raw text: '{text}'")
+        log.debug("Raw text: '%s'", text)
 
     if not text:
         return ""
@@ -35,6 +39,6 @@ def normalize(text: str, debug=True) -> str:
     normalized = text.strip()
 
     if debug:
-        print(f"[NORMALIZER] Normalized text: '{normalized}'")
+        log.debug("Normalized text: '%s'", normalized)
 
     return normalized
\ No newline at end of file
@@ -0,0 +1,305 @@
+# utils/phrase_cache.py
+# Pre-rendered audio for phrases the assistant says over and over
+# - Key: voice + rate + normalized text → one .wav per phrase on disk
+# - LRU eviction by entry count and total bytes (file mtime = last use)
+# - Fixed phrases are pre-warmed in the background at startup
+# - Novel text is spoken live; if it comes back it gets rendered for next time
+# - ONE synth thread renders everything (it owns its own SAPI voice)
+
+import hashlib
+import os
+import queue
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+
+from utils.tts import TTSBackend, sapi_voice
+from utils.log import get_logger
+
+log = get_logger("tts.cache", "TTS CACHE")
+
+DEFAULTS = {
+    "enabled": True,
+    "dir": "data/tts_cache",
+    "max_entries": 300,
+    "max_mb": 50,
+    "max_phrase_chars": 60,     # longer text is always live
+    "learn_after": 2,           # render novel text once it was said this many times
+}
+
+# SAPI stream constants
+SSFM_CREATE_FOR_WRITE = 3
+SAFT_22KHZ_16BIT_MONO = 22
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.split())
+
+
+def wav_duration(path) -> float:
+    with wave.open(str(path), "rb") as w:
+        return w.getnframes() / float(w.getframerate() or 1)
+
+
+# ---------------- SYNTH / PLAYBACK ----------------
+
+class SapiSynthesizer:
+    """Renders text to a .wav with the same voice/rate as live speech."""
+
+    def __init__(self, rate=None, voice=None):
+        self.rate = rate
+        self.voice = voice
+        self._sp_voice = None
+
+    @property
+    def voice_id(self) -> str:
+        return f"sapi|{self.voice or 'default'}|{self.rate if self.rate is not None else 0}"
+
+    def synthesize(self, text: str, path: Path):
+        import win32com.client
+
+        if self._sp_voice is None:
+            self._sp_voice = sapi_voice(self.rate, self.voice)
+
+        fmt = win32com.client.Dispatch("SAPI.SpAudioFormat")
+        fmt.Type = SAFT_22KHZ_16BIT_MONO
+        stream = win32com.client.Dispatch("SAPI.SpFileStream")
+        stream.Format = fmt
+        stream.Open(str(path), SSFM_CREATE_FOR_WRITE)
+        try:
+            self._sp_voice.AudioOutputStream = stream
+            self._sp_voice.Speak(text, 0)
+        finally:
+            stream.Close()
+            self._sp_voice.AudioOutputStream = None
+
+
+class WinSoundPlayer:
+    def play(self, path: Path, should_stop) -> bool:
+        import winsound
+
+        duration = wav_duration(path)
+        winsound.PlaySound(str(path), winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            if should_stop():
+                winsound.PlaySound(None, 0)
+                return False
+            time.sleep(0.02)
+        return True
+
+
+# ---------------- CACHE ----------------
+
+class PhraseCache:
+    def __init__(self, cache_dir, synthesizer, max_entries=300, max_mb=50,
+                 max_phrase_chars=60, learn_after=2, debug=True):
+        self.dir = Path(cache_dir)
+        self.synthesizer = synthesizer
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_phrase_chars = max_phrase_chars
+        self.learn_after = learn_after
+        self.debug = debug
+
+        self.hits = 0
+        self.misses = 0
+        self.rendered = 0
+        self.evicted = 0
+
+        self._seen = {}           # novel text -> times said (bounded)
+        self._pending = set()
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def key(self, text: str) -> str:
+        raw = f"{self.synthesizer.voice_id}\n{_norm(text).lower()}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.wav"
+
+    # ---------- lookup ----------
+
+    def get(self, text: str) -> Path | None:
+        path = self._path(self.key(text))
+        try:
+            os.utime(path)        # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return path
+
+    # ---------- rendering ----------
+
+    def render(self, text: str) -> Path | None:
+        """Synthesizes text to the cache (blocking). Call from the synth thread."""
+        key = self.key(text)
+        path = self._path(key)
+        if path.exists():
+            return path
+
+        tmp = path.with_suffix(".tmp")
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            started = time.perf_counter()
+            self.synthesizer.synthesize(_norm(text), tmp)
+            tmp.replace(path)
+        except Exception as e:
+            log.error("Failed to render phrase: %s", e)
+            tmp.unlink(missing_ok=True)
+            return None
+
+        with self._lock:
+            self.rendered += 1
+        if self.debug:
+            log.info("Rendered '%s' in %.0fms", text, (time.perf_counter() - started) * 1000)
+
+        self.evict()
+        return path
+
+    def evict(self):
+        files = []
+        for path in self.dir.glob("*.wav"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        files.sort()              # oldest use first
+        total = sum(size for _, size, _ in files)
+        while files and (len(files) > self.max_entries or total > self.max_bytes):
+            _, size, path = files.pop(0)
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue          # playing right now (Windows keeps it open)
+            total -= size
+            with self._lock:
+                self.evicted += 1
+
+    # ---------- background ----------
+
+    def _worker(self):
+        while True:
+            text = self._jobs.get()
+            if text is None:
+                return
+            try:
+                self.render(text)
+            finally:
+                with self._lock:
+                    self._pending.discard(self.key(text))
+                self._jobs.task_done()
+
+    def _enqueue(self, text: str):
+        key = self.key(text)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="tts-cache", daemon=True)
+                self._thread.start()
+        self._jobs.put(text)
+
+    def prewarm(self, phrases):
+        """Renders any phrase not cached yet, in the background."""
+        missing = [p for p in phrases if not self._path(self.key(p)).exists()]
+        for phrase in missing:
+            self._enqueue(phrase)
+        if self.debug:
+            log.info("Pre-warming %d of %d phrases", len(missing), len(phrases))
+
+    def learn(self, text: str):
+        """Called on a miss: short text said repeatedly gets rendered for next time."""
+        if len(text) > self.max_phrase_chars:
+            return
+
+        key = self.key(text)
+        with self._lock:
+            if len(self._seen) > 1000:
+                self._seen.clear()
+            self._seen[key] = self._seen.get(key, 0) + 1
+            ready = self._seen[key] >= self.learn_after
+
+        if ready:
+            self._enqueue(text)
+
+    def wait_idle(self):
+        self._jobs.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "rendered": self.rendered,
+                "evicted": self.evicted,
+            }
+
+
+# ---------------- BACKEND ----------------
+
+class CachedBackend(TTSBackend):
+    """Plays cached audio when there is some, otherwise falls through to live speech."""
+    name = "cached"
+
+    def __init__(self, live: TTSBackend, cache: PhraseCache, player=None):
+        self.live = live
+        self.cache = cache
+        self.player = player or WinSoundPlayer()
+
+    def speak(self, text, should_stop):
+        path = self.cache.get(text)
+        if path is not None:
+            try:
+                return self.player.play(path, should_stop)
+            except Exception as e:
+                log.error("Playback failed, speaking live: %s", e)
+
+        self.cache.learn(text)
+        return self.live.speak(text, should_stop)
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_cache = None
+
+
+def configure(config: dict | None = None, rate=None, voice=None, synthesizer=None, debug=True) -> PhraseCache | None:
+    """None when disabled or when there is nothing to render with (non-Windows)."""
+    global _cache
+    config = {**DEFAULTS, **(config or {})}
+
+    _cache = None
+    if not config["enabled"]:
+        return None
+    if synthesizer is None:
+        if sys.platform != "win32":
+            return None
+        synthesizer = SapiSynthesizer(rate=rate, voice=voice)
+
+    _cache = PhraseCache(
+        cache_dir=config["dir"],
+        synthesizer=synthesizer,
+        max_entries=config["max_entries"],
+        max_mb=config["max_mb"],
+        max_phrase_chars=config["max_phrase_chars"],
+        learn_after=config["learn_after"],
+        debug=debug
+    )
+    return _cache
+
+
+def get_phrase_cache() -> PhraseCache | None:
+    return _cache
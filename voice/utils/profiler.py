@@ -0,0 +1,245 @@
+# utils/profiler.py
+# On-demand sampling profiler + main loop stall watchdog
+# - Sampler: a thread reads sys._current_frames() every interval_ms (no tracing hooks,
+#   the profiled threads never notice) → collapsed stacks "thread;outer;...;inner count"
+#   (flamegraph.pl, speedscope, inferno)
+# - Toggle: SIGUSR1 (POSIX) / Ctrl+Break (Windows), `main.py --profile`, or by voice
+# - Watchdog: main_loop arm()s the iteration, disarm()s while it waits on the mic;
+#   an armed iteration over stall_budget_sec dumps every thread's stack to the event log
+
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+
+from utils.logger import log_event
+from utils import metrics
+from utils.log import get_logger
+
+log = get_logger("profiler")
+
+DEFAULTS = {
+    "interval_ms": 10,
+    "output_dir": "data/profiles",
+    "signal": True,             # SIGUSR1 / SIGBREAK toggles sampling
+    "start_phrase": "start profiling",
+    "stop_phrase": "stop profiling",
+    "stall_budget_sec": 2.0,    # null disables the watchdog
+}
+
+
+def _thread_names() -> dict:
+    return {t.ident: t.name for t in threading.enumerate()}
+
+
+def collapse(frame, thread: str) -> str:
+    """Root-first frames joined by ';' (one flamegraph row per function)."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(thread)
+    return ";".join(reversed(names)).replace("\n", " ")
+
+
+def dump_stacks(skip=None) -> dict:
+    """thread name → formatted stack, for every live thread."""
+    names = _thread_names()
+    return {
+        names.get(ident, str(ident)): "".join(traceback.format_stack(frame))
+        for ident, frame in sys._current_frames().items()
+        if ident != skip
+    }
+
+
+# ---------------- SAMPLER ----------------
+
+class SamplingProfiler:
+    def __init__(self, interval_ms=10, output_dir="data/profiles", debug=False):
+        self.interval = interval_ms / 1000
+        self.output_dir = Path(output_dir)
+        self.debug = debug
+
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        with self._lock:
+            if self.running():
+                return False
+            self.stacks = Counter()
+            self.samples = 0
+            self.started = time.time()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+            self._thread.start()
+
+        log.info("Sampling every %dms", round(self.interval * 1000))
+        return True
+
+    def stop(self) -> Path | None:
+        """Stops sampling and writes the collapsed stacks; None if it was not running."""
+        with self._lock:
+            if not self.running():
+                return None
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.write()
+
+    def toggle(self):
+        if self.running():
+            self.stop()
+        else:
+            self.start()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=me)
+
+    def sample(self, skip=None):
+        names = _thread_names()
+        for ident, frame in sys._current_frames().items():
+            if ident != skip:
+                self.stacks[collapse(frame, names.get(ident, str(ident)))] += 1
+        self.samples += 1
+
+    # ---------- output ----------
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def write(self, path=None) -> Path:
+        if path is None:
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started or time.time()))
+            path = self.output_dir / f"profile-{stamp}.folded"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed(), encoding="utf-8")
+
+        log.info("Wrote %d samples (%d stacks) to %s", self.samples, len(self.stacks), path)
+        return path
+
+
+# ---------------- STALL WATCHDOG ----------------
+
+class StallWatchdog:
+    def __init__(self, budget_sec=2.0, debug=False):
+        self.budget = budget_sec
+        self.debug = debug
+        self.stalls = 0
+
+        self._armed = None        # (perf_counter start, thread ident) of the running iteration
+        self._reported = None     # last armed iteration that was dumped (once per iteration)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def arm(self):
+        self._armed = (time.perf_counter(), threading.get_ident())
+
+    def disarm(self):
+        self._armed = None
+
+    def _run(self):
+        poll = min(0.25, self.budget / 4)
+        while not self._stop.wait(poll):
+            armed = self._armed
+            if armed is None or armed == self._reported:
+                continue
+            elapsed = time.perf_counter() - armed[0]
+            if elapsed > self.budget:
+                self._reported = armed
+                self.dump(elapsed, armed[1])
+
+    def dump(self, elapsed: float, stalled_ident=None):
+        stacks = dump_stacks(skip=threading.get_ident())
+        stalled = _thread_names().get(stalled_ident, str(stalled_ident))
+        self.stalls += 1
+        metrics.counter("voice_stalls_total", "Main loop iterations over the stall budget").inc()
+
+        log_event("stall", {
+            "elapsed_sec": round(elapsed, 3),
+            "budget_sec": self.budget,
+            "thread": stalled,
+            "stacks": stacks,
+        }, debug=self.debug)
+        log.warning(
+            "Main loop iteration running %.1fs (budget %.1fs), stacks of %d threads in the event log\n%s",
+            elapsed, self.budget, len(stacks), stacks.get(stalled, "").rstrip()
+        )
+
+    def stop(self):
+        self._stop.set()
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_profiler = None
+_watchdog = None
+
+
+def _on_signal(signum, frame):
+    if _profiler is not None:
+        _profiler.toggle()
+
+
+def configure(config: dict | None = None, debug=False) -> SamplingProfiler:
+    global _profiler, _watchdog
+    config = {**DEFAULTS, **(config or {})}
+    shutdown()
+
+    _profiler = SamplingProfiler(config["interval_ms"], config["output_dir"], debug=debug)
+    if config["stall_budget_sec"]:
+        _watchdog = StallWatchdog(config["stall_budget_sec"], debug=debug)
+
+    # Ctrl+Break on Windows (no SIGUSR1 there)
+    signum = getattr(signal, "SIGUSR1", None) or getattr(signal, "SIGBREAK", None)
+    if config["signal"] and signum is not None:
+        try:
+            signal.signal(signum, _on_signal)
+            if debug:
+                log.info("Send %s to toggle sampling", signal.Signals(signum).name)
+        except ValueError:
+            pass              # not the main thread (tests, embedding)
+
+    return _profiler
+
+
+def get_profiler() -> SamplingProfiler | None:
+    return _profiler
+
+
+def arm():
+    """Main loop iteration starts doing work (watchdog clock runs)."""
+    if _watchdog is not None:
+        _watchdog.arm()
+
+
+def disarm():
+    """Main loop is about to block on the mic (not a stall)."""
+    if _watchdog is not None:
+        _watchdog.disarm()
+
+
+def shutdown():
+    """Stops the watchdog; a running profile is written out."""
+    global _watchdog
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
+    if _profiler is not None:
+        _profiler.stop()
@@ -1,10 +1,14 @@
 # utils/say.py
+# print + queued speech (never blocks the loop, see utils/tts.py)
 
-from utils.tts import speak
+from utils.tts import speak, NORMAL
+from utils.log import get_logger
 
-def say(message: str, debug=False):
-    print(message)
+log = get_logger("tts")
+
+def say(message: str, debug=False, priority=NORMAL, key=None):
+    print(message)                     # the reply itself, always shown
     try:
-        speak(message, debug=debug)
+        speak(message, debug=debug, priority=priority, key=key)
     except Exception as e:
-        print("[TTS ERROR]", e)
\ No newline at end of file
+        log.error("%s", e)
\ No newline at end of file
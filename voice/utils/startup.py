@@ -0,0 +1,116 @@
+# utils/startup.py
+# Staged startup: serial phases on the main thread, independent init in parallel
+# - phase(name): timed block on the calling thread (+ modules it imported, main thread
+#   only: pool phases overlap, so their counts would not add up)
+# - submit(name, fn): runs on the init pool (mic calibration, SAPI, rule index, miner);
+#   a task may submit follow-ups that depend on it (local model after the miner)
+# - preload(module): heavy imports deferred by their modules, warmed off the main thread
+# - finish(): waits for everything, then one report → console + event log ("startup")
+# - Per-module detail: python -X importtime main.py
+
+import importlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from utils.logger import log_event
+from utils.log import get_logger
+
+log = get_logger("startup")
+
+
+class Startup:
+    def __init__(self, max_workers=4):
+        self.started = time.perf_counter()
+        self.phases = []          # (name, start, end, thread, modules imported or None)
+
+        self._futures = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self._lock = threading.Lock()
+
+    def _record(self, name, start, end, modules=None):
+        with self._lock:
+            self.phases.append((name, start, end, threading.current_thread().name, modules))
+
+    # ---------- serial ----------
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        loaded = len(sys.modules)
+        main = threading.current_thread() is threading.main_thread()
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter(), len(sys.modules) - loaded if main else None)
+
+    # ---------- parallel ----------
+
+    def submit(self, name: str, fn, *args, **kwargs):
+        def timed():
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(name, start, time.perf_counter())
+
+        self._futures[name] = self._pool.submit(timed)
+        return self._futures[name]
+
+    def preload(self, *modules: str):
+        for module in modules:
+            self.submit(f"import {module}", self._import, module)
+
+    @staticmethod
+    def _import(module: str):
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            log.warning("Preload of %s failed: %s", module, e)
+
+    def wait(self, name: str):
+        """Result of a submitted task (re-raises its exception)."""
+        return self._futures[name].result()
+
+    # ---------- report ----------
+
+    def finish(self) -> dict:
+        """Waits for all tasks; the report is time to first listen."""
+        waited = 0
+        while waited < len(self._futures):    # finished tasks may have submitted more
+            futures = list(self._futures.values())
+            for future in futures:
+                future.exception()    # failures surface through wait(), not here
+            waited = len(futures)
+        self._pool.shutdown(wait=True)
+
+        total = time.perf_counter() - self.started
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+
+        payload = {
+            "total_ms": round(total * 1000, 1),
+            "modules": len(sys.modules),
+            "phases": [
+                {
+                    "name": name,
+                    "start_ms": round((start - self.started) * 1000, 1),
+                    "dur_ms": round((end - start) * 1000, 1),
+                    "thread": thread,
+                    **({"modules": modules} if modules is not None else {}),
+                }
+                for name, start, end, thread, modules in phases
+            ],
+        }
+        log_event("startup", payload, debug=False)
+
+        log.info("Ready in %.0fms (%d modules loaded)", payload["total_ms"], payload["modules"])
+        for phase in payload["phases"]:
+            log.info(
+                "  %-22s @%7.1fms %8.1fms  %-12s%s",
+                phase["name"], phase["start_ms"], phase["dur_ms"], phase["thread"],
+                f"  +{phase['modules']} modules" if "modules" in phase else ""
+            )
+        return payload
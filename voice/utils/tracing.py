@@ -0,0 +1,261 @@
+# utils/tracing.py
+# Per-utterance tracing: where does the time go between speech end and action?
+# - One Trace per utterance (correlation id), spans on perf_counter (monotonic)
+# - The trace is "current" on the thread that began it; span() is a no-op without one
+# - Work handed to other threads (AI task, background action, TTS) holds the trace open:
+#     trace = hold()            # caller side
+#     with resume(trace): ...   # worker side, releases when done
+# - When the last holder lets go the trace goes to its own JSONL file
+#   (data/traces.jsonl, NOT the event log: the miner / local model read every
+#   line of that at startup) and, optionally, to a Chrome trace file
+#   (chrome://tracing, ui.perfetto.dev)
+# - Listeners (add_listener) see every finished trace, e.g. utils/metrics.py histograms
+
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils.log import get_logger
+
+log = get_logger("trace")
+
+DEFAULTS = {
+    "enabled": True,
+    "file": "data/traces.jsonl",  # null: listeners (metrics) only
+    "chrome_trace": None,     # e.g. "data/trace.json"
+}
+
+_local = threading.local()
+_listeners = []
+
+
+class Trace:
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.tracer = tracer
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.attrs = attrs
+        self.started = time.perf_counter()
+        self.spans = []           # (name, start, end, thread name, attrs)
+
+        self._holds = 1           # the thread that began it
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, **attrs):
+        with self._lock:
+            self.spans.append((name, start, end, threading.current_thread().name, attrs))
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), **attrs)
+
+    def hold(self):
+        with self._lock:
+            self._holds += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            self._holds -= 1
+            done = self._holds == 0
+        if done:
+            self.tracer.emit(self)
+
+
+class Tracer:
+    def __init__(self, path=None, chrome_path=None, debug=False):
+        self.path = Path(path) if path else None
+        self.chrome_path = Path(chrome_path) if chrome_path else None
+        self.debug = debug
+        self.emitted = 0
+
+        self._pid = os.getpid()
+        self._tids = {}           # thread name -> small int for the timeline
+        self._tid_seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+        if self.chrome_path:
+            # JSON array format; viewers accept the missing "]" so it can be appended to
+            self.chrome_path.parent.mkdir(parents=True, exist_ok=True)
+            self.chrome_path.write_text("[\n", encoding="utf-8")
+
+    def start(self, name="utterance", **attrs) -> Trace:
+        return Trace(self, name, attrs)
+
+    # ---------- output ----------
+
+    def emit(self, trace: Trace):
+        with trace._lock:
+            spans = sorted(trace.spans, key=lambda s: s[1])
+        ended = max([trace.started] + [s[2] for s in spans])
+
+        payload = {
+            "trace_id": trace.trace_id,
+            "name": trace.name,
+            **trace.attrs,
+            "total_ms": round((ended - trace.started) * 1000, 2),
+            "spans": [
+                {
+                    "name": name,
+                    "start_ms": round((start - trace.started) * 1000, 2),
+                    "dur_ms": round((end - start) * 1000, 2),
+                    "thread": thread,
+                    **attrs
+                }
+                for name, start, end, thread, attrs in spans
+            ]
+        }
+        if self.path:
+            self._write_jsonl(payload)
+
+        for listener in _listeners:
+            try:
+                listener(payload)
+            except Exception as e:
+                log.error("Listener failed: %s", e)
+
+        if self.chrome_path:
+            self._write_chrome(trace, spans)
+
+        with self._lock:
+            self.emitted += 1
+        if self.debug:
+            log.debug("%s %s %.1fms (%d spans)", trace.name, trace.trace_id, payload["total_ms"], len(spans))
+
+    def _write_jsonl(self, payload: dict):
+        # same envelope as utils/logger.py events
+        line = json.dumps({"timestamp": time.time(), "event_type": "trace", "payload": payload})
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                log.error("Failed to write %s: %s", self.path, e)
+
+    def _tid(self, thread: str, lines: list) -> int:
+        tid = self._tids.get(thread)
+        if tid is None:
+            tid = self._tids[thread] = next(self._tid_seq)
+            lines.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": thread}})
+        return tid
+
+    def _write_chrome(self, trace: Trace, spans: list):
+        with self._lock:
+            lines = []
+            for name, start, end, thread, attrs in spans:
+                lines.append({
+                    "name": name,
+                    "cat": trace.name,
+                    "ph": "X",
+                    "ts": round(start * 1e6),
+                    "dur": round((end - start) * 1e6),
+                    "pid": self._pid,
+                    "tid": self._tid(thread, lines),
+                    "args": {"trace_id": trace.trace_id, **attrs},
+                })
+            try:
+                with open(self.chrome_path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(line) + ",\n" for line in lines)
+            except OSError as e:
+                log.error("Failed to write %s: %s", self.chrome_path, e)
+
+
+# ---------------- CURRENT TRACE (per thread) ----------------
+
+_tracer = None
+
+
+def current() -> Trace | None:
+    return getattr(_local, "trace", None)
+
+
+def begin(name="utterance", **attrs) -> Trace | None:
+    """Starts a trace and makes it current on this thread (ends the previous one)."""
+    end()
+    if _tracer is None:
+        return None
+    _local.trace = _tracer.start(name, **attrs)
+    return _local.trace
+
+
+def end():
+    """This thread is done with its current trace (emitted once nobody holds it)."""
+    trace = current()
+    _local.trace = None
+    if trace is not None:
+        trace.release()
+
+
+def span(name: str, **attrs):
+    trace = current()
+    return trace.span(name, **attrs) if trace is not None else _NO_SPAN
+
+
+def add(name: str, start: float, end: float, **attrs):
+    """Span measured elsewhere (e.g. STT stage timings)."""
+    trace = current()
+    if trace is not None:
+        trace.add(name, start, end, **attrs)
+
+
+def hold() -> Trace | None:
+    """Keeps the current trace open for work that finishes on another thread."""
+    trace = current()
+    return trace.hold() if trace is not None else None
+
+
+@contextmanager
+def resume(trace: Trace | None):
+    """Worker side of hold(): current for the block, released afterwards."""
+    if trace is None:
+        yield
+        return
+
+    previous = current()
+    _local.trace = trace
+    try:
+        yield
+    finally:
+        _local.trace = previous
+        trace.release()
+
+
+class _NoSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def add_listener(fn):
+    """fn(payload) for every emitted trace; survives configure()."""
+    if fn not in _listeners:
+        _listeners.append(fn)
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+def configure(config: dict | None = None, debug=False) -> Tracer | None:
+    global _tracer
+    config = {**DEFAULTS, **(config or {})}
+
+    _tracer = Tracer(config["file"], config["chrome_trace"], debug=debug) if config["enabled"] else None
+    return _tracer
+
+
+def get_tracer() -> Tracer | None:
+    return _tracer
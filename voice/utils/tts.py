@@ -1,52 +1,329 @@
 # utils/tts.py
-# Robust pyttsx3 TTS for long-running loops (Windows-safe)
-"""
-import pyttsx3
+# Non-blocking speech output
+# - ONE worker thread owns the voice; speak() only enqueues and returns
+# - Priority queue: URGENT < NORMAL < LOW (lower speaks first)
+# - Coalescing: a queued message with the same key is updated, not duplicated
+#   ("Opening notepad" + "Opening chrome" → only the latest is said)
+# - Barge-in: URGENT messages or new user speech (interrupt()) cut the current utterance
+# - Backends: SapiBackend (Windows SAPI, no pyttsx3), NullBackend (silent runtime
+#   fallback off Windows), RecordingBackend (tests, keeps what was said)
+#   SAPI is wrapped by utils/phrase_cache.py so repeated phrases skip live synthesis
+# - Echo guard: what we just said is not mistaken for a user command
+
+import heapq
+import itertools
+import re
+import sys
 import threading
+import time
+from collections import deque
 
-_engine = None
-_lock = threading.Lock()
+from utils import tracing
+from utils.log import get_logger
 
+log = get_logger("tts")
 
-def speak(text, debug=False):
-    global _engine
+URGENT = 0
+NORMAL = 1
+LOW = 2
 
-    with _lock:
-        try:
-            if _engine is None:
-                _engine = pyttsx3.init()
-                _engine.setProperty("rate", 180)
+ECHO_WINDOW_SEC = 4.0
 
-                # force a known-good voice
-                voices = _engine.getProperty("voices")
-                if voices:
-                    _engine.setProperty("voice", voices[0].id)
+# SAPI SpeakFlags
+SVSF_ASYNC = 1
+SVSF_PURGE_BEFORE_SPEAK = 2
 
-            if debug:
-                print("[TTS]", text)
 
-            _engine.say(text)
+def _plain(text: str) -> str:
+    return re.sub(r"[^a-z0-9 ]", "", text.lower()).strip()
 
-            # 🔥 CRITICAL: force event loop restart
-            _engine.runAndWait()
-            _engine.stop()
 
-        except Exception as e:
-            print("[TTS ERROR]", e)
-            _engine = None  # force re-init next time
-            """
+# ---------------- BACKENDS ----------------
 
-# utils/tts.py
-# Direct Windows SAPI (no pyttsx3)
+class TTSBackend:
+    name = "base"
 
-import win32com.client
-import threading
+    def speak(self, text: str, should_stop) -> bool:
+        """Blocks until spoken. Returns False if should_stop() cut it short."""
+        raise NotImplementedError
+
+
+def sapi_voice(rate=None, voice=None):
+    """New SAPI.SpVoice for the CALLING thread (COM objects are thread-affine)."""
+    import pythoncom
+    import win32com.client
+
+    pythoncom.CoInitialize()
+    sp_voice = win32com.client.Dispatch("SAPI.SpVoice")
+    if voice:
+        tokens = sp_voice.GetVoices(f"Name={voice}")
+        if tokens.Count:
+            sp_voice.Voice = tokens.Item(0)
+        else:
+            log.warning("Voice '%s' not installed, using default", voice)
+    if rate is not None:
+        sp_voice.Rate = rate
+    return sp_voice
+
+
+class SapiBackend(TTSBackend):
+    name = "sapi"
+
+    def __init__(self, rate=None, voice=None):
+        self.rate = rate
+        self.voice = voice
+        self._voice = None
+
+    def _ensure_voice(self):
+        # created lazily on the worker thread, never on the caller's
+        if self._voice is None:
+            self._voice = sapi_voice(self.rate, self.voice)
+        return self._voice
+
+    def speak(self, text, should_stop):
+        voice = self._ensure_voice()
+        voice.Speak(text, SVSF_ASYNC)
+
+        while not voice.WaitUntilDone(50):
+            if should_stop():
+                voice.Speak("", SVSF_ASYNC | SVSF_PURGE_BEFORE_SPEAK)
+                return False
+        return True
+
+
+class NullBackend(TTSBackend):
+    """Silent and stateless: nothing to speak with, nothing kept."""
+    name = "null"
+
+    def speak(self, text, should_stop):
+        return True
+
+
+class RecordingBackend(TTSBackend):
+    """Silent; 'speaks' for sec_per_char * len(text) so barge-in can be tested."""
+    name = "recording"
+
+    def __init__(self, sec_per_char=0.0):
+        self.sec_per_char = sec_per_char
+        self.spoken = []          # (text, completed)
+
+    def speak(self, text, should_stop):
+        deadline = time.monotonic() + self.sec_per_char * len(text)
+        while time.monotonic() < deadline:
+            if should_stop():
+                self.spoken.append((text, False))
+                return False
+            time.sleep(0.005)
+
+        self.spoken.append((text, True))
+        return True
+
+
+# ---------------- WORKER ----------------
+
+class _Message:
+    def __init__(self, text, priority, key):
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.dropped = False
+        self.trace = None         # utterance that asked for it (utils/tracing.py)
+
+
+class TTSWorker:
+    def __init__(self, backend: TTSBackend, debug=False):
+        self.backend = backend
+        self.debug = debug
+
+        self.spoken = 0
+        self.coalesced = 0
+        self.interrupted = 0
+
+        self._heap = []
+        self._by_key = {}
+        self._seq = itertools.count()
+        self._current = None
+        self._stop_current = threading.Event()
+        self._recent = deque()    # (said_until, plain text) for the echo guard
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._worker, name="tts", daemon=True)
+        self._thread.start()
+
+    # ---------- worker ----------
+
+    def _next(self):
+        with self._cond:
+            while True:
+                while self._heap:
+                    _, _, msg = heapq.heappop(self._heap)
+                    if msg.dropped:
+                        continue
+                    self._by_key.pop(msg.key, None)
+                    self._current = msg
+                    self._stop_current.clear()
+                    return msg
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+    def _worker(self):
+        while True:
+            msg = self._next()
+            if msg is None:
+                return
+
+            started = time.perf_counter()
+            try:
+                completed = self.backend.speak(msg.text, self._stop_current.is_set)
+            except Exception as e:
+                log.error("%s", e)
+                completed = False
+
+            if msg.trace:
+                msg.trace.add("tts", started, time.perf_counter(), chars=len(msg.text), completed=completed)
+                msg.trace.release()
+
+            with self._cond:
+                self._current = None
+                self._recent.append((time.monotonic() + ECHO_WINDOW_SEC, _plain(msg.text)))
+                if completed:
+                    self.spoken += 1
+                else:
+                    self.interrupted += 1
+                self._cond.notify_all()
+
+    # ---------- public ----------
+
+    def say(self, text: str, priority=NORMAL, key=None):
+        """Queues text and returns immediately."""
+        text = text.strip()
+        if not text:
+            return
+        key = key or text
+
+        with self._cond:
+            queued = self._by_key.get(key)
+            if queued and queued.priority <= priority:
+                queued.text = text    # latest wins, keeps its place
+                self.coalesced += 1
+                return
+            msg = _Message(text, priority, key)
+            if queued:
+                queued.dropped = True  # re-queue at the higher priority
+                msg.trace, queued.trace = queued.trace, None
+            else:
+                msg.trace = tracing.hold()
+            self._by_key[key] = msg
+            heapq.heappush(self._heap, (priority, next(self._seq), msg))
+
+            # barge-in: something more urgent than what is playing
+            barge_in = self._current is not None and priority < self._current.priority
+            if barge_in:
+                self._stop_current.set()
+
+            self._cond.notify_all()
+
+        if barge_in and self.debug:
+            log.debug("Interrupted for: %s", text)
+
+    def interrupt(self, clear=False):
+        """Cut the current utterance (user started talking). clear=True also drops the queue."""
+        dropped = []
+        with self._cond:
+            if self._current:
+                self._stop_current.set()
+            if clear:
+                for _, _, msg in self._heap:
+                    msg.dropped = True
+                    dropped.append(msg.trace)
+                self._heap.clear()
+                self._by_key.clear()
+
+        for trace in dropped:
+            if trace:
+                trace.release()
+
+    def is_speaking(self) -> bool:
+        with self._cond:
+            return self._current is not None
+
+    def is_echo(self, heard: str) -> bool:
+        """True if heard text is (part of) something we are saying / just said."""
+        heard = _plain(heard)
+        if not heard:
+            return False
+
+        now = time.monotonic()
+        with self._cond:
+            while self._recent and self._recent[0][0] < now:
+                self._recent.popleft()
+            said = [t for _, t in self._recent]
+            if self._current:
+                said.append(_plain(self._current.text))
+
+        # whole-word match only: "stop" is NOT an echo of "stopped at 3 of 9"
+        multiword = len(heard.split()) >= 2
+        return any(heard == s or (multiword and f" {heard} " in f" {s} ") for s in said)
+
+    def wait_idle(self, timeout=None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._current or any(not m.dropped for _, _, m in self._heap):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=1.0):
+        self.interrupt(clear=True)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+
+# ---------------- SHARED INSTANCE ----------------
+
+_tts = None
+
+
+def configure(config: dict | None = None, backend: TTSBackend | None = None, debug=False) -> TTSWorker:
+    global _tts
+    config = config or {}
+
+    if backend is None:
+        if sys.platform == "win32":
+            backend = SapiBackend(rate=config.get("rate"), voice=config.get("voice"))
+
+            # frequent short phrases play from pre-rendered audio
+            from utils.phrase_cache import configure as configure_phrase_cache, CachedBackend
+            cache = configure_phrase_cache(
+                config.get("phrase_cache", {}), rate=config.get("rate"), voice=config.get("voice"), debug=debug
+            )
+            if cache is not None:
+                backend = CachedBackend(backend, cache)
+        else:
+            log.warning("No speech backend on this platform, output is silent")
+            backend = NullBackend()
+
+    if _tts is not None:
+        _tts.shutdown()
+    _tts = TTSWorker(backend, debug=debug)
+    return _tts
+
+
+def get_tts() -> TTSWorker:
+    global _tts
+    if _tts is None:
+        configure()
+    return _tts
 
-_speaker = win32com.client.Dispatch("SAPI.SpVoice")
-_lock = threading.Lock()
 
-def speak(text, debug=False):
-    with _lock:
-        if debug:
-            print("[TTS]", text)
-        _speaker.Speak(text)
\ No newline at end of file
+def speak(text, debug=False, priority=NORMAL, key=None):
+    """Non-blocking: queued on the TTS worker."""
+    if debug:
+        log.debug("%s", text)
+    get_tts().say(text, priority=priority, key=key)
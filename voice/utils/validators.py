@@ -2,7 +2,9 @@
 # utils/validators.py
 # Validates intent objects before execution
 
-from jsonschema import validate, ValidationError
+from utils.log import get_logger
+
+log = get_logger("validator")
 
 INTENT_SCHEMA = {
     "type": "object",
@@ -34,22 +36,25 @@ INTENT_SCHEMA = {
         },
         "source": {
             "type": "string",
-            "enum": ["RULES", "AI"]
+            "enum": ["RULES", "LOCAL_MODEL", "AI"]
         }
     }
 }
 
 def validate_intent(intent: dict, debug=True) -> bool:
+    # jsonschema is heavy; imported on first use (startup preloads it in the background)
+    from jsonschema import validate, ValidationError
+
     try:
         validate(instance=intent, schema=INTENT_SCHEMA)
 
         if debug:
-            print("[VALIDATOR] Intent schema valid")
+            log.debug("Intent schema valid")
 
         return True
 
     except ValidationError as e:
-        print("[VALIDATOR ERROR] Schema validation failed:", e)
+        log.error("Schema validation failed: %s", e)
         return False
 
 
@@ -58,10 +63,10 @@ def is_confidence_acceptable(intent: dict, min_confidence: float, debug=True) ->
 
     if confidence >= min_confidence:
         if debug:
-            print(f"[VALIDATOR] Confidence OK: {confidence}")
+            log.debug("Confidence OK: %s", confidence)
         return True
 
     if debug:
-        print(f"[VALIDATOR] Confidence too low: {confidence}")
+        log.info("Confidence too low: %s", confidence)
 
     return False
\ No newline at end of file